@@ -0,0 +1,79 @@
+# =======================================================================
+#
+#  This file is part of WebWidgets, a Python package for designing web
+#  UIs.
+#
+#  You should have received a copy of the MIT License along with
+#  WebWidgets. If not, see <https://opensource.org/license/mit>.
+#
+#  Copyright(C) 2025, mlaasri
+#
+# =======================================================================
+
+"""Measures the time taken to compile the CSS of a tree of styled nodes and
+to export it as pretty and minified code.
+
+Usage: python benchmarks/bench_css.py [--nodes N] [--declarations D]
+                                      [--repeat R]
+"""
+
+import argparse
+import random
+import time
+from webwidgets.compilation.css import compile_css
+from webwidgets.compilation.html import HTMLNode
+
+
+def make_tree(num_nodes: int, num_declarations: int) -> HTMLNode:
+    """Builds a flat tree of `num_nodes` nodes whose styles are drawn from
+    `num_declarations` distinct declarations.
+
+    :param num_nodes: The number of styled nodes in the tree.
+    :type num_nodes: int
+    :param num_declarations: The number of distinct declarations.
+    :type num_declarations: int
+    :return: The root of the tree.
+    :rtype: HTMLNode
+    """
+    rng = random.Random(0)
+    num_properties = max(1, num_declarations // 50)
+    return HTMLNode(children=[
+        HTMLNode(style={
+            f"p{p}": str(rng.randrange(50))
+            for p in rng.sample(range(num_properties),
+                                min(8, num_properties))
+        }) for _ in range(num_nodes)
+    ])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=100000)
+    parser.add_argument("--declarations", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    tree = make_tree(args.nodes, args.declarations)
+    start = time.perf_counter()
+    compiled = compile_css(tree)
+    seconds = time.perf_counter() - start
+    print(f"{args.nodes} nodes, {len(compiled.core.rules)} rules:"
+          f" {seconds:6.2f} s")
+
+    # Exporting the same rules with and without minification
+    baseline = None
+    for minify in (False, True):
+        best = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            css = compiled.to_css(minify=minify)
+            best = min(best, time.perf_counter() - start)
+        size = len(css.encode("utf-8"))
+        baseline = baseline or (best, size)
+        print(f"{'minified' if minify else 'pretty':>9}:"
+              f" {best * 1000:8.1f} ms {baseline[0] / best:5.2f}x"
+              f" {size / 1000:9.1f} kB {size / baseline[1]:6.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+# =======================================================================
+#
+#  This file is part of WebWidgets, a Python package for designing web
+#  UIs.
+#
+#  You should have received a copy of the MIT License along with
+#  WebWidgets. If not, see <https://opensource.org/license/mit>.
+#
+#  Copyright(C) 2025, mlaasri
+#
+# =======================================================================
+
+"""Measures the size of a Box-heavy website compiled with and without rule
+grouping and short class names.
+
+Usage: python benchmarks/bench_grouping.py [--pages N]
+"""
+
+import argparse
+import time
+from bench_website import make_website
+from webwidgets.compilation.css import short_class_namer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=100)
+    args = parser.parse_args()
+
+    website = make_website(args.pages)
+    print(f"{args.pages} pages")
+    baseline = None
+    for group_rules in (False, True):
+        for class_namer in (None, short_class_namer):
+            start = time.perf_counter()
+            compiled = website.compile(group_rules=group_rules,
+                                       class_namer=class_namer, minify=True)
+            seconds = time.perf_counter() - start
+            html_size = sum(len(h) for h in compiled.html_content)
+            css_size = len(compiled.css_content)
+            baseline = baseline or html_size + css_size
+            namer = "default" if class_namer is None else "short"
+            print(f"group_rules={group_rules!s:>5}, {namer:>7} names:"
+                  f" {seconds:6.2f} s, HTML {html_size / 1e3:9.1f} kB,"
+                  f" CSS {css_size / 1e3:6.1f} kB,"
+                  f" total {(html_size + css_size) / baseline:6.1%}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+# =======================================================================
+#
+#  This file is part of WebWidgets, a Python package for designing web
+#  UIs.
+#
+#  You should have received a copy of the MIT License along with
+#  WebWidgets. If not, see <https://opensource.org/license/mit>.
+#
+#  Copyright(C) 2025, mlaasri
+#
+# =======================================================================
+
+"""Measures the throughput of the HTML renderers.
+
+Usage: python benchmarks/bench_html.py [--sections N] [--repeat R]
+"""
+
+import argparse
+import time
+from typing import Callable
+from webwidgets.compilation.html import Div, HTMLArena, HTMLNode, RawText
+
+
+def make_tree(num_sections: int) -> HTMLNode:
+    """Builds a tree of `num_sections` sections with 20 items each.
+
+    :param num_sections: The number of sections in the tree.
+    :type num_sections: int
+    :return: The root of the tree.
+    :rtype: HTMLNode
+    """
+    return Div(children=[
+        Div(attributes={"class": f"section s{i % 10}"}, children=[
+            Div(attributes={"id": f"item-{i}-{j}"},
+                children=[RawText(f"Item {j} of section <{i}>")])
+            for j in range(20)
+        ]) for i in range(num_sections)
+    ])
+
+
+def count_nodes(tree: HTMLNode) -> int:
+    """Returns the number of nodes in the given tree.
+
+    :param tree: The root of the tree.
+    :type tree: HTMLNode
+    :return: The number of nodes.
+    :rtype: int
+    """
+    count, stack = 0, [tree]
+    while stack:
+        node = stack.pop()
+        count += 1
+        stack += node.children
+    return count
+
+
+def measure(render: Callable[[], str], repeat: int) -> tuple:
+    """Returns the best time out of `repeat` calls to `render` along with the
+    size of its output.
+
+    :param render: The function rendering the tree.
+    :type render: Callable[[], str]
+    :param repeat: The number of calls.
+    :type repeat: int
+    :return: A tuple (best time in seconds, output length).
+    :rtype: tuple
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        html = render()
+        best = min(best, time.perf_counter() - start)
+    return best, len(html)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sections", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    tree = make_tree(args.sections)
+    arena = HTMLArena.from_node(tree)
+    num_nodes = count_nodes(tree)
+    renderers = {
+        "pretty": lambda: tree.to_html(),
+        "force_one_line": lambda: tree.to_html(force_one_line=True),
+        "minify": lambda: tree.to_html(minify=True),
+        "arena pretty": lambda: arena.to_html(),
+        "arena minify": lambda: arena.to_html(minify=True),
+    }
+
+    print(f"{num_nodes} nodes, best of {args.repeat} runs")
+    baseline = None
+    for name, render in renderers.items():
+        seconds, size = measure(render, args.repeat)
+        baseline = baseline or seconds
+        print(f"{name:>16}: {seconds * 1000:8.1f} ms"
+              f" {num_nodes / seconds / 1e6:6.2f} Mnodes/s"
+              f" {size / seconds / 1e6:7.1f} MB/s"
+              f" {baseline / seconds:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
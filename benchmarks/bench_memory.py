@@ -0,0 +1,166 @@
+# =======================================================================
+#
+#  This file is part of WebWidgets, a Python package for designing web
+#  UIs.
+#
+#  You should have received a copy of the MIT License along with
+#  WebWidgets. If not, see <https://opensource.org/license/mit>.
+#
+#  Copyright(C) 2025, mlaasri
+#
+# =======================================================================
+
+"""Measures the memory taken by HTML trees with tracemalloc, compared with
+the layout of HTML nodes before they were slotted.
+
+Usage: python benchmarks/bench_memory.py [--sections N]
+"""
+
+import argparse
+import tracemalloc
+from typing import Any
+from webwidgets.compilation.html import Div, HTMLArena, HTMLNode, RawText
+
+
+class BaselineNode:
+    """A node with the memory layout of :py:class:`HTMLNode` before it was
+    slotted: each instance has a `__dict__` and always allocates its three
+    containers.
+    """
+
+    def __init__(self, children: list = None, attributes: dict = None,
+                 style: dict = None):
+        self.children = [] if children is None else children
+        self.attributes = {} if attributes is None else attributes
+        self.style = {} if style is None else style
+
+
+class BaselineText(BaselineNode):
+    """A raw text node with the memory layout of :py:class:`RawText` before
+    it was slotted.
+    """
+
+    def __init__(self, text: str):
+        super().__init__()
+        self.text = text
+
+
+def make_tree(num_sections: int, div: type = Div,
+              raw_text: type = RawText) -> Any:
+    """Builds a tree of `num_sections` sections with 20 items each. Each item
+    is a div containing a single raw text node.
+
+    :param num_sections: The number of sections in the tree.
+    :type num_sections: int
+    :param div: The class of the div nodes. Defaults to :py:class:`Div`.
+    :type div: type
+    :param raw_text: The class of the raw text nodes. Defaults to
+        :py:class:`RawText`.
+    :type raw_text: type
+    :return: The root of the tree.
+    :rtype: Any
+    """
+    return div(children=[
+        div(attributes={"class": "section"}, children=[
+            div(children=[raw_text("Item")]) for _ in range(20)
+        ]) for _ in range(num_sections)
+    ])
+
+
+def measure_tree(num_sections: int, **kwargs: Any) -> tuple:
+    """Returns the memory allocated while building a tree with
+    :py:func:`make_tree`, along with the tree.
+
+    :param num_sections: See :py:func:`make_tree`.
+    :type num_sections: int
+    :param kwargs: Other arguments to pass to :py:func:`make_tree`.
+    :type kwargs: Any
+    :return: A tuple (size in bytes, peak size in bytes, tree).
+    :rtype: tuple
+    """
+    tracemalloc.start()
+    tree = make_tree(num_sections, **kwargs)
+    size, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size, peak, tree
+
+
+def make_arena(num_sections: int) -> HTMLArena:
+    """Builds the same tree as :py:func:`make_tree` in an arena.
+
+    :param num_sections: The number of sections in the tree.
+    :type num_sections: int
+    :return: The arena.
+    :rtype: HTMLArena
+    """
+    arena = HTMLArena()
+    root = arena.add(Div)
+    for _ in range(num_sections):
+        section = arena.add(Div, parent=root, attributes={"class": "section"})
+        for _ in range(20):
+            arena.add_text("Item", parent=arena.add(Div, parent=section))
+    return arena
+
+
+def count_nodes(tree: Any) -> int:
+    """Returns the number of nodes in the given tree.
+
+    :param tree: The root of the tree.
+    :type tree: Any
+    :return: The number of nodes.
+    :rtype: int
+    """
+    count, stack = 0, [tree]
+    while stack:
+        node = stack.pop()
+        count += 1
+        stack += node.children
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sections", type=int, default=5000)
+    args = parser.parse_args()
+
+    # Measuring the memory allocated while building the tree with the
+    # layout of nodes before they were slotted
+    size, peak, tree = measure_tree(args.sections, div=BaselineNode,
+                                    raw_text=BaselineText)
+    num_nodes = count_nodes(tree)
+    baseline = size
+    print(f"{num_nodes} nodes")
+    print(f"{'baseline':>10}: {size / 1e6:6.1f} MB"
+          f" ({size / num_nodes:.0f} bytes per node),"
+          f" peak {peak / 1e6:.1f} MB")
+    del tree
+
+    # Measuring the memory allocated while building the tree
+    size, peak, tree = measure_tree(args.sections)
+    print(f"{'slotted':>10}: {size / 1e6:6.1f} MB"
+          f" ({size / num_nodes:.0f} bytes per node),"
+          f" peak {peak / 1e6:.1f} MB, {baseline / size:.2f}x smaller")
+
+    # Measuring the memory retained by the tree after rendering it, which is
+    # made of the start tags memoized by the nodes
+    tracemalloc.start()
+    tree.to_html()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{'start tags':>10}: {retained / 1e6:6.1f} MB"
+          f" ({retained / num_nodes:.0f} bytes per node) retained after"
+          f" rendering")
+
+    # Measuring the memory allocated while building the same tree in an arena
+    del tree
+    tracemalloc.start()
+    arena = make_arena(args.sections)
+    size, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{'arena':>10}: {size / 1e6:6.1f} MB"
+          f" ({size / len(arena):.0f} bytes per node),"
+          f" peak {peak / 1e6:.1f} MB, {baseline / size:.2f}x smaller")
+
+
+if __name__ == "__main__":
+    main()
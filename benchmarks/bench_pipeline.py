@@ -0,0 +1,76 @@
+# =======================================================================
+#
+#  This file is part of WebWidgets, a Python package for designing web
+#  UIs.
+#
+#  You should have received a copy of the MIT License along with
+#  WebWidgets. If not, see <https://opensource.org/license/mit>.
+#
+#  Copyright(C) 2025, mlaasri
+#
+# =======================================================================
+
+"""Compares the compilation pipeline of Website.compile with separate build,
+compile_css, apply_css and to_html passes.
+
+Usage: python benchmarks/bench_pipeline.py [--pages N] [--repeat R]
+"""
+
+import argparse
+import time
+from bench_website import make_website
+import webwidgets as ww
+from webwidgets.compilation.css import apply_css, compile_css
+
+
+def compile_in_passes(website: ww.Website) -> tuple:
+    """Compiles the given website with one pass over its trees per step.
+
+    :param website: The website to compile.
+    :type website: ww.Website
+    :return: A tuple (HTML code of each page, CSS code).
+    :rtype: tuple
+    """
+    trees = [page.build() for page in website.pages]
+    compiled_css = compile_css(trees)
+    for tree in trees:
+        apply_css(compiled_css, tree)
+    html_content = [tree.to_html() for tree in trees]
+    return html_content, compiled_css.to_css()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=400)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    website = make_website(args.pages)
+    print(f"{args.pages} pages, best of {args.repeat} runs")
+
+    # Timing separate passes
+    passes = float("inf")
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        html_content, css_content = compile_in_passes(website)
+        passes = min(passes, time.perf_counter() - start)
+
+    # Timing Website.compile, which must produce the same code
+    best, timings = float("inf"), None
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        compiled = website.compile()
+        seconds = time.perf_counter() - start
+        if seconds < best:
+            best, timings = seconds, compiled.timings
+    assert compiled.html_content == html_content
+    assert compiled.css_content == css_content
+
+    print(f"{'separate passes':>16}: {passes:6.2f} s")
+    print(f"{'Website.compile':>16}: {best:6.2f} s {passes / best:5.2f}x")
+    for phase, seconds in timings.items():
+        print(f"{phase:>16}: {seconds:6.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+# =======================================================================
+#
+#  This file is part of WebWidgets, a Python package for designing web
+#  UIs.
+#
+#  You should have received a copy of the MIT License along with
+#  WebWidgets. If not, see <https://opensource.org/license/mit>.
+#
+#  Copyright(C) 2025, mlaasri
+#
+# =======================================================================
+
+"""Measures the time taken to compile a website serially and in parallel.
+
+Usage: python benchmarks/bench_website.py [--pages N] [--workers W ...]
+"""
+
+import argparse
+import time
+import webwidgets as ww
+from webwidgets.compilation.html import Div, RawText
+
+
+class Card(ww.Widget):
+    """A small styled widget with some text."""
+
+    def __init__(self, index: int):
+        super().__init__()
+        self.index = index
+
+    def build(self):
+        return Div(children=[RawText(f"Card {self.index}")], style={
+            "margin": f"{self.index % 4}px",
+            "color": ("red", "blue", "green")[self.index % 3]
+        })
+
+
+def make_website(num_pages: int) -> ww.Website:
+    """Builds a website whose pages have between 10 and 200 cards.
+
+    :param num_pages: The number of pages in the website.
+    :type num_pages: int
+    :return: The website.
+    :rtype: ww.Website
+    """
+    website = ww.Website()
+    for i in range(num_pages):
+        box = ww.Box(ww.Direction.VERTICAL)
+        for j in range(10 + (i * 37) % 191):
+            box.add(Card(j))
+        website.add(ww.Page([box]))
+    return website
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=400)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+
+    website = make_website(args.pages)
+    print(f"{args.pages} pages")
+    reference = None
+    for workers in args.workers:
+        start = time.perf_counter()
+        compiled = website.compile(workers=workers)
+        seconds = time.perf_counter() - start
+        reference = reference or compiled
+        assert compiled.html_content == reference.html_content
+        assert compiled.css_content == reference.css_content
+        print(f"{workers:>3} workers: {seconds:6.2f} s")
+
+
+if __name__ == "__main__":
+    main()
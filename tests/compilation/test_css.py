@@ -10,14 +10,24 @@
 #
 # =======================================================================
 
+from concurrent.futures import ThreadPoolExecutor
+import gc
 import pytest
+import random
 from typing import Any, Dict, List
-from webwidgets.compilation.html.html_node import HTMLNode
+import weakref
+from webwidgets.compilation.html.html_arena import HTMLArena
+from webwidgets.compilation.html.html_node import HTMLNode, RawText
 from webwidgets.compilation.html.html_tags import TextNode
 from webwidgets.compilation.css.css import apply_css, compile_css, CompiledCSS, \
-    default_class_namer
+    default_class_namer, HashedClassNamer, short_class_namer, \
+    _collapse_shorthands, _count_attribute_styles, _drop_declarations, \
+    _filter_inline_groups, _get_attribute_rules, _get_attribute_values, \
+    _get_global_declarations, _intern_styles, _map_nodes, _map_rules
 from webwidgets.compilation.css.css_rule import ClassRule, CSSRule
-from webwidgets.compilation.css.sections import RuleSection
+from webwidgets.compilation.css.sections import Preamble, RuleSection
+from webwidgets.utility.validation import validate_css_identifier
+from . import test_html_node
 
 
 class TestCompileCSS:
@@ -284,6 +294,502 @@ class TestCompileCSS:
         compiled_css = compile_css(tree, class_namer=class_namer)
         assert [r.selector for r in compiled_css.core.rules] == selectors
 
+    @pytest.mark.parametrize("seed", [0, 1, 2])
+    def test_mapping_matches_subset_search(self, seed):
+        """Compares the mapping with the rules found by testing every rule
+        against every node."""
+        rng = random.Random(seed)
+        properties = ["margin", "padding", "color", "font-size"]
+        nodes = [HTMLNode(style={p: str(rng.randint(0, 3)) for p in
+                                 rng.sample(properties, rng.randint(0, 4))})
+                 for _ in range(50)]
+        tree = HTMLNode(children=nodes, style={"margin": "0"})
+        compiled_css = compile_css(tree)
+        expected_mapping = {
+            node_id: [r for r in compiled_css.core.rules if set(
+                r.declarations.items()).issubset(style.items())]
+            for node_id, style in tree.get_styles().items()}
+        assert compiled_css.mapping == expected_mapping
+
+    def test_map_rules_with_multiple_declarations(self):
+        rules = [ClassRule("a", {"x": "0", "y": "1"}),
+                 ClassRule("b", {"x": "0"}),
+                 ClassRule("c", {}),
+                 ClassRule("d", {"y": "1", "z": "2"}),
+                 ClassRule("e", {"x": "0"})]
+        styles = {0: {}, 1: {"x": "0"}, 2: {"y": "1", "x": "0"},
+                  3: {"x": "0", "y": "1", "z": "2"}, 4: {"y": "2"}}
+        table = _intern_styles(styles)
+        assert {k: [r.name for r in v] for k, v in _map_nodes(
+            table, _map_rules(table, rules)).items()} == {
+            0: ["c"],
+            1: ["b", "c", "e"],
+            2: ["a", "b", "c", "e"],
+            3: ["a", "b", "c", "d", "e"],
+            4: ["c"]
+        }
+
+    def test_intern_styles(self):
+        styles = {0: {"x": "0"}, 1: {}, 2: {"x": "0"}, 3: {"x": "0", "y": "1"},
+                  4: {"y": "1", "x": "0"}, 5: {}}
+        assert _intern_styles(styles) == {
+            (("x", "0"),): [0, 2],
+            (): [1, 5],
+            (("x", "0"), ("y", "1")): [3],
+            (("y", "1"), ("x", "0")): [4]
+        }
+
+    @pytest.mark.parametrize("group_rules", [False, True])
+    def test_identical_styles_share_rules(self, group_rules):
+        items = [HTMLNode(style={"margin": "0", "color": "red"})
+                 for _ in range(3)]
+        other = HTMLNode(style={"color": "red", "margin": "0"})
+        tree = HTMLNode(children=items + [other],
+                        style={"margin": "0"})
+        compiled_css = compile_css(tree, group_rules=group_rules)
+        rules = compiled_css.mapping[id(items[0])]
+        assert all(compiled_css.mapping[id(i)] is rules for i in items)
+        assert compiled_css.mapping[id(other)] == rules
+        assert compiled_css.mapping[id(tree)] != rules
+
+        # Nodes with the same rules share the same class string
+        apply_css(compiled_css, tree)
+        classes = items[0].attributes["class"]
+        assert all(i.attributes["class"] is classes for i in items)
+        assert other.attributes["class"] == classes
+
+    def test_group_rules_merges_declarations_always_together(self):
+        tree = HTMLNode(style={"margin": "0", "padding": "0"}, children=[
+            HTMLNode(style={"margin": "0", "padding": "0"}),
+            HTMLNode(style={"color": "blue"})
+        ])
+        compiled_css = compile_css(tree, group_rules=True)
+        assert TestCompileCSS._serialize_rules(compiled_css.core.rules) == [
+            {"selector": ".c0",
+             "declarations": {"color": "blue"}},
+            {"selector": ".c1",
+             "declarations": {"margin": "0", "padding": "0"}}
+        ]
+        assert TestCompileCSS._serialize_mapping(compiled_css.mapping) == {
+            id(tree): [".c1"],
+            id(tree.children[0]): [".c1"],
+            id(tree.children[1]): [".c0"]
+        }
+
+    def test_group_rules_with_declarations_often_together(self):
+        # Items share four declarations but differ in their last one
+        common = {"display": "flex", "flex-direction": "row",
+                  "align-items": "center", "justify-content": "center"}
+        items = [HTMLNode(style=common | {"flex-grow": str(i % 3)})
+                 for i in range(30)]
+        tree = HTMLNode(style={"display": "flex"}, children=items)
+        compiled_css = compile_css(tree, group_rules=True)
+        assert TestCompileCSS._serialize_rules(compiled_css.core.rules) == [
+            {"selector": ".c0",
+             "declarations": {"align-items": "center",
+                              "display": "flex",
+                              "flex-direction": "row",
+                              "justify-content": "center"}},
+            {"selector": ".c1",
+             "declarations": {"display": "flex"}},
+            {"selector": ".c2",
+             "declarations": {"flex-grow": "0"}},
+            {"selector": ".c3",
+             "declarations": {"flex-grow": "1"}},
+            {"selector": ".c4",
+             "declarations": {"flex-grow": "2"}}
+        ]
+        mapping = TestCompileCSS._serialize_mapping(compiled_css.mapping)
+        assert mapping[id(tree)] == [".c1"]
+        for i, item in enumerate(items):
+            assert mapping[id(item)] == [".c0", f".c{2 + i % 3}"]
+
+    def test_group_rules_reduces_total_size(self):
+        def get_size(group_rules):
+            tree = HTMLNode(children=[HTMLNode(style={
+                "display": "flex", "flex-direction": "row",
+                "align-items": "center", "justify-content": "center",
+                "flex-basis": "0", "flex-grow": "1", "flex-shrink": "1",
+                "margin": f"{i % 4}px"}) for i in range(100)])
+            compiled_css = compile_css(tree, group_rules=group_rules)
+            apply_css(compiled_css, tree)
+            return len(tree.to_html()) + len(compiled_css.to_css())
+        assert get_size(True) < 0.75 * get_size(False)
+
+    @pytest.mark.parametrize("seed", [0, 1, 2, 3])
+    def test_group_rules_covers_each_style_exactly(self, seed):
+        rng = random.Random(seed)
+        declarations = [("margin", "0"), ("padding", "0"), ("color", "red"),
+                        ("color", "blue"), ("display", "flex"),
+                        ("font-size", "16px"), ("flex-grow", "1")]
+        nodes = []
+        for _ in range(200):
+            style = dict(rng.sample(declarations, rng.randint(0, 5)))
+            nodes.append(HTMLNode(style=style))
+        tree = HTMLNode(children=nodes)
+        compiled_css = compile_css(tree, group_rules=True)
+        for node_id, style in tree.get_styles().items():
+            covered = {}
+            for rule in compiled_css.mapping[node_id]:
+                assert not set(rule.declarations).intersection(covered)
+                covered.update(rule.declarations)
+            assert covered == style
+        names = [r.name for r in compiled_css.core.rules]
+        assert names == sorted(names)
+        assert all(r in compiled_css.core.rules
+                   for rules in compiled_css.mapping.values() for r in rules)
+
+    def test_group_rules_with_custom_class_names(self):
+        tree = HTMLNode(children=[
+            HTMLNode(style={"margin": "0", "padding": "0"}),
+            HTMLNode(style={"color": "blue"})
+        ])
+        compiled_css = compile_css(
+            tree, class_namer=lambda rules, i: f"x{len(rules) - i}",
+            group_rules=True)
+        assert TestCompileCSS._serialize_mapping(compiled_css.mapping) == {
+            id(tree): [],
+            id(tree.children[0]): [".x1"],
+            id(tree.children[1]): [".x2"]
+        }
+
+    def test_group_rules_without_style(self):
+        tree = HTMLNode(children=[HTMLNode()])
+        compiled_css = compile_css(tree, group_rules=True)
+        assert compiled_css.core.rules == []
+        assert compiled_css.mapping == {id(tree): [],
+                                        id(tree.children[0]): []}
+
+    def test_usage_aware_class_namer(self):
+        tree = HTMLNode(style={"margin": "0"}, children=[
+            HTMLNode(style={"color": "red", "margin": "0"}),
+            HTMLNode(style={"padding": "0", "margin": "0"}),
+            HTMLNode(style={"padding": "0"})
+        ])
+        calls = []
+
+        def class_namer(rules, index, usage):
+            calls.append(([r.declarations for r in rules], index, usage))
+            return f"u{index}"
+
+        compiled_css = compile_css(tree, class_namer=class_namer)
+        expected_rules = [{"margin": "0"}, {"padding": "0"}, {"color": "red"}]
+        assert calls == [(expected_rules, i, [3, 2, 1]) for i in range(3)]
+        assert TestCompileCSS._serialize_mapping(compiled_css.mapping) == {
+            id(tree): [".u0"],
+            id(tree.children[0]): [".u0", ".u2"],
+            id(tree.children[1]): [".u0", ".u1"],
+            id(tree.children[2]): [".u1"]
+        }
+
+    @pytest.mark.parametrize("group_rules", [False, True])
+    def test_short_class_names(self, group_rules):
+        tree = HTMLNode(children=[
+            HTMLNode(style={"margin": f"{i % 60}px", "padding": "0"})
+            for i in range(600)
+        ] + [HTMLNode(style={"color": "red"})])
+        compiled_css = compile_css(tree, class_namer=short_class_namer,
+                                   group_rules=group_rules)
+        mapping = TestCompileCSS._serialize_mapping(compiled_css.mapping)
+        # Grouping merges each margin with the padding into one of 60 rules
+        # used 10 times each, so the color rule, used once, comes last
+        assert mapping[id(tree.children[0])] == [".a"] \
+            if group_rules else [".a", ".b"]
+        assert mapping[id(tree.children[-1])] == [".ai"] \
+            if group_rules else [".aa"]
+        names = [r.name for r in compiled_css.core.rules]
+        assert names == sorted(names)
+        assert len(set(names)) == len(names)
+
+    @pytest.mark.parametrize("style, expected", [
+        # Box sides written with as few values as possible
+        ({"margin-top": "1px", "margin-right": "1px",
+          "margin-bottom": "1px", "margin-left": "1px"},
+         {"margin": "1px"}),
+        ({"margin-top": "1px", "margin-right": "2px",
+          "margin-bottom": "1px", "margin-left": "2px"},
+         {"margin": "1px 2px"}),
+        ({"margin-top": "1px", "margin-right": "2px",
+          "margin-bottom": "3px", "margin-left": "2px"},
+         {"margin": "1px 2px 3px"}),
+        ({"padding-top": "1px", "padding-right": "2px",
+          "padding-bottom": "3px", "padding-left": "4px"},
+         {"padding": "1px 2px 3px 4px"}),
+        ({"flex-grow": "1", "flex-shrink": "1", "flex-basis": "0"},
+         {"flex": "1 1 0"}),
+        # Incomplete groups, groups with their shorthand, CSS-wide keywords
+        # and important values are left untouched
+        ({"flex-grow": "1", "flex-shrink": "1"},
+         {"flex-grow": "1", "flex-shrink": "1"}),
+        ({"flex": "2", "flex-grow": "1", "flex-shrink": "1",
+          "flex-basis": "0"},
+         {"flex": "2", "flex-grow": "1", "flex-shrink": "1",
+          "flex-basis": "0"}),
+        ({"flex-grow": "inherit", "flex-shrink": "1", "flex-basis": "0"},
+         {"flex-grow": "inherit", "flex-shrink": "1", "flex-basis": "0"}),
+        ({"flex-grow": "1 !important", "flex-shrink": "1",
+          "flex-basis": "0"},
+         {"flex-grow": "1 !important", "flex-shrink": "1",
+          "flex-basis": "0"}),
+        # Other declarations keep their order
+        ({"color": "red", "flex-grow": "1", "width": "0",
+          "flex-shrink": "0", "flex-basis": "auto", "height": "0"},
+         {"color": "red", "flex": "1 0 auto", "width": "0", "height": "0"}),
+        ({"color": "red"}, {"color": "red"})
+    ])
+    def test_collapse_shorthands(self, style, expected):
+        collapsed = _collapse_shorthands(tuple(style.items()))
+        assert collapsed == tuple(expected.items())
+
+    @pytest.mark.parametrize("group_rules", [False, True])
+    def test_compile_css_with_collapsed_shorthands(self, group_rules):
+        tree = HTMLNode(children=[
+            HTMLNode(style={"flex-grow": "1", "flex-shrink": "1",
+                            "flex-basis": "0", "color": "red"}),
+            HTMLNode(style={"flex": "1 1 0", "color": "red"}),
+            HTMLNode(style={"flex-grow": "1", "flex-shrink": "1"})
+        ])
+        compiled_css = compile_css(tree, group_rules=group_rules,
+                                   collapse_shorthands=True)
+        mapping = TestCompileCSS._serialize_mapping(compiled_css.mapping)
+
+        # Both spellings of the same style share their rules
+        assert mapping[id(tree.children[0])] == \
+            mapping[id(tree.children[1])]
+        declarations = [r.declarations for r in compiled_css.core.rules]
+        assert any(d.get("flex") == "1 1 0" for d in declarations)
+        assert all("flex-basis" not in d for d in declarations)
+        assert len(compiled_css.core.rules) < len(
+            compile_css(tree, group_rules=group_rules).core.rules)
+
+    def test_compact_css_with_collapsed_shorthands(self):
+        longhands = {"margin-top": "0", "margin-right": "0",
+                     "margin-bottom": "0", "margin-left": "0"}
+        tree = HTMLNode(children=[HTMLNode(style=longhands),
+                                  HTMLNode(style={"margin": "0"})])
+        compiled_css = compile_css(tree, compact=True,
+                                   collapse_shorthands=True)
+
+        # Styles are looked up as they were before folding
+        names = {k: [r.name for r in v]
+                 for k, v in compiled_css.mapping.items()}
+        assert names == {tuple(longhands.items()): ["c0"],
+                         (("margin", "0"),): ["c0"]}
+        assert [r.name for r in compiled_css.rules_for(
+            tree.children[0])] == ["c0"]
+
+    def test_get_global_declarations(self):
+        assert _get_global_declarations([Preamble()]) == {
+            "box-sizing": "border-box", "margin": "0", "padding": "0",
+            "overflow": "hidden"
+        }
+        sections = [
+            RuleSection([CSSRule("*", {"color": "red", "margin": "0"}),
+                         CSSRule("div, *", {"color": "blue"}),
+                         CSSRule("*::before", {"padding": "0"}),
+                         CSSRule(".c0", {"width": "0"})])
+        ]
+        assert _get_global_declarations(sections) == {"color": "blue",
+                                                      "margin": "0"}
+
+    @pytest.mark.parametrize("style, expected", [
+        ({"margin": "0", "color": "red"}, {"color": "red"}),
+        ({"padding": "0", "box-sizing": "border-box"}, {}),
+        ({"margin": "1px", "overflow": "auto"},
+         {"margin": "1px", "overflow": "auto"}),
+        ({"margin": "0 !important"}, {"margin": "0 !important"}),
+        # Declarations with related properties are kept
+        ({"margin": "0", "margin-top": "1px", "padding": "0"},
+         {"margin": "0", "margin-top": "1px"}),
+        ({"padding-left": "2px", "padding": "0"},
+         {"padding-left": "2px", "padding": "0"})
+    ])
+    def test_drop_declarations(self, style, expected):
+        declarations = _get_global_declarations([Preamble()])
+        dropped = _drop_declarations(tuple(style.items()), declarations)
+        assert dropped == tuple(expected.items())
+
+    @pytest.mark.parametrize("group_rules", [False, True])
+    def test_compile_css_with_dropped_declarations(self, group_rules):
+        tree = HTMLNode(children=[
+            HTMLNode(style={"margin": "0", "color": "red"}),
+            HTMLNode(style={"color": "red"}),
+            HTMLNode(style={"padding": "0", "overflow": "hidden"})
+        ])
+        compiled_css = compile_css(tree, group_rules=group_rules,
+                                   drop_global_declarations=True)
+        assert [r.declarations for r in compiled_css.core.rules] == [
+            {"color": "red"}]
+        assert TestCompileCSS._serialize_mapping(compiled_css.mapping) == {
+            id(tree): [],
+            id(tree.children[0]): [".c0"],
+            id(tree.children[1]): [".c0"],
+            id(tree.children[2]): []
+        }
+
+        # Nodes without rules receive no class
+        apply_css(compiled_css, tree)
+        assert tree.to_html(force_one_line=True) == \
+            '<htmlnode><htmlnode class="c0"></htmlnode>' \
+            '<htmlnode class="c0"></htmlnode><htmlnode></htmlnode>' \
+            '</htmlnode>'
+
+    def test_drop_collapsed_declarations(self):
+        tree = HTMLNode(children=[
+            HTMLNode(style={"margin-top": "0", "margin-right": "0",
+                            "margin-bottom": "0", "margin-left": "0"}),
+            HTMLNode(style={"margin": "0", "color": "red"})
+        ])
+
+        # Groups of longhands are collapsed before being dropped
+        compiled_css = compile_css(tree, collapse_shorthands=True,
+                                   drop_global_declarations=True)
+        assert [r.declarations for r in compiled_css.core.rules] == [
+            {"color": "red"}]
+        compiled_css = compile_css(tree, drop_global_declarations=True)
+        assert len(compiled_css.core.rules) == 5
+
+    def test_compact_css_with_dropped_declarations(self):
+        tree = HTMLNode(children=[HTMLNode(style={"margin": "0"}),
+                                  HTMLNode(style={"color": "red"})])
+        compiled_css = compile_css(tree, compact=True,
+                                   drop_global_declarations=True)
+        names = {k: [r.name for r in v]
+                 for k, v in compiled_css.mapping.items()}
+        assert names == {(("margin", "0"),): [], (("color", "red"),): ["c0"]}
+        assert tree.to_html(css=compiled_css, force_one_line=True) == \
+            '<htmlnode><htmlnode></htmlnode><htmlnode class="c0"></htmlnode>' \
+            '</htmlnode>'
+
+    @pytest.mark.parametrize("count, inline", [
+        (1, True), (2, True), (3, True), (4, False), (10, False)
+    ])
+    def test_filter_inline_groups(self, count, inline):
+        groups = [(("color", "red"),), (("margin", "0"), ("padding", "0"))]
+        signatures = {frozenset([("color", "red")]): count,
+                      frozenset([("margin", "0"), ("padding", "0")]): 1}
+
+        # The group used by a single node is always cheaper inline
+        kept = _filter_inline_groups(groups, signatures)
+        assert kept == ([] if inline else groups[:1])
+
+    @pytest.mark.parametrize("group_rules", [False, True])
+    def test_compile_css_with_inline_styles(self, group_rules):
+        tree = HTMLNode(children=[
+            HTMLNode(style={"color": "red", "margin": "1px"})
+            for _ in range(5)
+        ] + [HTMLNode(style={"color": "red", "width": "50%"})])
+        compiled_css = compile_css(tree, group_rules=group_rules,
+                                   inline_styles=True)
+
+        # Only the declarations used by a single node are written inline
+        declarations = [r.declarations for r in compiled_css.core.rules]
+        assert all("width" not in d for d in declarations)
+        assert compiled_css.inline == {id(tree.children[-1]): "width:50%"}
+        assert compiled_css.inline_for(tree.children[-1]) == "width:50%"
+        assert compiled_css.inline_for(tree.children[0]) is None
+        assert compile_css(tree, group_rules=group_rules).inline == {}
+
+    def test_compact_css_with_inline_styles(self):
+        tree = HTMLNode(children=[
+            HTMLNode(style={"margin-top": "1px", "margin-right": "2px",
+                            "margin-bottom": "1px", "margin-left": "2px"})
+        ])
+        compiled_css = compile_css(tree, compact=True, inline_styles=True,
+                                   collapse_shorthands=True)
+        assert compiled_css.core.rules == []
+        assert compiled_css.inline == {
+            tuple(tree.children[0].style.items()): "margin:1px 2px"}
+        assert compiled_css.inline_for(tree.children[0]) == "margin:1px 2px"
+
+    @pytest.mark.parametrize("style", [{"color": "<b>"}, {"c*lor": "red"}])
+    def test_invalid_inline_style(self, style):
+        tree = HTMLNode(style=style)
+        with pytest.raises(ValueError):
+            compile_css(tree, inline_styles=True)
+
+    @staticmethod
+    def _make_box_tree() -> HTMLNode:
+        item = {"display": "flex", "align-items": "center"}
+        return HTMLNode(attributes={"data-role": "box"}, style={
+            "display": "flex", "flex-direction": "row"
+        }, children=[
+            HTMLNode(attributes={"data-role": "box-item"},
+                     style=item | {"flex-grow": str(i % 2)})
+            for i in range(4)
+        ] + [HTMLNode(style=item | {"flex-grow": "0"}),
+             HTMLNode(attributes={"data-role": "other", "id": "x"})])
+
+    def test_get_attribute_rules(self):
+        tree = TestCompileCSS._make_box_tree()
+        table = _intern_styles(tree.get_styles())
+        values = _get_attribute_values([tree], ["data-role"])
+        assert len(values) == 6
+        assert values[id(tree)] == (("data-role", "box"),)
+        counts = _count_attribute_styles(table, values)
+        rules, folded = _get_attribute_rules(counts)
+
+        # Only the box items are common enough to get a rule, and only the
+        # styles whose nodes are all box items lose declarations
+        assert [(r.selector, r.declarations) for r in rules] == [
+            ('[data-role="box-item"]',
+             {"align-items": "center", "display": "flex"})]
+        assert folded == {
+            (("display", "flex"), ("align-items", "center"),
+             ("flex-grow", "1")): (("flex-grow", "1"),)
+        }
+
+    def test_attribute_rules_need_shared_declarations(self):
+        tree = HTMLNode(children=[
+            HTMLNode(attributes={"data-role": "a"}, style={"color": "red"}),
+            HTMLNode(attributes={"data-role": "a"}),
+            HTMLNode(attributes={"data-role": "b c"}, style={"color": "red"}),
+            HTMLNode(attributes={"data-role": "b c"}, style={"color": "red"})
+        ])
+        compiled_css = compile_css(tree, attribute_selectors=["data-role"])
+        assert compiled_css.attributes.rules == []
+        assert compiled_css.to_css() == compile_css(tree).to_css()
+
+    @pytest.mark.parametrize("group_rules", [False, True])
+    def test_compile_css_with_attribute_rules(self, group_rules):
+        tree = TestCompileCSS._make_box_tree()
+        compiled_css = compile_css(tree, group_rules=group_rules,
+                                   attribute_selectors=["data-role"])
+        assert [r.selector for r in compiled_css.attributes.rules] == [
+            '[data-role="box-item"]']
+
+        # Box items with their own style only keep the class of their growth
+        flex_grow = [r for r in compiled_css.core.rules
+                     if r.declarations == {"flex-grow": "1"}]
+        assert compiled_css.mapping[id(tree.children[1])] == flex_grow
+        assert len(compiled_css.mapping[id(tree.children[0])]) > 1
+        assert compiled_css.mapping[id(tree.children[0])] is \
+            compiled_css.mapping[id(tree.children[4])]
+
+        # The attribute rules come between the preamble and the core rules
+        css = compiled_css.to_css()
+        assert css.index("Preamble") < css.index("Attributes") < \
+            css.index("Core")
+        assert '[data-role="box-item"] {' in css
+        node_css = compiled_css.to_css(node_ids=[id(tree.children[1])])
+        assert '[data-role="box-item"] {' in node_css
+
+    @pytest.mark.parametrize("compact", [False, True])
+    def test_render_with_attribute_rules(self, compact):
+        tree = TestCompileCSS._make_box_tree()
+        compiled_css = compile_css(tree, compact=compact,
+                                   attribute_selectors=["data-role"])
+        expected = tree.to_html(css=compiled_css, minify=True)
+        assert '<htmlnode class="c4" data-role="box-item">' in expected
+        arena = HTMLArena.from_node(tree)
+        arena_css = compiled_css if compact else compile_css(
+            arena, attribute_selectors=["data-role"])
+        assert arena_css.to_css() == compiled_css.to_css()
+        assert arena.to_html(css=arena_css, minify=True) == expected
+        apply_css(compiled_css, tree)
+        assert tree.to_html(minify=True) == expected
+
+
 
 class TestCompiledCSS:
     def test_export_custom_compiled_css(self, wrap_core_css):
@@ -375,6 +881,121 @@ class TestCompiledCSS:
         css = compile_css(node).to_css(indent_size=indent_size)
         assert css == wrap_core_css(expected_core_css, indent_size=indent_size)
 
+    def test_minified_css(self):
+        tree = HTMLNode(children=[HTMLNode(style={"a": "0", "b": "1"})],
+                        style={"a": "0"})
+        compiled_css = compile_css(tree)
+        preamble = "*, *::before, *::after{box-sizing:border-box;margin:0;" \
+            "padding:0;overflow:hidden}"
+        assert compiled_css.to_css(minify=True) == \
+            preamble + ".c0{a:0}.c1{b:1}"
+        assert compiled_css.to_css(minify=True, node_ids=[id(tree)]) == \
+            preamble + ".c0{a:0}"
+        assert len(compiled_css.to_css(minify=True)) < \
+            len(compiled_css.to_css())
+
+    def test_export_rules_of_nodes(self, wrap_core_css):
+        inner = HTMLNode(style={"color": "blue", "margin": "0"})
+        other = HTMLNode(style={"padding": "0"})
+        tree = HTMLNode(children=[inner, other], style={"margin": "0"})
+        compiled_css = compile_css(tree)
+        expected_core_css = '\n'.join([
+            ".c0 {",
+            "    color: blue;",
+            "}",
+            "",
+            ".c1 {",
+            "    margin: 0;",
+            "}"
+        ])
+        assert compiled_css.to_css(node_ids=[id(tree), id(inner)]) == \
+            wrap_core_css(expected_core_css)
+        assert compiled_css.to_css(node_ids=[]) == wrap_core_css("")
+        assert compiled_css.to_css(node_ids=[id(tree), id(inner),
+                                             id(other)]) == \
+            compiled_css.to_css()
+
+    @pytest.mark.parametrize("threshold, expected_shared", [
+        (0, ["c0", "c1", "c2", "c3"]),
+        (0.5, ["c1", "c2"]),
+        (0.75, ["c2"]),
+        (1.5, []),
+    ])
+    def test_split(self, threshold, expected_shared):
+        trees = [
+            HTMLNode(style={"margin": "0", "color": "blue"}),
+            HTMLNode(children=[HTMLNode(style={"margin": "0"})],
+                     style={"padding": "0", "color": "red"}),
+            HTMLNode(style={"margin": "0", "color": "red"}),
+            HTMLNode(),
+        ]
+        compiled_css = compile_css(trees)
+        assert [r.name for r in compiled_css.core.rules] == \
+            ["c0", "c1", "c2", "c3"]  # blue, red, margin, padding
+        shared, specific = compiled_css.split(threshold)
+        assert [r.name for r in shared] == expected_shared
+        used = [["c0", "c2"], ["c1", "c2", "c3"], ["c1", "c2"], []]
+        assert [[r.name for r in rules] for rules in specific] == [
+            [n for n in names if n not in expected_shared] for names in used]
+
+
+    @pytest.mark.parametrize("group_rules", [False, True])
+    def test_compact_mapping(self, group_rules):
+        tree = TestRenderTimeCSS._make_tree()
+        full_css = compile_css(tree, group_rules=group_rules)
+        compact_css = compile_css(tree, group_rules=group_rules, compact=True)
+        assert compact_css.compact and not full_css.compact
+        assert compact_css.trees == []
+        assert compact_css.to_css() == full_css.to_css()
+
+        # Unstyled nodes are left out and each style has a tuple of rules
+        names = {k: [r.name for r in v]
+                 for k, v in compact_css.mapping.items()}
+        assert names == {
+            (("margin", "0"), ("padding", "0")): ["c1", "c2"],
+            (("margin", "0"), ("color", "red")): ["c0", "c1"],
+            (("color", "red"),): ["c0"]
+        }
+        assert all(isinstance(v, tuple) for v in compact_css.mapping.values())
+
+        # Nodes are looked up from their styles
+        nodes, stack = [], [tree]
+        while stack:
+            nodes.append(stack.pop())
+            stack += nodes[-1].children
+        assert len(nodes) == len(full_css.mapping)
+        for node in nodes:
+            rules = full_css.rules_for(node)
+            assert rules is full_css.mapping[id(node)]
+            assert [r.name for r in compact_css.rules_for(node)] == \
+                [r.name for r in rules]
+
+    def test_compact_css_does_not_keep_trees(self):
+        tree = TestRenderTimeCSS._make_tree()
+        reference = weakref.ref(tree)
+        compiled_css = compile_css(tree, compact=True)
+        del tree
+        gc.collect()
+        assert reference() is None
+        assert compiled_css.split(0.5) == (compiled_css.core.rules, [])
+
+    def test_rules_for_unknown_node(self):
+        compiled_css = compile_css(HTMLNode(style={"margin": "0"}))
+        compact_css = compile_css(HTMLNode(style={"margin": "0"}),
+                                  compact=True)
+        node = HTMLNode(style={"padding": "0"})
+        with pytest.raises(KeyError):
+            compiled_css.rules_for(node)
+        with pytest.raises(KeyError):
+            compact_css.rules_for(node)
+        assert compact_css.rules_for(HTMLNode()) == ()
+
+    def test_compact_css_with_node_ids(self):
+        tree = HTMLNode(style={"margin": "0"})
+        compiled_css = compile_css(tree, compact=True)
+        with pytest.raises(ValueError, match="compact"):
+            compiled_css.to_css(node_ids=[id(tree)])
+
 
 class TestApplyCSS:
     @pytest.mark.parametrize("class_in, class_out", [
@@ -392,6 +1013,15 @@ class TestApplyCSS:
         assert tree.attributes["class"] == class_out
         assert tree.to_html() == f'<htmlnode class="{class_out}"></htmlnode>'
 
+    def test_apply_css_does_not_allocate_containers(self):
+        leaf = HTMLNode()
+        tree = HTMLNode(children=[leaf], style={"a": "0"})
+        apply_css(compile_css(tree), tree)
+        assert tree.attributes == {"class": "c0"}
+        assert leaf._children is None
+        assert leaf._attributes is None
+        assert leaf._style is None
+
     @pytest.mark.parametrize("cl1_in, cl1_out", [
         (None, "c2 c3"),  # No class attribute
         ("", "c2 c3"),  # Empty class
@@ -529,6 +1159,22 @@ class TestApplyCSS:
         assert tree.attributes["class"] == class_out
         assert tree.to_html() == html_after
 
+    @pytest.mark.parametrize("style_in, style_out", [
+        (None, "width:50%"),
+        ("height:0", "height:0;width:50%"),
+        ("height:0;", "height:0;width:50%")
+    ])
+    def test_apply_inline_styles(self, style_in, style_out):
+        attributes = {} if style_in is None else {"style": style_in}
+        tree = HTMLNode(children=[
+            HTMLNode(style={"color": "red"}) for _ in range(5)
+        ] + [HTMLNode(attributes=attributes,
+                      style={"color": "red", "width": "50%"})])
+        apply_css(compile_css(tree, inline_styles=True), tree)
+        assert tree.children[0].attributes == {"class": "c0"}
+        assert tree.children[-1].attributes == {"class": "c0",
+                                                "style": style_out}
+
     def test_empty_style(self):
         """Tests that no classes are added if style exists but is empty."""
         tree = HTMLNode(style={})
@@ -539,6 +1185,164 @@ class TestApplyCSS:
         assert tree.to_html() == '<htmlnode></htmlnode>'
 
 
+class TestRenderTimeCSS:
+    @staticmethod
+    def _make_tree() -> HTMLNode:
+        return HTMLNode(style={"margin": "0", "padding": "0"}, children=[
+            HTMLNode(attributes={"class": "custom c0", "id": "a"},
+                     style={"margin": "0", "color": "red"}),
+            HTMLNode(children=[RawText("text")]),
+            TextNode("<b>", style={"color": "red"})
+        ])
+
+    @staticmethod
+    def _render_applied(**kwargs: Any) -> str:
+        tree = TestRenderTimeCSS._make_tree()
+        apply_css(compile_css(tree), tree)
+        return tree.to_html(**kwargs)
+
+    @pytest.mark.parametrize("kwargs", [
+        {}, {"minify": True}, {"force_one_line": True}, {"indent_level": -1},
+        {"cache": True}, {"replace_all_entities": True},
+        {"collapse_empty": False, "indent_size": 2}
+    ])
+    def test_same_html_as_apply_css(self, kwargs):
+        tree = TestRenderTimeCSS._make_tree()
+        compiled_css = compile_css(tree)
+        expected = TestRenderTimeCSS._render_applied(**kwargs)
+        assert tree.to_html(css=compiled_css, **kwargs) == expected
+        assert ''.join(tree.iter_html(css=compiled_css, **kwargs)) == expected
+
+    @pytest.mark.parametrize("minify", [False, True])
+    def test_overridden_start_tag_methods(self, minify):
+        def make_tree():
+            hideable = test_html_node.TestHTMLNode.HideableNode(
+                attributes={"id": "a"}, style={"color": "red"})
+            hideable.hidden = True
+            heading = test_html_node.TestHTMLNode.Heading(2, "t")
+            heading.style["color"] = "red"
+            return HTMLNode(children=[hideable, heading])
+
+        tree = make_tree()
+        compiled_css = compile_css(tree)
+        html = tree.to_html(css=compiled_css, minify=minify)
+        assert '<hideablenode class="c0" id="a" hidden>' in html
+        assert '<h2 class="c0">' in html
+        expected = make_tree()
+        apply_css(compile_css(expected), expected)
+        assert html == expected.to_html(minify=minify)
+
+        # The start tags follow later changes to the nodes
+        tree.children[0].hidden = False
+        tree.children[1].level = 3
+        html = tree.to_html(css=compiled_css, minify=minify)
+        assert '<hideablenode class="c0" id="a">' in html
+        assert '<h3 class="c0">' in html
+
+    def test_tree_is_not_modified(self):
+        tree = TestRenderTimeCSS._make_tree()
+        html = tree.to_html()
+        compiled_css = compile_css(tree)
+        tree.to_html(css=compiled_css)
+        tree.to_html(css=compiled_css, minify=True)
+        assert tree.to_html() == html
+        assert tree._attributes is None
+        assert tree.children[0].attributes == {"class": "custom c0",
+                                               "id": "a"}
+
+    def test_existing_classes(self):
+        tree = HTMLNode(attributes={"class": "c1 x"},
+                        style={"margin": "0", "padding": "0"})
+        html = tree.to_html(css=compile_css(tree))
+        assert html == '<htmlnode class="c1 x c0"></htmlnode>'
+
+    def test_render_with_several_css(self):
+        tree = TestRenderTimeCSS._make_tree()
+        default_css = compile_css(tree)
+        custom_css = compile_css(tree, class_namer=lambda _, i: f"r{i}")
+        for cache in (False, True):
+            for _ in range(2):
+                assert tree.to_html(css=default_css, cache=cache) == \
+                    TestRenderTimeCSS._render_applied()
+                custom_html = tree.to_html(css=custom_css, cache=cache)
+                assert 'class="r1 r2"' in custom_html
+                assert "c0" not in custom_html.replace("custom c0", "")
+                assert tree.to_html(cache=cache) == \
+                    TestRenderTimeCSS._make_tree().to_html()
+
+    def test_render_from_several_threads(self):
+        trees = [TestRenderTimeCSS._make_tree() for _ in range(50)]
+        root = HTMLNode(children=trees)
+        compiled_css = compile_css(root)
+        expected_tree = HTMLNode(children=[TestRenderTimeCSS._make_tree()
+                                           for _ in range(50)])
+        apply_css(compile_css(expected_tree), expected_tree)
+        expected = expected_tree.to_html()
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(
+                lambda _: root.to_html(css=compiled_css), range(20)))
+        assert results == [expected] * 20
+
+    @pytest.mark.parametrize("minify", [False, True])
+    def test_arena(self, minify):
+        arena = HTMLArena.from_node(TestRenderTimeCSS._make_tree())
+        compiled_css = compile_css(arena)
+        expected = TestRenderTimeCSS._render_applied(minify=minify)
+        assert arena.to_html(css=compiled_css, minify=minify) == expected
+        assert arena.get_attributes(0) == {}
+
+    @pytest.mark.parametrize("kwargs", [
+        {}, {"minify": True}, {"force_one_line": True}, {"cache": True}
+    ])
+    def test_compact_css(self, kwargs):
+        tree = TestRenderTimeCSS._make_tree()
+        compiled_css = compile_css(tree, compact=True)
+        expected = TestRenderTimeCSS._render_applied(**kwargs)
+        assert tree.to_html(css=compiled_css, **kwargs) == expected
+        arena = HTMLArena.from_node(tree)
+        assert arena.to_html(css=compiled_css, **kwargs) == expected
+
+        # The same compact CSS applies to other trees with the same styles
+        other = TestRenderTimeCSS._make_tree()
+        apply_css(compiled_css, other)
+        assert other.to_html(**kwargs) == expected
+        apply_css(compiled_css, arena)
+        assert arena.to_html(**kwargs) == expected
+
+    @pytest.mark.parametrize("compact", [False, True])
+    @pytest.mark.parametrize("kwargs", [
+        {}, {"minify": True}, {"force_one_line": True}, {"cache": True}
+    ])
+    def test_inline_styles(self, compact, kwargs):
+        def make_tree():
+            return HTMLNode(children=[
+                HTMLNode(style={"color": "red"}) for _ in range(5)
+            ] + [HTMLNode(attributes={"style": "height:0"},
+                          style={"width": "50%"}),
+                 HTMLNode(style={"color": "red", "width": "50%"})])
+
+        # Rendering with inline styles is the same as applying them
+        tree = make_tree()
+        compiled_css = compile_css(tree, inline_styles=True, compact=compact)
+        applied = make_tree()
+        apply_css(compiled_css if compact else compile_css(
+            applied, inline_styles=True), applied)
+        expected = applied.to_html(**kwargs)
+        assert 'style="height:0;width:50%"' in expected
+        assert tree.to_html(css=compiled_css, **kwargs) == expected
+        arena = HTMLArena.from_node(tree)
+        arena_css = compiled_css if compact else compile_css(
+            arena, inline_styles=True)
+        assert arena.to_html(css=arena_css, **kwargs) == expected
+
+    @pytest.mark.parametrize("minify", [False, True])
+    def test_invalid_class_name(self, minify):
+        tree = HTMLNode(style={"margin": "0"})
+        compiled_css = compile_css(tree, class_namer=lambda _, i: f"{i}c")
+        with pytest.raises(ValueError, match="0c"):
+            tree.to_html(css=compiled_css, minify=minify)
+
+
 class TestDefaultRuleNamer:
     def test_default_class_namer(self):
         rules = [ClassRule(None, {"color": "red"}),
@@ -557,3 +1361,97 @@ class TestDefaultRuleNamer:
             rule.name = default_class_namer(rules=rules, index=i)
         assert rules[0].name == "c0"
         assert rules[1].name == "c1"
+
+
+class TestShortRuleNamer:
+    @pytest.mark.parametrize("index, name", [
+        (0, "a"), (1, "b"), (25, "z"), (26, "A"), (51, "Z"), (52, "aa"),
+        (53, "ab"), (113, "a9"), (114, "ba"), (3275, "Z9"), (3276, "aaa"),
+        (3277, "aab")
+    ])
+    def test_short_class_namer(self, index, name):
+        rules = [ClassRule(None, {"margin": "0"})]
+        assert short_class_namer(rules=rules, index=index, usage=[1]) == name
+
+    def test_short_class_names_are_unique_and_valid(self):
+        names = [short_class_namer([], i, []) for i in range(20000)]
+        assert len(set(names)) == len(names)
+        for name in names:
+            validate_css_identifier(name)
+        assert [len(n) for n in names] == sorted(len(n) for n in names)
+
+
+class TestHashedRuleNamer:
+    @staticmethod
+    def _name_all(namer: HashedClassNamer,
+                  rules: List[ClassRule]) -> List[str]:
+        return [namer(rules, i) for i in range(len(rules))]
+
+    def test_names_depend_on_declarations_only(self):
+        rules = [ClassRule(None, {"color": "red"}),
+                 ClassRule(None, {"margin": "0", "padding": "0"})]
+        names = TestHashedRuleNamer._name_all(HashedClassNamer(), rules)
+        assert len(set(names)) == 2
+        assert all(len(n) == 6 for n in names)
+
+        # Adding rules and changing their order does not rename them
+        other_rules = [ClassRule(None, {"font-size": "16px"}),
+                       ClassRule(None, {"padding": "0", "margin": "0"}),
+                       ClassRule(None, {"color": "red"})]
+        other_names = TestHashedRuleNamer._name_all(HashedClassNamer(),
+                                                    other_rules)
+        assert other_names[1:] == names[::-1]
+        assert other_names[0] not in names
+
+    @pytest.mark.parametrize("length", [1, 2, 6, 10])
+    def test_names_are_unique_and_valid(self, length):
+        rules = [ClassRule(None, {"margin": f"{i}px"}) for i in range(500)]
+        names = TestHashedRuleNamer._name_all(HashedClassNamer(length),
+                                              rules)
+        assert len(set(names)) == len(names)
+        for name in names:
+            validate_css_identifier(name)
+            assert len(name) >= length
+
+    def test_colliding_names_are_lengthened(self):
+        rules = [ClassRule(None, {"margin": f"{i}px"}) for i in range(500)]
+        short_names = TestHashedRuleNamer._name_all(HashedClassNamer(1),
+                                                    rules)
+        long_names = TestHashedRuleNamer._name_all(HashedClassNamer(12),
+                                                   rules)
+
+        # With 500 rules, some but not all names collide on their first
+        # character and get lengthened
+        assert 1 < len(set(len(n) for n in short_names))
+        for short_name, long_name in zip(short_names, long_names):
+            assert long_name.startswith(short_name)
+            others = [n for n in long_names if n != long_name]
+            assert not any(n.startswith(short_name) for n in others)
+
+    def test_identical_declarations(self):
+        rules = [ClassRule(None, {"margin": "0", "color": "red"}),
+                 ClassRule(None, {"color": "blue"}),
+                 ClassRule(None, {"color": "red", "margin": "0"}),
+                 ClassRule(None, {"margin": "0", "color": "red"})]
+        names = TestHashedRuleNamer._name_all(HashedClassNamer(), rules)
+        assert names[2:] == [f"{names[0]}_1", f"{names[0]}_2"]
+        assert names[1] != names[0]
+
+    def test_unchanged_styles_produce_identical_html(self):
+        def render(extra_styles):
+            tree = HTMLNode(children=[
+                HTMLNode(style={"margin": "0", "color": "red"}),
+                HTMLNode(style={"padding": "0"})
+            ] + [HTMLNode(style=s) for s in extra_styles])
+            compiled_css = compile_css(tree, class_namer=HashedClassNamer())
+            apply_css(compiled_css, tree)
+            return [c.to_html() for c in tree.children[:2]]
+
+        expected = render([])
+        assert render([{"font-size": "16px"}]) == expected
+        assert render([{"margin": "1px"}, {"color": "blue"}]) == expected
+
+    @pytest.mark.parametrize("length", [0, -1])
+    def test_invalid_length(self, length):
+        with pytest.raises(ValueError, match=str(length)):
+            HashedClassNamer(length)
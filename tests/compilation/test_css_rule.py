@@ -11,7 +11,8 @@
 # =======================================================================
 
 import pytest
-from webwidgets.compilation.css.css_rule import ClassRule, CSSRule
+from webwidgets.compilation.css.css_rule import AttributeRule, ClassRule, \
+    CSSRule
 
 
 class TestClassRule:
@@ -61,6 +62,28 @@ class TestClassRule:
             rule.to_css()
 
 
+class TestAttributeRule:
+    def test_attribute_rule_to_css(self):
+        rule = AttributeRule("data-role", "box-item", {"display": "flex"})
+        assert rule.selector == '[data-role="box-item"]'
+        assert (rule.attribute, rule.value) == ("data-role", "box-item")
+        assert rule.to_css() == '\n'.join([
+            '[data-role="box-item"] {',
+            "    display: flex;",
+            "}"
+        ])
+        assert rule.to_css(minify=True) == \
+            '[data-role="box-item"]{display:flex}'
+
+    @pytest.mark.parametrize("attribute, value", [
+        ("data-role", "a b"), ("data-role", 'a"b'), ("3role", "box")
+    ])
+    def test_invalid_attribute_rule(self, attribute, value):
+        rule = AttributeRule(attribute, value, {"display": "flex"})
+        with pytest.raises(ValueError):
+            rule.to_css()
+
+
 class TestCSSRule:
     def test_rule_to_css(self):
         rule = CSSRule(".rule-name", {"color": "red", "margin": "0"})
@@ -91,6 +114,22 @@ class TestCSSRule:
         ])
         assert rule.to_css(indent_size=indent_size) == expected_css
 
+    @pytest.mark.parametrize("declarations, expected_css", [
+        ({}, ".rule-selector{}"),
+        ({"color": "red"}, ".rule-selector{color:red}"),
+        ({"color": "red", "margin": "0 auto"},
+         ".rule-selector{color:red;margin:0 auto}"),
+    ])
+    def test_minified_rule(self, declarations, expected_css):
+        rule = CSSRule(".rule-selector", declarations)
+        assert rule.to_css(minify=True) == expected_css
+        assert rule.to_css(indent_size=8, minify=True) == expected_css
+
+    def test_minified_rule_is_validated(self):
+        rule = CSSRule(".rule", {"hi!": "value"})
+        with pytest.raises(ValueError, match="hi!"):
+            rule.to_css(minify=True)
+
     @pytest.mark.parametrize("selector", [
         ".3rule", ".hi!", ".Wrong name", ".-invalid",
     ])
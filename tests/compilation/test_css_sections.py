@@ -186,6 +186,16 @@ class TestRuleSection:
         ])
         assert section.to_css(indent_size=indent_size) == expected_css
 
+    @pytest.mark.parametrize("title", [None, "title"])
+    def test_to_css_minified(self, title: str):
+        section = RuleSection([
+            CSSRule(".r1", {"color": "red", "margin": "0"}),
+            CSSRule(".r2", {"padding": "1px"}),
+        ], title)
+        expected_css = ".r1{color:red;margin:0}.r2{padding:1px}"
+        assert section.compile_content(minify=True) == expected_css
+        assert section.to_css(minify=True) == expected_css
+
     @pytest.mark.parametrize("title", ["Title */", "No*/*", "/*/"])
     def test_invalid_title(self, title: str):
         with pytest.raises(ValueError, match="Invalid CSS comment"):
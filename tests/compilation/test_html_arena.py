@@ -0,0 +1,166 @@
+# =======================================================================
+#
+#  This file is part of WebWidgets, a Python package for designing web
+#  UIs.
+#
+#  You should have received a copy of the MIT License along with
+#  WebWidgets. If not, see <https://opensource.org/license/mit>.
+#
+#  Copyright(C) 2025, mlaasri
+#
+# =======================================================================
+
+import pytest
+from .test_html_node import TestHTMLNode, TestStreamingHTML
+from webwidgets.compilation.css.css import apply_css, compile_css
+from webwidgets.compilation.html.html_arena import HTMLArena
+from webwidgets.compilation.html.html_node import HTMLNode, RawText, RootNode
+from webwidgets.compilation.html.html_tags import Div, Doctype, TextNode
+
+
+class TestHTMLArena:
+    @staticmethod
+    def _make_arena():
+        arena = HTMLArena()
+        root = arena.add(RootNode)
+        arena.add(Doctype, parent=root)
+        div = arena.add(Div, parent=root, attributes={"id": "a"},
+                        style={"margin": "0"})
+        for i in range(3):
+            item = arena.add(Div, parent=div, attributes={"class": "item"},
+                             style={"margin": "0", "color": "red"})
+            arena.add_text(f"Item {i}", parent=item)
+        arena.add(Div, parent=div)
+        return arena
+
+    def test_build(self):
+        arena = TestHTMLArena._make_arena()
+        assert len(arena) == 10
+        assert arena.get_children(0) == [1, 2]
+        assert arena.get_children(2) == [3, 5, 7, 9]
+        assert arena.get_children(9) == []
+        assert arena.get_parent(0) == -1
+        assert arena.get_parent(4) == 3
+        assert arena.get_class(2) is Div
+        assert arena.get_attributes(2) == {"id": "a"}
+        assert arena.get_style(3) == {"margin": "0", "color": "red"}
+        assert arena.get_text(4) == "Item 0"
+        assert arena.get_text(3) is None
+
+    def test_interning(self):
+        arena = TestHTMLArena._make_arena()
+        assert arena.classes == [RootNode, Doctype, Div, RawText]
+        assert arena.attribute_pool == [(), (("id", "a"),),
+                                        (("class", "item"),)]
+        assert arena.style_pool == [(), (("margin", "0"),),
+                                    (("margin", "0"), ("color", "red"))]
+        assert arena.text_pool == ["Item 0", "Item 1", "Item 2"]
+
+    def test_render(self):
+        arena = TestHTMLArena._make_arena()
+        assert arena.to_html() == "\n".join([
+            "<!DOCTYPE html>",
+            '<div id="a">',
+            '    <div class="item">',
+            "        Item 0",
+            "    </div>",
+            '    <div class="item">',
+            "        Item 1",
+            "    </div>",
+            '    <div class="item">',
+            "        Item 2",
+            "    </div>",
+            "    <div></div>",
+            "</div>"
+        ])
+
+    @pytest.mark.parametrize("parent", [-2, 10, 11])
+    def test_invalid_parent(self, parent):
+        arena = TestHTMLArena._make_arena()
+        with pytest.raises(ValueError, match="Invalid parent index"):
+            arena.add(parent=parent)
+
+    def test_single_root(self):
+        arena = HTMLArena()
+        arena.add()
+        with pytest.raises(ValueError, match="already has a root node"):
+            arena.add()
+
+    @pytest.mark.parametrize("collapse_empty", [False, True])
+    @pytest.mark.parametrize("force_one_line", [False, True])
+    @pytest.mark.parametrize("indent_level", [-3, -1, 0, 2])
+    @pytest.mark.parametrize("indent_size", [0, 3])
+    @pytest.mark.parametrize("replace_all_entities", [False, True])
+    @pytest.mark.parametrize("minify", [False, True])
+    def test_render_matches_nodes(self, collapse_empty, force_one_line,
+                                  indent_level, indent_size,
+                                  replace_all_entities, minify):
+        kwargs = dict(collapse_empty=collapse_empty,
+                      force_one_line=force_one_line,
+                      indent_level=indent_level, indent_size=indent_size,
+                      replace_all_entities=replace_all_entities,
+                      minify=minify)
+        for tree in TestStreamingHTML._make_trees():
+            arena = HTMLArena.from_node(tree)
+            expected_html = tree.to_html(**kwargs)
+            assert arena.to_html(**kwargs) == expected_html
+            assert arena.to_html(return_lines=True, **kwargs) == \
+                tree.to_html(return_lines=True, **kwargs)
+            assert ''.join(arena.iter_html(**kwargs)) == expected_html
+
+    def test_round_trip(self):
+        for tree in TestStreamingHTML._make_trees():
+            other = HTMLArena.from_node(tree).to_node()
+            assert type(other) is type(tree)
+            assert other.to_html() == tree.to_html()
+            assert repr(other) == repr(tree)
+
+    def test_to_node_of_subtree(self):
+        arena = TestHTMLArena._make_arena()
+        node = arena.to_node(3)
+        assert node.to_html() == '<div class="item">\n    Item 0\n</div>'
+        assert node.style == {"margin": "0", "color": "red"}
+
+    def test_custom_nodes(self):
+        tree = HTMLNode(children=[
+            TestHTMLNode.KwargsReceiverNode(),
+            HTMLNode(children=[TestHTMLNode.KwargsReceiverNode()]),
+            TextNode("text")
+        ])
+        arena = HTMLArena.from_node(tree)
+        for force_one_line in (False, True):
+            assert arena.to_html(message="a", force_one_line=force_one_line) \
+                == tree.to_html(message="a", force_one_line=force_one_line)
+        arena = HTMLArena.from_node(TestHTMLNode.KwargsReceiverNode())
+        assert arena.to_html(message="b") == "b"
+        assert ''.join(arena.iter_html(message="c", return_lines=False)) == \
+            "c"
+
+    def test_get_styles(self):
+        arena = TestHTMLArena._make_arena()
+        styles = arena.get_styles()
+        assert list(styles) == [(id(arena), i) for i in range(10)]
+        assert styles[(id(arena), 2)] == {"margin": "0"}
+        assert styles[(id(arena), 3)] is styles[(id(arena), 5)]
+        assert styles[(id(arena), 0)] == {}
+
+    def test_compile_and_apply_css(self):
+        arena = TestHTMLArena._make_arena()
+        tree = arena.to_node()
+        compiled_arena = compile_css(arena)
+        compiled_tree = compile_css(tree)
+        assert compiled_arena.to_css() == compiled_tree.to_css()
+        apply_css(compiled_arena, arena)
+        apply_css(compiled_tree, tree)
+        assert arena.to_html() == tree.to_html()
+        assert arena.get_attributes(3) == {"class": "item c0 c1"}
+
+    def test_compile_css_with_mixed_trees(self):
+        arena = TestHTMLArena._make_arena()
+        tree = HTMLNode(style={"padding": "0"})
+        compiled = compile_css([arena, tree])
+        assert [r.name for r in compiled.core.rules] == ["c0", "c1", "c2"]
+        apply_css(compiled, arena)
+        apply_css(compiled, tree)
+        assert arena.get_attributes(2) == {"id": "a", "class": "c1"}
+        assert tree.attributes == {"class": "c2"}
@@ -0,0 +1,136 @@
+# =======================================================================
+#
+#  This file is part of WebWidgets, a Python package for designing web
+#  UIs.
+#
+#  You should have received a copy of the MIT License along with
+#  WebWidgets. If not, see <https://opensource.org/license/mit>.
+#
+#  Copyright(C) 2025, mlaasri
+#
+# =======================================================================
+
+import copy
+import pickle
+import pytest
+from webwidgets.compilation.html.html_containers import TrackedDict, \
+    TrackedList
+
+
+class TestTrackedDict:
+    class Owner:
+        def __init__(self):
+            self.changes = 0
+
+        def _on_change(self, container):
+            self.changes += 1
+
+    @pytest.mark.parametrize("mutation", [
+        lambda d: d.__setitem__("a", "2"),
+        lambda d: d.__delitem__("a"),
+        lambda d: d.__ior__({"b": "3"}),
+        lambda d: d.clear(),
+        lambda d: d.pop("a"),
+        lambda d: d.pop("z", None),
+        lambda d: d.popitem(),
+        lambda d: d.setdefault("c", "4"),
+        lambda d: d.update(d="5"),
+    ])
+    def test_owners_notified(self, mutation):
+        owners = [TestTrackedDict.Owner(), TestTrackedDict.Owner()]
+        d = TrackedDict({"a": "1"})
+        for owner in owners:
+            d.add_owner(owner)
+        mutation(d)
+        assert [o.changes for o in owners] == [1, 1]
+
+    def test_remove_owner(self):
+        owners = [TestTrackedDict.Owner(), TestTrackedDict.Owner()]
+        d = TrackedDict()
+        for owner in owners:
+            d.add_owner(owner)
+        d.remove_owner(owners[0])
+        d["a"] = "1"
+        assert [o.changes for o in owners] == [0, 1]
+
+    def test_owners_not_kept_alive(self):
+        d = TrackedDict()
+        d.add_owner(TestTrackedDict.Owner())
+        d["a"] = "1"  # The owner no longer exists
+        assert d == {"a": "1"}
+
+    def test_no_notification_on_read(self):
+        owner = TestTrackedDict.Owner()
+        d = TrackedDict({"a": "1"})
+        d.add_owner(owner)
+        assert d["a"] == "1"
+        assert d.get("b") is None
+        assert list(d.items()) == [("a", "1")]
+        assert owner.changes == 0
+
+    @pytest.mark.parametrize("duplicate", [
+        copy.copy,
+        copy.deepcopy,
+        lambda d: pickle.loads(pickle.dumps(d))
+    ])
+    def test_copies_are_regular_dicts(self, duplicate):
+        d = TrackedDict({"a": "1"})
+        d.add_owner(TestTrackedDict.Owner())
+        other = duplicate(d)
+        assert type(other) is dict
+        assert other == {"a": "1"}
+
+
+class TestTrackedList:
+    @pytest.mark.parametrize("mutation", [
+        lambda l: l.__setitem__(0, "z"),
+        lambda l: l.__setitem__(slice(0, 2), ["y", "z"]),
+        lambda l: l.__delitem__(0),
+        lambda l: l.__iadd__(["d"]),
+        lambda l: l.__imul__(2),
+        lambda l: l.append("d"),
+        lambda l: l.clear(),
+        lambda l: l.extend(["d", "e"]),
+        lambda l: l.insert(1, "d"),
+        lambda l: l.pop(),
+        lambda l: l.remove("b"),
+        lambda l: l.reverse(),
+        lambda l: l.sort(reverse=True),
+    ])
+    def test_owners_notified(self, mutation):
+        owners = [TestTrackedDict.Owner(), TestTrackedDict.Owner()]
+        l = TrackedList(["a", "b", "c"])
+        for owner in owners:
+            l.add_owner(owner)
+        mutation(l)
+        assert [o.changes for o in owners] == [1, 1]
+
+    def test_augmented_assignment_keeps_list(self):
+        l = TrackedList(["a"])
+        other = l
+        other += ["b"]
+        other *= 2
+        assert other is l
+        assert l == ["a", "b", "a", "b"]
+
+    def test_no_notification_on_read(self):
+        owner = TestTrackedDict.Owner()
+        l = TrackedList(["a", "b"])
+        l.add_owner(owner)
+        assert l[0] == "a"
+        assert l[1:] == ["b"]
+        assert l.index("b") == 1
+        assert list(reversed(l)) == ["b", "a"]
+        assert owner.changes == 0
+
+    @pytest.mark.parametrize("duplicate", [
+        copy.copy,
+        copy.deepcopy,
+        lambda l: pickle.loads(pickle.dumps(l))
+    ])
+    def test_copies_are_regular_lists(self, duplicate):
+        l = TrackedList(["a"])
+        l.add_owner(TestTrackedDict.Owner())
+        other = duplicate(l)
+        assert type(other) is list
+        assert other == ["a"]
@@ -10,9 +10,15 @@
 #
 # =======================================================================
 
+import asyncio
+import copy
+import io
+import pickle
 import pytest
+from webwidgets.compilation.css import compile_css
+from webwidgets.compilation.html.html_containers import TrackedDict
 from webwidgets.compilation.html.html_node import HTMLNode, no_start_tag, \
-    no_end_tag, one_line, RawText, RootNode
+    no_end_tag, one_line, RawText, RootNode, _get_tag_descriptor
 
 
 class TestHTMLNode:
@@ -49,6 +55,11 @@ class TestHTMLNode:
                 return [message]
             return message
 
+    class ValueNode(HTMLNode):
+        def __init__(self, value, **kwargs):
+            super().__init__(**kwargs)
+            self.value = value
+
     def test_basic_node(self):
         node = HTMLNode()
         assert node.start_tag == "<htmlnode>"
@@ -413,6 +424,22 @@ class TestHTMLNode:
             id(node): {"padding": "5px"},
         }
 
+    def test_get_styles_document_order(self):
+        leaves = [HTMLNode(style={"margin": str(i)}) for i in range(3)]
+        child = HTMLNode(children=leaves[:2])
+        node = HTMLNode(children=[child, leaves[2]])
+        assert list(node.get_styles()) == [
+            id(node), id(child), id(leaves[0]), id(leaves[1]), id(leaves[2])]
+
+    def test_get_styles_deep_tree(self):
+        # Styles are collected without recursion
+        leaf = node = HTMLNode(style={"color": "red"})
+        for _ in range(5000):
+            node = HTMLNode(children=[node])
+        styles = node.get_styles()
+        assert len(styles) == 5001
+        assert styles[id(leaf)] == {"color": "red"}
+
     def test_shallow_copy(self):
         node = HTMLNode(style={"color": "red"})
         copied_node = node.copy(deep=False)
@@ -469,6 +496,293 @@ class TestHTMLNode:
         assert len(node.children) == 1
         assert id(node.children[0]) == id(child)
 
+    def test_return_lines(self):
+        node = HTMLNode(children=[
+            TestHTMLNode.NoStartEndNode(),
+            HTMLNode(children=[RawText('grandchild1')])
+        ])
+        assert node.to_html(return_lines=True) == [
+            "<htmlnode>",
+            "    <htmlnode>",
+            "        grandchild1",
+            "    </htmlnode>",
+            "</htmlnode>"
+        ]
+        assert node.to_html(force_one_line=True, return_lines=True) == [
+            "<htmlnode><htmlnode>grandchild1</htmlnode></htmlnode>"
+        ]
+        assert TestHTMLNode.NoStartEndNode().to_html(return_lines=True) == [""]
+        assert TestHTMLNode.NoStartEndNode(children=[RawText(" ")]).to_html(
+            collapse_empty=False, return_lines=True) == []
+
+    @pytest.mark.parametrize("force_one_line", [False, True])
+    def test_deep_tree(self, force_one_line):
+        depth = 5000
+        node = RawText("leaf")
+        for _ in range(depth):
+            node = HTMLNode(children=[node])
+        if force_one_line:
+            expected_html = "<htmlnode>" * depth + "leaf" + \
+                "</htmlnode>" * depth
+        else:
+            expected_html = "\n".join(
+                [" " * i + "<htmlnode>" for i in range(depth)] +
+                [" " * depth + "leaf"] +
+                [" " * i + "</htmlnode>" for i in reversed(range(depth))])
+        assert node.to_html(indent_size=1,
+                            force_one_line=force_one_line) == expected_html
+
+    def test_tag_descriptor(self):
+        descriptor = _get_tag_descriptor(TestHTMLNode.CustomNode)
+        assert descriptor.name == "customnode"
+        assert descriptor.has_start_tag
+        assert descriptor.builds_start_tag
+        assert descriptor.end_tag == "</customnode>"
+        assert not descriptor.one_line
+        assert _get_tag_descriptor(TestHTMLNode.CustomNode) is descriptor
+
+    def test_tag_descriptor_with_decorators(self):
+        descriptor = _get_tag_descriptor(TestHTMLNode.OneLineNoStartNode)
+        assert not descriptor.has_start_tag
+        assert not descriptor.builds_start_tag
+        assert descriptor.end_tag == "</onelinenostartnode>"
+        assert descriptor.one_line
+        descriptor = _get_tag_descriptor(TestHTMLNode.NoStartEndNode)
+        assert not descriptor.builds_start_tag
+        assert descriptor.end_tag == ""
+        assert not descriptor.one_line
+
+    def test_custom_tag_name(self):
+        class Renamed(HTMLNode):
+            def _get_tag_name(self):
+                return "span"
+        node = Renamed(children=[RawText("a")])
+        assert node.to_html(force_one_line=True) == "<span>a</span>"
+
+    class Heading(HTMLNode):
+        def __init__(self, level: int, text: str):
+            super().__init__(children=[RawText(text)],
+                             attributes=TrackedDict())
+            self.level = level
+
+        def _get_tag_name(self):
+            return f"h{self.level}"
+
+    class HideableNode(HTMLNode):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.hidden = False
+
+        def _render_attributes(self):
+            attributes = super()._render_attributes()
+            if not self.hidden:
+                return attributes
+            return f"{attributes} hidden" if attributes else "hidden"
+
+    @pytest.mark.parametrize("minify", [False, True])
+    def test_tag_name_depending_on_node(self, minify):
+        node = TestHTMLNode.Heading(1, "t")
+        kwargs = dict(force_one_line=True, minify=minify)
+        assert node.to_html(**kwargs) == "<h1>t</h1>"
+        node.level = 2
+        assert node.start_tag == "<h2>"
+        assert node.to_html(**kwargs) == "<h2>t</h2>"
+        assert not _get_tag_descriptor(TestHTMLNode.Heading).builds_start_tag
+
+    @pytest.mark.parametrize("minify", [False, True])
+    def test_rendered_attributes_depending_on_node(self, minify):
+        node = TestHTMLNode.HideableNode(attributes=TrackedDict(id="a"))
+        assert node.to_html(minify=minify) == '<hideablenode id="a">' \
+            '</hideablenode>'
+        node.hidden = True
+        assert node.start_tag == '<hideablenode id="a" hidden>'
+        assert node.to_html(minify=minify) == \
+            '<hideablenode id="a" hidden></hideablenode>'
+        descriptor = _get_tag_descriptor(TestHTMLNode.HideableNode)
+        assert descriptor.has_start_tag
+        assert not descriptor.builds_start_tag
+
+    def test_attributes_are_tracked(self):
+        attributes = TrackedDict({"id": "a"})
+        node = HTMLNode(attributes=attributes)
+        assert node.attributes is attributes
+        assert node.start_tag == '<htmlnode id="a">'
+        attributes["id"] = "b"
+        assert node.start_tag == '<htmlnode id="b">'
+
+    def test_containers_are_not_copied(self):
+        children, attributes, style = [], {"id": "a"}, {"color": "red"}
+        node = HTMLNode(children=children, attributes=attributes, style=style)
+        assert node.children is children
+        assert node.attributes is attributes
+        assert node.style is style
+        assert node.to_html() == '<htmlnode id="a"></htmlnode>'
+
+        # Changes made through the caller's references are rendered
+        children.append(RawText("a"))
+        attributes["id"] = "b"
+        style["color"] = "blue"
+        assert node.to_html(force_one_line=True) == \
+            '<htmlnode id="b">a</htmlnode>'
+        assert node.get_styles() == {id(node): {"color": "blue"},
+                                     id(children[0]): {}}
+
+    def test_shared_containers(self):
+        attributes, style = {"id": "a"}, {"color": "red"}
+        nodes = [HTMLNode(attributes=attributes, style=style)
+                 for _ in range(2)]
+        tree = HTMLNode(children=nodes)
+        expected_html = tree.to_html()
+        assert tree.to_html(cache=True) == expected_html
+        nodes[0].attributes["id"] = "b"
+        nodes[0].style["color"] = "blue"
+        assert nodes[1].attributes == {"id": "b"}
+        assert nodes[1].style == {"color": "blue"}
+        expected_html = expected_html.replace('"a"', '"b"')
+        assert tree.to_html() == expected_html
+        assert tree.to_html(cache=True) == expected_html
+
+    def test_setters_do_not_copy(self):
+        node = HTMLNode()
+        children, attributes, style = [], {}, {}
+        node.children = children
+        node.attributes = attributes
+        node.style = style
+        assert node.to_html() == '<htmlnode></htmlnode>'
+        children.append(RawText("a"))
+        attributes["id"] = "a"
+        style["color"] = "red"
+        assert node.children is children
+        assert node.style is style
+        assert node.to_html(force_one_line=True) == \
+            '<htmlnode id="a">a</htmlnode>'
+
+    def test_start_tag_cache(self):
+        node = HTMLNode(attributes=TrackedDict({"id": "a"}))
+        assert node.start_tag == '<htmlnode id="a">'
+        assert node.start_tag is node.start_tag
+        node.attributes["class"] = "b"
+        assert node.start_tag == '<htmlnode class="b" id="a">'
+        del node.attributes["id"]
+        assert node.start_tag == '<htmlnode class="b">'
+        node.attributes.update({"id": "c"})
+        assert node.start_tag == '<htmlnode class="b" id="c">'
+        node.attributes.pop("class")
+        assert node.start_tag == '<htmlnode id="c">'
+        node.attributes = {"lang": "en"}
+        assert node.start_tag == '<htmlnode lang="en">'
+        node.attributes.clear()
+        assert node.start_tag == '<htmlnode>'
+        assert node.to_html() == '<htmlnode></htmlnode>'
+
+    def test_start_tag_cache_validation(self):
+        node = HTMLNode(attributes={"class": "a"})
+        assert node.to_html() == '<htmlnode class="a"></htmlnode>'
+        node.attributes["class"] = "b!"
+        with pytest.raises(ValueError, match="b!"):
+            node.to_html()
+        node.attributes["class"] = "b"
+        assert node.to_html() == '<htmlnode class="b"></htmlnode>'
+
+    def test_start_tag_cache_with_copies(self):
+        node = HTMLNode(attributes={"id": "a"})
+        assert node.start_tag == '<htmlnode id="a">'
+        shallow_copy = node.copy()
+        deep_copy = node.copy(deep=True)
+        assert shallow_copy.attributes is node.attributes
+        assert deep_copy.attributes is not node.attributes
+        node.attributes["id"] = "b"
+        assert node.start_tag == '<htmlnode id="b">'
+        assert shallow_copy.start_tag == '<htmlnode id="b">'
+        assert deep_copy.start_tag == '<htmlnode id="a">'
+        deep_copy.attributes["id"] = "c"
+        assert deep_copy.start_tag == '<htmlnode id="c">'
+        assert node.start_tag == '<htmlnode id="b">'
+
+    def test_pickle(self):
+        node = HTMLNode(children=[RawText("a")], attributes={"id": "a"})
+        assert node.to_html() == '<htmlnode id="a">\n    a\n</htmlnode>'
+        loaded = pickle.loads(pickle.dumps(node))
+        assert loaded.attributes == {"id": "a"}
+        loaded.attributes["id"] = "b"
+        assert loaded.to_html() == '<htmlnode id="b">\n    a\n</htmlnode>'
+        assert node.to_html() == '<htmlnode id="a">\n    a\n</htmlnode>'
+
+    def test_repr(self):
+        node = HTMLNode(children=[RawText("a")], attributes={"id": "b"})
+        assert node.start_tag == '<htmlnode id="b">'
+        assert repr(node) == "HTMLNode(children=[RawText(children=[], " \
+            "attributes={}, style={}, text='a')], attributes={'id': 'b'}, " \
+            "style={})"
+
+    @pytest.mark.parametrize("node", [HTMLNode(), RawText("a"), RootNode()])
+    def test_slots(self, node):
+        assert not hasattr(node, "__dict__")
+        with pytest.raises(AttributeError):
+            node.unknown = 1
+
+    def test_subclass_without_slots(self):
+        node = TestHTMLNode.ValueNode(1, children=[RawText("a")],
+                                      style={"a": "b"})
+        assert node.to_html() == "<valuenode>\n    a\n</valuenode>"
+        assert repr(node) == "ValueNode(children=[RawText(children=[], " \
+            "attributes={}, style={}, text='a')], attributes={}, " \
+            "style={'a': 'b'}, value=1)"
+        for other in (node.copy(), node.copy(deep=True),
+                      pickle.loads(pickle.dumps(node))):
+            assert other.value == 1
+            assert other.to_html() == node.to_html()
+            assert other.style == {"a": "b"}
+
+    def test_containers_are_lazy(self):
+        node = HTMLNode()
+        assert node._children is None
+        assert node._attributes is None
+        assert node._style is None
+        tree = HTMLNode(children=[node, RawText("a")], attributes={"id": "x"})
+        tree.to_html()
+        tree.to_html(minify=True)
+        tree.to_html(cache=True)
+        assert tree.get_styles() == {id(tree): {}, id(node): {},
+                                     id(tree.children[1]): {}}
+        assert node._children is None
+        assert node._attributes is None
+        assert node._style is None
+
+    @pytest.mark.parametrize("name", ["children", "attributes", "style"])
+    def test_lazy_containers_are_tracked(self, name):
+        node = HTMLNode()
+        container = getattr(node, name)
+        assert container == type(container)()
+        assert getattr(node, name) is container
+        assert getattr(node, "_" + name) is container
+        tree = HTMLNode(children=[node])
+        expected_html = tree.to_html()
+        assert tree.to_html(cache=True) == expected_html
+        if name == "children":
+            container.append(RawText("a"))
+            assert tree.to_html(cache=True) == expected_html.replace(
+                "<htmlnode></htmlnode>", "<htmlnode>\n        a\n    "
+                "</htmlnode>")
+        elif name == "attributes":
+            container["id"] = "a"
+            assert tree.to_html(cache=True) == expected_html.replace(
+                "    <htmlnode>", '    <htmlnode id="a">')
+        else:
+            container["a"] = "b"
+            assert tree._html_cache is None
+
+    def test_none_containers_are_not_stored(self):
+        node = HTMLNode(children=[RawText("a")], attributes={"id": "a"},
+                        style={"a": "b"})
+        node.children = None
+        node.attributes = None
+        node.style = None
+        assert node._children is None
+        assert node._attributes is None
+        assert node._style is None
+        assert node.to_html() == "<htmlnode></htmlnode>"
+
     def test_empty_root_node(self):
         node = RootNode()
         assert node.to_html() == ""
@@ -481,3 +795,318 @@ class TestHTMLNode:
         expected_html = "\n".join(["<htmlnode></htmlnode>"] * n)
         print(expected_html)
         assert node.to_html() == expected_html
+
+
+class TestStreamingHTML:
+    @staticmethod
+    def _make_trees():
+        """Returns a list of trees covering all kinds of nodes and tags."""
+        return [
+            HTMLNode(),
+            RawText("  "),
+            RawText("<text>\n"),
+            RootNode(),
+            RootNode(children=[HTMLNode(), RawText("a")]),
+            TestHTMLNode.NoStartEndNode(),
+            TestHTMLNode.NoStartEndNode(children=[TestHTMLNode.NoStartEndNode()]),
+            HTMLNode(attributes={"b": "1", "a": "2"}, children=[
+                TestHTMLNode.CustomNode(),
+                RawText("raw_text"),
+                RawText(" "),
+                RawText(""),
+                TestHTMLNode.OneLineNode([
+                    HTMLNode(children=[RawText("inner")])
+                ]),
+                TestHTMLNode.NoStartEndNode(),
+                HTMLNode(children=[
+                    TestHTMLNode.NoEndNode([RawText("child1")]),
+                    TestHTMLNode.OneLineNoStartNode([RawText("child2")]),
+                    TestHTMLNode.NoStartNode([
+                        RootNode(children=[HTMLNode(), RawText("?'\"")])
+                    ]),
+                ])
+            ])
+        ]
+
+    @pytest.mark.parametrize("collapse_empty", [False, True])
+    @pytest.mark.parametrize("force_one_line", [False, True])
+    @pytest.mark.parametrize("indent_level", [-3, -1, 0, 2])
+    @pytest.mark.parametrize("indent_size", [0, 3])
+    @pytest.mark.parametrize("replace_all_entities", [False, True])
+    def test_iter_html_matches_to_html(self, collapse_empty, force_one_line,
+                                       indent_level, indent_size,
+                                       replace_all_entities):
+        kwargs = dict(collapse_empty=collapse_empty,
+                      force_one_line=force_one_line,
+                      indent_level=indent_level, indent_size=indent_size,
+                      replace_all_entities=replace_all_entities)
+        for tree in TestStreamingHTML._make_trees():
+            expected_html = tree.to_html(**kwargs)
+            assert ''.join(tree.iter_html(**kwargs)) == expected_html
+
+    def test_iter_html_is_lazy(self):
+        tree = HTMLNode(children=[HTMLNode(children=[RawText("a")]),
+                                  HTMLNode(children=[RawText("b")])])
+        chunks = tree.iter_html()
+        assert next(chunks) == "<htmlnode>"
+        tree.children[1].children[0].text = "c"
+        assert ''.join(chunks) == '\n'.join([
+            "",
+            "    <htmlnode>",
+            "        a",
+            "    </htmlnode>",
+            "    <htmlnode>",
+            "        c",
+            "    </htmlnode>",
+            "</htmlnode>"
+        ])
+
+    def test_iter_html_kwargs_pass_down(self):
+        node = HTMLNode(children=[
+            TestHTMLNode.CustomNode(),
+            TestHTMLNode.KwargsReceiverNode()
+        ])
+        expected_html = node.to_html(message="Message is 42")
+        assert ''.join(node.iter_html(message="Message is 42")) == \
+            expected_html
+        assert ''.join(TestHTMLNode.KwargsReceiverNode().iter_html(
+            return_lines=False, message="Hi")) == "Hi"
+
+    @pytest.mark.parametrize("force_one_line", [False, True])
+    def test_write_html(self, force_one_line):
+        tree = TestStreamingHTML._make_trees()[-1]
+        file = io.StringIO()
+        tree.write_html(file, force_one_line=force_one_line)
+        assert file.getvalue() == tree.to_html(force_one_line=force_one_line)
+
+    @pytest.mark.parametrize("chunk_size", [1, 7, 65536])
+    @pytest.mark.parametrize("force_one_line", [False, True])
+    def test_aiter_html(self, chunk_size, force_one_line):
+        async def collect(tree):
+            return [chunk async for chunk in tree.aiter_html(
+                chunk_size=chunk_size, force_one_line=force_one_line,
+                replace_all_entities=True)]
+
+        for tree in TestStreamingHTML._make_trees():
+            chunks = asyncio.run(collect(tree))
+            assert b''.join(chunks) == tree.to_html(
+                force_one_line=force_one_line,
+                replace_all_entities=True).encode("utf-8")
+            assert all(len(c) == chunk_size for c in chunks[:-1])
+
+    def test_aiter_html_encoding(self):
+        async def collect(tree):
+            return [chunk async for chunk in tree.aiter_html(
+                encoding="utf-16-le")]
+
+        tree = RootNode(children=[HTMLNode(children=[RawText("é")])])
+        assert asyncio.run(collect(tree)) == \
+            [tree.to_html().encode("utf-16-le")]
+
+
+class TestRenderCache:
+    @pytest.mark.parametrize("collapse_empty", [False, True])
+    @pytest.mark.parametrize("force_one_line", [False, True])
+    @pytest.mark.parametrize("indent_level", [-3, -1, 0, 2])
+    @pytest.mark.parametrize("indent_size", [0, 3])
+    @pytest.mark.parametrize("replace_all_entities", [False, True])
+    def test_cache_matches_no_cache(self, collapse_empty, force_one_line,
+                                    indent_level, indent_size,
+                                    replace_all_entities):
+        kwargs = dict(collapse_empty=collapse_empty,
+                      force_one_line=force_one_line,
+                      indent_level=indent_level, indent_size=indent_size,
+                      replace_all_entities=replace_all_entities)
+        for tree in TestStreamingHTML._make_trees():
+            expected_html = tree.to_html(**kwargs)
+            assert tree.to_html(cache=True, **kwargs) == expected_html
+            assert tree.to_html(cache=True, **kwargs) == expected_html
+            assert ''.join(tree.iter_html(cache=True, **kwargs)) == \
+                expected_html
+
+    def test_cache_with_mixed_arguments(self):
+        tree = TestStreamingHTML._make_trees()[-1]
+        expected_htmls = [tree.to_html(indent_size=s, force_one_line=f)
+                          for s in (2, 4) for f in (False, True)]
+        for _ in range(2):
+            assert [tree.to_html(indent_size=s, force_one_line=f, cache=True)
+                    for s in (2, 4) for f in (False, True)] == expected_htmls
+
+    def test_cache_is_reused(self):
+        leaf = HTMLNode(children=[RawText("a")])
+        tree = HTMLNode(children=[HTMLNode(children=[leaf])])
+        tree.to_html(cache=True)
+        assert tree._html_cache is not None
+        assert leaf._html_cache is not None
+        leaf._html_cache = {k: (("<cached>",), v[1])
+                            for k, v in leaf._html_cache.items()}
+        tree._html_cache = tree.children[0]._html_cache = None
+        assert tree.to_html(cache=True) == '\n'.join([
+            "<htmlnode>",
+            "    <htmlnode>",
+            "<cached>",
+            "    </htmlnode>",
+            "</htmlnode>"
+        ])
+
+    def test_shared_node_is_cached_once(self):
+        shared = HTMLNode(children=[RawText("a")])
+        tree = HTMLNode(children=[shared, HTMLNode(children=[shared])])
+        expected_html = tree.to_html()
+        assert tree.to_html(cache=True) == expected_html
+        shared.children[0].text = "b"
+        assert tree.to_html(cache=True) == expected_html.replace("a", "b")
+
+    @pytest.mark.parametrize("mutation, old, new", [
+        (lambda t: t.children[0].children[0].children.append(RawText("b")),
+         "            a", "            a\n            b"),
+        (lambda t: t.children[0].children[0].children.pop(),
+         "        <htmlnode>\n            a\n        </htmlnode>",
+         "        <htmlnode></htmlnode>"),
+        (lambda t: t.children[0].children[0].children.__setitem__(
+            0, HTMLNode()), "            a", "            <htmlnode></htmlnode>"),
+        (lambda t: setattr(t.children[0].children[0], "children",
+                           [RawText("b")]), "            a", "            b"),
+        (lambda t: t.children[0].children[0].children[0].__setattr__(
+            "text", "b"), "            a", "            b"),
+        (lambda t: t.children[0].attributes.__setitem__("id", "x"),
+         "    <htmlnode>", '    <htmlnode id="x">'),
+        (lambda t: setattr(t.children[0], "attributes", {"id": "x"}),
+         "    <htmlnode>", '    <htmlnode id="x">'),
+        (lambda t: t.children[1].attributes.update({"id": "x"}),
+         "    <htmlnode></htmlnode>", '    <htmlnode id="x"></htmlnode>'),
+    ])
+    def test_cache_invalidation(self, mutation, old, new):
+        tree = HTMLNode(children=[
+            HTMLNode(children=[HTMLNode(children=[RawText("a")])]),
+            HTMLNode()
+        ])
+        expected_html = tree.to_html()
+        assert old in expected_html
+        assert tree.to_html(cache=True) == expected_html
+        mutation(tree)
+        expected_html = expected_html.replace(old, new, 1)
+        assert tree.to_html(cache=True) == expected_html
+        assert tree.to_html() == expected_html
+
+    def test_style_invalidates_cache(self):
+        node = HTMLNode(children=[RawText("a")])
+        node.to_html(cache=True)
+        assert node._html_cache is not None
+        node.style["color"] = "red"
+        assert node._html_cache is None
+
+    def test_removed_child_does_not_affect_cache(self):
+        child = HTMLNode(children=[RawText("a")])
+        tree = HTMLNode(children=[HTMLNode(children=[child])])
+        tree.to_html(cache=True)
+        tree.children[0].children.clear()
+        expected_html = tree.to_html()
+        assert tree.to_html(cache=True) == expected_html
+        child.children[0].text = "b"
+        assert tree.to_html(cache=True) == expected_html
+
+    def test_custom_nodes_are_not_cached(self):
+        tree = HTMLNode(children=[
+            HTMLNode(children=[TestHTMLNode.KwargsReceiverNode()]),
+            HTMLNode(children=[RawText("a")])
+        ])
+        assert tree.to_html(cache=True, message="1") == \
+            tree.to_html(message="1")
+        assert tree.to_html(cache=True, message="2") == \
+            tree.to_html(message="2")
+        assert tree._html_cache is None
+        assert tree.children[0]._html_cache is None
+        assert tree.children[1]._html_cache is not None
+
+    @pytest.mark.parametrize("mutation, old, new", [
+        (lambda c, a, s: c.append(RawText("b")),
+         "            a", "            a\n            b"),
+        (lambda c, a, s: c.pop(), '"x">\n            a\n        </htmlnode>',
+         '"x"></htmlnode>'),
+        (lambda c, a, s: c.__setitem__(0, RawText("b")), "a\n", "b\n"),
+        (lambda c, a, s: a.__setitem__("id", "y"), '"x"', '"y"'),
+        (lambda c, a, s: a.clear(), ' id="x"', ""),
+    ])
+    def test_untracked_containers_are_checked(self, mutation, old, new):
+        children, attributes, style = [RawText("a")], {"id": "x"}, {}
+        node = HTMLNode(children=children, attributes=attributes, style=style)
+        tree = HTMLNode(children=[HTMLNode(children=[node]), HTMLNode()])
+        expected_html = tree.to_html()
+        assert tree.to_html(cache=True) == expected_html
+        assert tree._html_cache is not None
+        assert node._html_cache is not None
+
+        # Changes made through the caller's references are detected
+        mutation(children, attributes, style)
+        expected_html = expected_html.replace(old, new, 1)
+        assert tree.to_html() == expected_html
+        assert tree.to_html(cache=True) == expected_html
+        assert tree.to_html(cache=True) == expected_html
+
+    def test_untracked_style_is_checked(self):
+        style = {"color": "red"}
+        node = HTMLNode(style=style)
+        tree = HTMLNode(children=[HTMLNode(children=[node])])
+        css = compile_css(tree, compact=True)
+        expected_html = tree.to_html(css=css)
+        assert tree.to_html(css=css, cache=True) == expected_html
+        style["margin"] = "0"
+        assert tree.to_html(css=css, cache=True) == tree.to_html(css=css)
+        assert tree.to_html(css=css, cache=True) != expected_html
+
+    def test_cache_is_not_copied(self):
+        tree = HTMLNode(children=[HTMLNode(children=[RawText("a")])])
+        tree.to_html(cache=True)
+        for other in (copy.copy(tree), copy.deepcopy(tree),
+                      pickle.loads(pickle.dumps(tree))):
+            assert other._html_cache is None
+        other = copy.deepcopy(tree)
+        other.children[0].children[0].text = "b"
+        assert other.to_html(cache=True) == tree.to_html().replace("a", "b")
+        assert tree.to_html(cache=True) == tree.to_html()
+
+
+class TestMinifiedHTML:
+    @pytest.mark.parametrize("collapse_empty", [False, True])
+    @pytest.mark.parametrize("force_one_line", [False, True])
+    @pytest.mark.parametrize("indent_level", [-1, 0, 2])
+    @pytest.mark.parametrize("replace_all_entities", [False, True])
+    @pytest.mark.parametrize("cache", [False, True])
+    def test_minify_matches_force_one_line(self, collapse_empty,
+                                           force_one_line, indent_level,
+                                           replace_all_entities, cache):
+        for tree in TestStreamingHTML._make_trees():
+            expected_html = tree.to_html(
+                force_one_line=True,
+                replace_all_entities=replace_all_entities)
+            kwargs = dict(collapse_empty=collapse_empty,
+                          force_one_line=force_one_line,
+                          indent_level=indent_level, indent_size=3,
+                          replace_all_entities=replace_all_entities,
+                          cache=cache, minify=True)
+            assert tree.to_html(**kwargs) == expected_html
+            assert tree.to_html(return_lines=True, **kwargs) == \
+                [expected_html]
+            assert ''.join(tree.iter_html(**kwargs)) == expected_html
+
+    def test_minify(self):
+        tree = HTMLNode(attributes={"id": "x"}, children=[
+            RootNode(children=[HTMLNode(), RawText("a<b")]),
+            TestHTMLNode.NoEndNode(children=[RawText(" c ")])
+        ])
+        assert tree.to_html(minify=True) == \
+            '<htmlnode id="x"><htmlnode></htmlnode>a&lt;b<noendnode> c ' \
+            '</htmlnode>'
+
+    def test_minify_kwargs_pass_down(self):
+        tree = HTMLNode(children=[TestHTMLNode.KwargsReceiverNode()])
+        assert tree.to_html(minify=True, message="42") == \
+            "<htmlnode>42</htmlnode>"
+
+    def test_minify_deep_tree(self):
+        tree = HTMLNode()
+        for _ in range(5000):
+            tree = HTMLNode(children=[tree])
+        assert tree.to_html(minify=True) == \
+            "<htmlnode>" * 5001 + "</htmlnode>" * 5001
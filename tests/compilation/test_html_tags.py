@@ -10,6 +10,8 @@
 #
 # =======================================================================
 
+import pytest
+from webwidgets.compilation.html.html_arena import HTMLArena
 from webwidgets.compilation.html.html_tags import *
 
 
@@ -43,3 +45,55 @@ class TestHTMLTags:
     def test_html(self):
         html = Html()
         assert html.to_html() == "<html></html>"
+
+    def test_style(self):
+        style = Style(".a {\n    color: red;\n}\n\n.b > .c {}")
+        expected_html = "\n".join([
+            "<style>",
+            "    .a {",
+            "        color: red;",
+            "    }",
+            "    .b > .c {}",
+            "</style>"
+        ])
+        assert style.to_html() == expected_html
+        assert style.to_html(minify=True) == \
+            "<style>.a { color: red; } .b > .c {}</style>"
+
+    def test_style_within_head(self):
+        head = Head(children=[Style("* {\n  margin: 0;\n}"),
+                              Link(attributes={"rel": "stylesheet"})])
+        expected_html = "\n".join([
+            "    <head>",
+            "        <style>",
+            "            * {",
+            "              margin: 0;",
+            "            }",
+            "        </style>",
+            '        <link rel="stylesheet">',
+            "    </head>"
+        ])
+        assert head.to_html(indent_level=1) == expected_html
+        assert head.to_html(force_one_line=True) == \
+            '<head><style>* { margin: 0; }</style><link rel="stylesheet"></head>'
+        assert HTMLArena.from_node(head).to_html(indent_level=1) == \
+            expected_html
+
+    def test_style_text_is_not_sanitized(self):
+        style = Style(".a::after { content: '<\\'>'; }")
+        assert style.to_html(minify=True) == \
+            "<style>.a::after { content: '<\\'>'; }</style>"
+
+    def test_style_invalid_text(self):
+        style = Style(".a {} </style><script></script>")
+        with pytest.raises(ValueError, match="</style"):
+            style.to_html()
+
+    def test_style_text_invalidates_cache(self):
+        style = Style(".a {}")
+        head = Head(children=[style])
+        assert head.to_html(cache=True, minify=True) == \
+            "<head><style>.a {}</style></head>"
+        style.text = ".b {}"
+        assert head.to_html(cache=True, minify=True) == \
+            "<head><style>.b {}</style></head>"
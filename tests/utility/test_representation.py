@@ -116,3 +116,51 @@ class TestRepresentation:
         obj = Outer()
         assert str(obj) == "Outer(d={'odd': [Inner(a=1), " \
             "Inner(a=3)], 'even': [Inner(a=2)]})"
+
+    def test_repr_with_property(self):
+        """Test case with a private variable backing a property"""
+        class PropertyClass(ReprMixin):
+            def __init__(self, a, b):
+                self._a = a
+                self._b = b
+
+            @property
+            def a(self):
+                return self._a
+        obj = PropertyClass(1, 2)
+        assert str(obj) == "PropertyClass(a=1, _b=2)"
+
+    def test_repr_with_excluded_variables(self):
+        """Test case with variables excluded from the representation"""
+        class ExcludingClass(ReprMixin):
+            _repr_exclude = ("_cache", "b")
+
+            def __init__(self, a, b):
+                self.a = a
+                self.b = b
+                self._cache = None
+        obj = ExcludingClass(1, 2)
+        assert str(obj) == "ExcludingClass(a=1)"
+
+    def test_repr_with_slots(self):
+        """Test case with variables stored in slots"""
+        class Base(ReprMixin):
+            __slots__ = ("a", "b")
+
+            def __init__(self, a):
+                self.a = a
+
+        class Derived(Base):
+            __slots__ = "c"
+
+            def __init__(self, a, c):
+                super().__init__(a)
+                self.c = c
+
+        class WithDict(Derived):
+            def __init__(self, a, c, d):
+                super().__init__(a, c)
+                self.d = d
+        assert str(Base(1)) == "Base(a=1)"
+        assert str(Derived(1, 2)) == "Derived(a=1, c=2)"
+        assert str(WithDict(1, 2, 3)) == "WithDict(a=1, c=2, d=3)"
@@ -0,0 +1,86 @@
+# =======================================================================
+#
+#  This file is part of WebWidgets, a Python package for designing web
+#  UIs.
+#
+#  You should have received a copy of the MIT License along with
+#  WebWidgets. If not, see <https://opensource.org/license/mit>.
+#
+#  Copyright(C) 2025, mlaasri
+#
+# =======================================================================
+
+import asyncio
+import pytest
+from webwidgets.utility.streaming import aiter_chunks
+
+
+async def collect(chunks):
+    return [chunk async for chunk in chunks]
+
+
+class TestStreaming:
+    @pytest.mark.parametrize("pieces", [
+        [],
+        [""],
+        ["abc"],
+        ["a", "bcd", "", "efghij", "k"],
+        ["é", "ü€", "😀"],
+    ])
+    @pytest.mark.parametrize("chunk_size", [1, 2, 3, 100])
+    def test_aiter_chunks(self, pieces, chunk_size):
+        chunks = asyncio.run(collect(aiter_chunks(pieces, chunk_size)))
+        expected = ''.join(pieces).encode("utf-8")
+        assert b''.join(chunks) == expected
+        assert all(len(c) == chunk_size for c in chunks[:-1])
+        assert all(0 < len(c) <= chunk_size for c in chunks)
+        assert len(chunks) == -(-len(expected) // chunk_size)
+
+    def test_aiter_chunks_encoding(self):
+        chunks = asyncio.run(collect(aiter_chunks(["é"], encoding="latin-1")))
+        assert chunks == [b"\xe9"]
+
+    @pytest.mark.parametrize("encoding", ["utf-16", "utf-32", "utf-8-sig"])
+    @pytest.mark.parametrize("chunk_size", [1, 3, 100])
+    def test_aiter_chunks_stateful_encoding(self, encoding, chunk_size):
+        pieces = ["a", "bé", "", "€😀", "c"]
+        chunks = asyncio.run(collect(aiter_chunks(
+            pieces, chunk_size=chunk_size, encoding=encoding)))
+        assert b''.join(chunks) == ''.join(pieces).encode(encoding)
+
+    def test_aiter_chunks_is_lazy(self):
+        consumed = []
+
+        def pieces():
+            for piece in ("ab", "cd", "ef"):
+                consumed.append(piece)
+                yield piece
+
+        async def first_chunk():
+            chunks = aiter_chunks(pieces(), chunk_size=2)
+            return await chunks.__anext__()
+
+        assert asyncio.run(first_chunk()) == b"ab"
+        assert consumed == ["ab"]
+
+    def test_aiter_chunks_yields_to_event_loop(self):
+        events = []
+
+        async def other_task():
+            for i in range(3):
+                events.append(f"task {i}")
+                await asyncio.sleep(0)
+
+        async def main():
+            task = asyncio.create_task(other_task())
+            async for chunk in aiter_chunks(["abc"], chunk_size=1):
+                events.append(chunk.decode())
+            await task
+
+        asyncio.run(main())
+        assert events[:4] == ["a", "task 0", "b", "task 1"]
+
+    @pytest.mark.parametrize("chunk_size", [0, -1])
+    def test_invalid_chunk_size(self, chunk_size):
+        with pytest.raises(ValueError, match="Chunk size must be positive"):
+            asyncio.run(collect(aiter_chunks(["a"], chunk_size)))
@@ -17,7 +17,7 @@ from webwidgets.compilation.css import apply_css, compile_css
 from webwidgets.compilation.html import HTMLNode
 from webwidgets.utility.validation import validate_css_comment, \
     validate_css_identifier, validate_css_selector, validate_css_value, \
-    validate_html_class
+    validate_html_class, validate_html_style_content
 
 
 class TestValidateCSS:
@@ -54,6 +54,16 @@ class TestValidateCSS:
         with pytest.raises(ValueError, match=re.escape("*/")):
             validate_css_comment(comment)
 
+    def test_valid_html_style_content(self):
+        validate_html_style_content("")
+        validate_html_style_content(".a > .b::after { content: '</'; }")
+        validate_html_style_content("/* <style> */")
+
+    @pytest.mark.parametrize("css", ["</style>", "a {} </STYLE", "</Style "])
+    def test_invalid_html_style_content(self, css):
+        with pytest.raises(ValueError, match="</style"):
+            validate_html_style_content(css)
+
     def test_valid_css_identifiers(self, valid_css_identifiers):
         """Test that valid CSS identifiers are accepted"""
         for identifier in valid_css_identifiers:
@@ -126,6 +136,27 @@ class TestValidateCSS:
         for identifier in valid_css_identifiers:
             validate_css_selector('.' + identifier)
 
+    @pytest.mark.parametrize("selector", [
+        '[data-role="box-item"]', '[data-role="box"]', '[id="a1"]',
+        '[_attr="Value_2"]', '[--custom="x"]'
+    ])
+    def test_valid_attribute_selectors(self, selector):
+        validate_css_selector(selector)
+
+    @pytest.mark.parametrize("selector, match", [
+        ('[data-role=box]', "Attribute selector must be of the form"),
+        ('[data-role="a b"]', "Attribute selector must be of the form"),
+        ('[data-role="a\\"b"]', "Attribute selector must be of the form"),
+        ('[data-role=""]', "Attribute selector must be of the form"),
+        ('[data-role="a"] .c0', "Attribute selector must be of the form"),
+        ('[data role="a"]', "Invalid character"),
+        ('[3role="a"]', "CSS identifier must start with"),
+        ('[="a"]', "CSS identifier must start with")
+    ])
+    def test_invalid_attribute_selectors(self, selector, match):
+        with pytest.raises(ValueError, match=match):
+            validate_css_selector(selector)
+
     def test_special_css_selectors(self):
         """Testing all possible combinations of special CSS selectors with no
         repetition.
@@ -0,0 +1,160 @@
+# =======================================================================
+#
+#  This file is part of WebWidgets, a Python package for designing web
+#  UIs.
+#
+#  You should have received a copy of the MIT License along with
+#  WebWidgets. If not, see <https://opensource.org/license/mit>.
+#
+#  Copyright(C) 2025, mlaasri
+#
+# =======================================================================
+
+import asyncio
+import pytest
+import webwidgets as ww
+
+
+def request(app, path, method="GET", scope_type="http"):
+    """Sends a request to the given ASGI application in process and returns
+    the list of messages it sends back."""
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(app({"type": scope_type, "method": method, "path": path},
+                    receive, send))
+    return messages
+
+
+def get_body(messages):
+    assert all(m["type"] == "http.response.body" for m in messages[1:])
+    assert all(m["more_body"] for m in messages[1:-1])
+    assert not messages[-1]["more_body"]
+    return b''.join(m["body"] for m in messages[1:])
+
+
+class TestWebsiteApp:
+    @pytest.fixture
+    def compiled(self):
+        return ww.CompiledWebsite(
+            html_content=["<p>home</p>", "<p>é</p>" * 10, "<p>third</p>"],
+            css_content=".c0 {\n    margin: 0;\n}")
+
+    @pytest.mark.parametrize("index, path", [(0, "/"), (1, "/1"), (2, "/2")])
+    @pytest.mark.parametrize("chunk_size", [1, 16, 65536])
+    def test_get_page(self, compiled, index, path, chunk_size):
+        app = ww.WebsiteApp(compiled, chunk_size=chunk_size)
+        messages = request(app, path)
+        assert messages[0] == {
+            "type": "http.response.start", "status": 200,
+            "headers": [(b"content-type", b"text/html; charset=utf-8")]}
+        body = compiled.html_content[index].encode("utf-8")
+        assert get_body(messages) == body
+        assert all(len(m["body"]) == chunk_size for m in messages[1:-2])
+        assert len(messages) == 2 + -(-len(body) // chunk_size)
+
+    @pytest.mark.parametrize("css_file_name", ["styles.css", "main.css"])
+    def test_get_css(self, compiled, css_file_name):
+        app = ww.WebsiteApp(compiled, css_file_name=css_file_name)
+        messages = request(app, "/" + css_file_name)
+        assert messages[0]["status"] == 200
+        assert messages[0]["headers"] == [
+            (b"content-type", b"text/css; charset=utf-8")]
+        assert get_body(messages) == compiled.css_content.encode("utf-8")
+
+    def test_get_split_css(self):
+        compiled = ww.CompiledWebsite(
+            html_content=["<p>home</p>"], css_content=".c0 {}",
+            css_files={"styles.css": ".c0 {}", "styles-0.css": ".c1 {}"})
+        app = ww.WebsiteApp(compiled)
+        assert get_body(request(app, "/styles.css")) == b".c0 {}"
+        assert get_body(request(app, "/styles-0.css")) == b".c1 {}"
+        assert request(app, "/styles-1.css")[0]["status"] == 404
+
+    @pytest.mark.parametrize("immutable", [False, True])
+    def test_get_hashed_css(self, immutable):
+        compiled = ww.CompiledWebsite(
+            html_content=["<p>home</p>"], css_content=".c0 {}",
+            css_files={"styles.ab12.css": ".c0 {}"},
+            css_file_name="styles.ab12.css", immutable=immutable)
+        app = ww.WebsiteApp(compiled)
+        assert app.css_file_name == "styles.ab12.css"
+        messages = request(app, "/styles.ab12.css")
+        assert get_body(messages) == b".c0 {}"
+        cache_control = (b"cache-control",
+                         b"public, max-age=31536000, immutable")
+        assert (cache_control in messages[0]["headers"]) == immutable
+        assert request(app, "/styles.css")[0]["status"] == 404
+
+        # Pages are never cached forever
+        assert cache_control not in request(app, "/")[0]["headers"]
+
+    def test_custom_paths(self, compiled):
+        app = ww.WebsiteApp(compiled, paths=["/index.html", "/a", "/b/c"])
+        assert get_body(request(app, "/b/c")) == b"<p>third</p>"
+        assert request(app, "/")[0]["status"] == 404
+
+    @pytest.mark.parametrize("path", ["/3", "/styles", "/index.html"])
+    def test_not_found(self, compiled, path):
+        messages = request(ww.WebsiteApp(compiled), path)
+        assert messages[0]["status"] == 404
+        assert get_body(messages) == b"Not Found"
+
+    def test_head(self, compiled):
+        messages = request(ww.WebsiteApp(compiled), "/", method="HEAD")
+        assert messages[0]["status"] == 200
+        assert get_body(messages) == b""
+
+    @pytest.mark.parametrize("method", ["POST", "PUT", "DELETE"])
+    def test_method_not_allowed(self, compiled, method):
+        messages = request(ww.WebsiteApp(compiled), "/", method=method)
+        assert messages[0]["status"] == 405
+        assert (b"allow", b"GET, HEAD") in messages[0]["headers"]
+        assert get_body(messages) == b""
+
+    def test_lifespan(self, compiled):
+        messages = []
+        events = iter([{"type": "lifespan.startup"},
+                       {"type": "lifespan.shutdown"}])
+
+        async def receive():
+            return next(events)
+
+        async def send(message):
+            messages.append(message)
+
+        asyncio.run(ww.WebsiteApp(compiled)({"type": "lifespan"}, receive,
+                                            send))
+        assert messages == [{"type": "lifespan.startup.complete"},
+                            {"type": "lifespan.shutdown.complete"}]
+
+    def test_unsupported_scope(self, compiled):
+        with pytest.raises(ValueError, match="websocket"):
+            request(ww.WebsiteApp(compiled), "/", scope_type="websocket")
+
+    def test_routes_are_built_once(self, compiled):
+        calls = []
+
+        class CountingApp(ww.WebsiteApp):
+            def _get_routes(self):
+                calls.append(None)
+                return super()._get_routes()
+
+        app = CountingApp(compiled)
+        for path in ("/", "/1", "/styles.css", "/3"):
+            request(app, path)
+        assert len(calls) == 1
+        assert get_body(request(app, "/2")) == b"<p>third</p>"
+        assert "_routes" not in repr(app)
+
+    def test_serve_compiled_website(self):
+        website = ww.Website([ww.Page([]), ww.Page([])])
+        compiled = website.compile()
+        app = ww.WebsiteApp(compiled, chunk_size=8)
+        assert get_body(request(app, "/1")) == \
+            compiled.html_content[1].encode("utf-8")
@@ -10,6 +10,7 @@
 #
 # =======================================================================
 
+import hashlib
 import pytest
 from typing import Dict
 import webwidgets as ww
@@ -258,6 +259,42 @@ class TestWebsite:
         assert compiled_false.html_content[0] == expected_html_false
         assert compiled_false.css_content == wrap_core_css(expected_core_css)
 
+    @pytest.mark.parametrize("indent_level", [-1, 0, 2])
+    @pytest.mark.parametrize("force_one_line", [False, True])
+    def test_compile_minify(self, indent_level, force_one_line,
+                            wrap_core_css):
+        website = TestWebsite.SimpleWebsite()
+        compiled = website.compile(minify=True, indent_level=indent_level,
+                                   force_one_line=force_one_line)
+        expected_html = ''.join([
+            "<!DOCTYPE html>",
+            "<html>",
+            "<head>",
+            '<link href="styles.css" rel="stylesheet">',
+            "</head>",
+            "<body>",
+            '<htmlnode class="c1">',
+            "Text!",
+            "</htmlnode>",
+            '<htmlnode class="c0">',
+            "Another Text!",
+            "</htmlnode>",
+            "</body>",
+            "</html>"
+        ])
+        expected_core_css = "\n".join([
+            ".c0 {",
+            "    margin: 0;",
+            "}",
+            "",
+            ".c1 {",
+            "    padding: 0;",
+            "}"
+        ])
+        assert len(compiled.html_content) == 1
+        assert compiled.html_content[0] == expected_html
+        assert compiled.css_content == wrap_core_css(expected_core_css)
+
     @pytest.mark.parametrize("indent_level", [0, 1, 2])
     @pytest.mark.parametrize("indent_size", [2, 3, 4, 8])
     def test_compile_indentation(self, indent_level: int, indent_size: int,
@@ -406,3 +443,358 @@ class TestWebsite:
         assert len(compiled.html_content) == 1
         assert compiled.html_content[0] == expected_html
         assert compiled.css_content == wrap_core_css(expected_core_css)
+
+    @pytest.mark.parametrize("workers", [2, 3])
+    @pytest.mark.parametrize("minify", [False, True])
+    def test_compile_workers(self, workers, minify):
+        # Pages of various sizes and styles, including a page without style
+        styles = [{"margin": "0"}, {"color": "blue", "margin": "0"},
+                  {"font-size": "16px"}, {"padding": "0", "color": "red"}]
+        website = ww.Website([
+            ww.Page([TestWebsite.Text(f"{i}-{j}", styles[(i + j) % 4])
+                     for j in range(i % 5)]) for i in range(12)
+        ])
+        website.add(ww.Page([TestWebsite.Empty()]))
+        box = ww.Box(ww.Direction.HORIZONTAL)
+        box.add(TestWebsite.Text("a", styles[0]), space=2)
+        box.add(TestWebsite.Text("b", styles[1]))
+        website.add(ww.Page([box]))
+
+        # A class namer that cannot be sent to worker processes
+        def custom_class_namer(rules, index):
+            return f"n{len(rules) - index}"
+
+        for class_namer in (None, custom_class_namer,
+                            ww.compilation.css.short_class_namer,
+                            ww.compilation.css.HashedClassNamer()):
+            for group_rules in (False, True):
+                expected = website.compile(class_namer=class_namer,
+                                           group_rules=group_rules,
+                                           minify=minify,
+                                           replace_all_entities=True)
+                compiled = website.compile(class_namer=class_namer,
+                                           group_rules=group_rules,
+                                           minify=minify,
+                                           replace_all_entities=True,
+                                           workers=workers)
+                assert compiled.html_content == expected.html_content
+                assert compiled.css_content == expected.css_content
+
+    @pytest.mark.parametrize("group_rules", [False, True])
+    @pytest.mark.parametrize("minify", [False, True])
+    def test_compile_matches_separate_passes(self, group_rules, minify):
+        # Compiling the website in one pass per step, modifying the trees
+        website = ww.Website([
+            ww.Page([TestWebsite.Text(f"{i}-{j}", {"margin": f"{j}px"})
+                     for j in range(i + 1)]) for i in range(3)
+        ])
+        box = ww.Box(ww.Direction.VERTICAL)
+        box.add(TestWebsite.Text("a", {"color": "red"}), space=2)
+        website.add(ww.Page([box, TestWebsite.Empty()]))
+        trees = [page.build() for page in website.pages]
+        compiled_css = ww.compilation.css.compile_css(
+            trees, group_rules=group_rules)
+        for tree in trees:
+            ww.compilation.css.apply_css(compiled_css, tree)
+
+        # Website.compile must produce the same code
+        compiled = website.compile(group_rules=group_rules, minify=minify)
+        assert compiled.html_content == [t.to_html(minify=minify)
+                                         for t in trees]
+        assert compiled.css_content == compiled_css.to_css()
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_compile_timings(self, workers):
+        compiled = TestWebsite.SimpleWebsite().compile(workers=workers)
+        assert set(compiled.timings) == {"build", "css", "render"}
+        assert all(t >= 0 for t in compiled.timings.values())
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    @pytest.mark.parametrize("group_rules", [False, True])
+    def test_compile_critical_css(self, workers, group_rules):
+        small = ww.Page([TestWebsite.Text("a", {"color": "red"})])
+        large = ww.Page([TestWebsite.Text(str(i), {"margin": f"{i}px"})
+                         for i in range(20)])
+        empty = ww.Page([TestWebsite.Empty()])
+        website = ww.Website([small, large, empty])
+        reference = website.compile(group_rules=group_rules)
+        compiled = website.compile(group_rules=group_rules, workers=workers,
+                                   critical_css_size=300)
+
+        # The CSS file does not change
+        assert compiled.css_content == reference.css_content
+
+        # Only the small page inlines its rules
+        html = compiled.html_content[0]
+        assert "<style>" in html
+        assert ".c0 {" in html and "color: red;" in html
+        assert "margin:" in html  # From the preamble only
+        assert "1px" not in html
+        assert 'media="print" onload="this.media=\'all\'"' in html
+        assert html.split("<body>")[1] == \
+            reference.html_content[0].split("<body>")[1]
+        assert compiled.html_content[1:] == reference.html_content[1:]
+
+        # Raising the limit inlines the rules of the large page too
+        compiled = website.compile(group_rules=group_rules, workers=workers,
+                                   critical_css_size=10000)
+        assert "<style>" in compiled.html_content[1]
+        assert compiled.html_content[2] == reference.html_content[2]
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    @pytest.mark.parametrize("group_rules", [False, True])
+    def test_compile_split_css(self, workers, group_rules, wrap_core_css):
+        website = ww.Website([
+            ww.Page([TestWebsite.Text("a", {"color": "red"}),
+                     TestWebsite.Text("b", {"margin": "1px"})]),
+            ww.Page([TestWebsite.Text("c", {"color": "red"})]),
+            ww.Page([TestWebsite.Text("d", {"color": "red"}),
+                     TestWebsite.Text("e", {"padding": "2px"})]),
+            ww.Page([TestWebsite.Empty()])
+        ])
+        compiled = website.compile(group_rules=group_rules, workers=workers,
+                                   split_css=0.5, css_file_name="main.css")
+
+        # Rules used by half of the pages or more are shared
+        assert list(compiled.css_files) == ["main.css", "main-0.css",
+                                            "main-2.css"]
+        assert compiled.css_content == compiled.css_files["main.css"]
+        assert compiled.css_content == wrap_core_css(
+            ".c0 {\n    color: red;\n}")
+        assert compiled.css_files["main-0.css"] == "\n".join([
+            "/* ================ Page 0 ================ */",
+            "",
+            ".c1 {",
+            "    margin: 1px;",
+            "}"
+        ])
+        assert compiled.css_files["main-2.css"] == "\n".join([
+            "/* ================ Page 2 ================ */",
+            "",
+            ".c2 {",
+            "    padding: 2px;",
+            "}"
+        ])
+
+        # Each page only links to the files it needs
+        links = [[line.strip() for line in html.split("\n")
+                  if "<link" in line] for html in compiled.html_content]
+        assert links == [
+            ['<link href="main.css" rel="stylesheet">',
+             '<link href="main-0.css" rel="stylesheet">'],
+            ['<link href="main.css" rel="stylesheet">'],
+            ['<link href="main.css" rel="stylesheet">',
+             '<link href="main-2.css" rel="stylesheet">'],
+            []
+        ]
+
+        # Without any splitting, the CSS file is the only file
+        compiled = website.compile(workers=workers, css_file_name="main.css")
+        assert compiled.css_files == {"main.css": compiled.css_content}
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    @pytest.mark.parametrize("kwargs", [
+        {}, {"critical_css_size": 10000}, {"group_rules": True},
+        {"minify_css": True}
+    ])
+    def test_compile_hashed_css_file_name(self, workers, kwargs):
+        website = ww.Website([
+            ww.Page([TestWebsite.Text("a", {"color": "red"})]),
+            ww.Page([TestWebsite.Text("b", {"margin": "1px"})]),
+            ww.Page([TestWebsite.Empty()])
+        ])
+        reference = website.compile(css_file_name="main.css", **kwargs)
+        compiled = website.compile(css_file_name="main.css", workers=workers,
+                                   css_hash_length=6, **kwargs)
+        digest = hashlib.sha256(
+            reference.css_content.encode("utf-8")).hexdigest()[:6]
+        name = f"main.{digest}.css"
+        assert compiled.css_file_name == name
+        assert compiled.css_files == {name: reference.css_content}
+        assert compiled.css_content == reference.css_content
+        assert compiled.immutable and not reference.immutable
+        assert reference.css_file_name == "main.css"
+
+        # Pages link to the new name and are otherwise unchanged
+        assert compiled.html_content == [
+            html.replace('"main.css"', f'"{name}"')
+            for html in reference.html_content]
+        assert f'href="{name}"' in compiled.html_content[0]
+        assert "<link" not in compiled.html_content[2]
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_compile_hashed_split_css(self, workers):
+        website = ww.Website([
+            ww.Page([TestWebsite.Text("a", {"color": "red"}),
+                     TestWebsite.Text("b", {"margin": "1px"})]),
+            ww.Page([TestWebsite.Text("c", {"color": "red"})])
+        ])
+        reference = website.compile(split_css=1)
+        compiled = website.compile(split_css=1, workers=workers,
+                                   css_hash_length=8)
+        names = {}
+        for name, css in reference.css_files.items():
+            digest = hashlib.sha256(css.encode("utf-8")).hexdigest()[:8]
+            names[name] = name.replace(".css", f".{digest}.css")
+        assert compiled.css_files == {names[k]: v for k, v in
+                                      reference.css_files.items()}
+        assert compiled.css_file_name == names["styles.css"]
+        for html, reference_html in zip(compiled.html_content,
+                                        reference.html_content):
+            for name, new_name in names.items():
+                reference_html = reference_html.replace(f'"{name}"',
+                                                        f'"{new_name}"')
+            assert html == reference_html
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    @pytest.mark.parametrize("group_rules", [False, True])
+    def test_compile_collapsed_shorthands(self, workers, group_rules):
+        longhands = {"padding-top": "0", "padding-right": "1px",
+                     "padding-bottom": "0", "padding-left": "1px"}
+        website = ww.Website([
+            ww.Page([TestWebsite.Text("a", longhands),
+                     TestWebsite.Text("b", {"padding": "0 1px"})]),
+            ww.Page([TestWebsite.Text("c", dict(longhands, color="red"))])
+        ])
+        reference = website.compile(group_rules=group_rules,
+                                    collapse_shorthands=True)
+        compiled = website.compile(group_rules=group_rules, workers=workers,
+                                   collapse_shorthands=True)
+        assert compiled.html_content == reference.html_content
+        assert compiled.css_content == reference.css_content
+
+        # Both spellings of the padding share the same rule
+        assert "padding: 0 1px;" in compiled.css_content
+        assert "padding-top" not in compiled.css_content
+        assert compiled.html_content[0].count('class="c1"') == 2
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    @pytest.mark.parametrize("group_rules", [False, True])
+    def test_compile_dropped_global_declarations(self, workers, group_rules):
+        website = ww.Website([
+            ww.Page([TestWebsite.Text("a", {"margin": "0", "color": "red"}),
+                     TestWebsite.Text("b", {"padding": "0"})]),
+            ww.Page([TestWebsite.Text("c", {"color": "red"})])
+        ])
+        reference = website.compile(group_rules=group_rules,
+                                    drop_global_declarations=True)
+        compiled = website.compile(group_rules=group_rules, workers=workers,
+                                   drop_global_declarations=True)
+        assert compiled.html_content == reference.html_content
+        assert compiled.css_content == reference.css_content
+
+        # Only the color remains in the core rules
+        core = compiled.css_content.split("Core")[1]
+        assert "color: red;" in core and "margin" not in core
+        assert "padding" not in core
+        assert '<htmlnode class="c0">' in compiled.html_content[0]
+        assert "<htmlnode>" in compiled.html_content[0]
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    @pytest.mark.parametrize("group_rules", [False, True])
+    def test_compile_inline_styles(self, workers, group_rules):
+        website = ww.Website([
+            ww.Page([TestWebsite.Text(str(i), {"color": "red"})
+                     for i in range(5)]),
+            ww.Page([TestWebsite.Text("a", {"color": "red",
+                                            "width": "50%"})])
+        ])
+        reference = website.compile(group_rules=group_rules,
+                                    inline_styles=True)
+        compiled = website.compile(group_rules=group_rules, workers=workers,
+                                   inline_styles=True)
+        assert compiled.html_content == reference.html_content
+        assert compiled.css_content == reference.css_content
+
+        # The declaration used once is written inline
+        assert "width" not in compiled.css_content
+        assert '<htmlnode class="c0" style="width:50%">' in \
+            compiled.html_content[1]
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    @pytest.mark.parametrize("group_rules", [False, True])
+    def test_compile_attribute_selectors(self, workers, group_rules):
+        boxes = [ww.Box(ww.Direction.HORIZONTAL) for _ in range(3)]
+        for i, box in enumerate(boxes):
+            box.add(TestWebsite.Text("a", {"color": "red"}))
+            box.add(TestWebsite.Text(str(i)))
+        website = ww.Website([ww.Page([boxes[0], boxes[1]]),
+                              ww.Page([boxes[2]])])
+        reference = website.compile(group_rules=group_rules,
+                                    attribute_selectors=["data-role"])
+        compiled = website.compile(group_rules=group_rules, workers=workers,
+                                   attribute_selectors=["data-role"])
+        assert compiled.html_content == reference.html_content
+        assert compiled.css_content == reference.css_content
+
+        # The declarations of the box items move to a single attribute rule
+        assert '[data-role="box-item"] {' in compiled.css_content
+        assert compiled.css_content.count("align-items: center;") == 1
+        assert '<div data-role="box-item">' in compiled.html_content[0]
+        assert compiled.html_content != website.compile(
+            group_rules=group_rules).html_content
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_compile_minified_css(self, workers):
+        website = ww.Website([
+            ww.Page([TestWebsite.Text("a", {"color": "red"}),
+                     TestWebsite.Text("b", {"margin": "1px"})]),
+            ww.Page([TestWebsite.Text("c", {"color": "red"})])
+        ])
+        reference = website.compile()
+        compiled = website.compile(workers=workers, minify_css=True)
+        assert compiled.html_content == reference.html_content
+        assert compiled.css_content == \
+            "*, *::before, *::after{box-sizing:border-box;margin:0;" \
+            "padding:0;overflow:hidden}.c0{color:red}.c1{margin:1px}"
+
+        # Split and inlined CSS code is minified too
+        compiled = website.compile(workers=workers, minify_css=True,
+                                   split_css=1, critical_css_size=10000)
+        assert compiled.css_files == {
+            "styles.css": "*, *::before, *::after{box-sizing:border-box;"
+                          "margin:0;padding:0;overflow:hidden}.c0{color:red}",
+            "styles-0.css": ".c1{margin:1px}"
+        }
+        assert "overflow:hidden}.c0{color:red}.c1{margin:1px}\n" in \
+            compiled.html_content[0]
+
+    def test_compile_workers_without_pages(self, wrap_core_css):
+        compiled = ww.Website().compile(workers=2)
+        assert compiled.html_content == []
+        assert compiled.css_content == wrap_core_css("")
+
+    def test_render_cache_of_built_pages(self):
+        boxes = [ww.Box(ww.Direction.VERTICAL) for _ in range(2)]
+        for i, box in enumerate(boxes):
+            for j in range(3):
+                box.add(TestWebsite.Text(f"{i}-{j}", {"color": "red"}))
+        website = ww.Website([ww.Page(boxes)])
+        tree = website.pages[0].build()
+        expected_html = tree.to_html()
+        assert tree.to_html(cache=True) == expected_html
+
+        # Every node with children is cached
+        nodes, stack = [], [tree]
+        while stack:
+            node = stack.pop()
+            nodes.append(node)
+            stack += node.children
+        assert all(n._html_cache is not None for n in nodes if n.children)
+
+        # Changing a node only renders its ancestors again, while the caches
+        # of the other box are reused
+        body = tree.children[1].children[1]
+        other_cache = dict(body.children[1]._html_cache)
+        body.children[0].children[1].children[0].children[0].text = "x"
+        expected_html = expected_html.replace("0-1", "x")
+        assert tree.to_html(cache=True) == expected_html
+        assert tree.to_html() == expected_html
+        assert all(body.children[1]._html_cache[k] is v
+                   for k, v in other_cache.items())
+
+        # Changes to the widgets' own containers are detected too
+        text_node = body.children[1].children[0].children[0]
+        text_node.children.append(RawText("y"))
+        assert tree.to_html(cache=True) == tree.to_html()
+        assert "y" in tree.to_html(cache=True)
@@ -10,7 +10,9 @@
 #
 # =======================================================================
 
+import copy
 import numpy as np
+import pickle
 import pytest
 from typing import Tuple
 import webwidgets as ww
@@ -444,6 +446,39 @@ class TestBox:
                 else:
                     assert np.all(a[edge:, :, i] == c)
 
+    @pytest.mark.parametrize("duplicate", [
+        copy.deepcopy,
+        lambda b: pickle.loads(pickle.dumps(b))
+    ])
+    def test_copies_keep_item_properties(self, duplicate):
+        box = ww.Box(ww.Direction.VERTICAL)
+        box.add(TestBox.Color((255, 0, 0)), space=3)
+        box.add(TestBox.Color((0, 255, 0)), space=ww.Px(10))
+        other = duplicate(box)
+        assert other.widgets[0] is not box.widgets[0]
+        assert other.build().to_html() == box.build().to_html()
+
+
+    def test_item_styles(self):
+        box = ww.Box(ww.Direction.HORIZONTAL)
+        spaces = [1, 1.0, 2, 1, ww.Px(10), ww.Px(10), ww.Px(5)]
+        for space in spaces:
+            box.add(TestBox.Color((255, 0, 0)), space=space)
+        items = box.build().children
+        base = {
+            "display": "flex",
+            "flex-direction": "row",
+            "align-items": "center",
+            "justify-content": "center"
+        }
+        assert [i.style for i in items] == [
+            base | BoxItemProperties(space=s).to_style() for s in spaces]
+        assert items[1].style["flex-grow"] == "1.0"
+
+        # Each item owns its style
+        items[0].style["flex-grow"] = "7"
+        assert items[3].style["flex-grow"] == "1"
+
 
 class TestBoxItemProperties:
     @pytest.mark.parametrize("space", [4, 5.1, 0.2])
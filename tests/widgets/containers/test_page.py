@@ -141,3 +141,53 @@ class TestPage:
         ])
         assert page.build(
             css_file_name=css_file_name).to_html() == expected_html
+
+    def test_page_build_collects_styles(self):
+        styles = {"existing": {"margin": "0"}}
+        page = ww.Page([TestPage.Text("a"), TestPage.Styled()])
+        tree = page.build(styles=styles)
+        nodes = tree.children[1].children[1].children
+        expected = {"existing": {"margin": "0"}}
+        for node in nodes:
+            expected.update(node.get_styles())
+        assert styles == expected
+        assert styles[id(nodes[1])] == {"color": "blue"}
+
+    def test_page_build_with_critical_css(self):
+        page = ww.Page([TestPage.Styled()])
+        tree = page.build(critical_css=".a {\n    color: blue;\n}")
+        expected_head = "\n".join([
+            "    <head>",
+            "        <style>",
+            "            .a {",
+            "                color: blue;",
+            "            }",
+            "        </style>",
+            '        <link href="styles.css" media="print" '
+            'onload="this.media=\'all\'" rel="stylesheet">',
+            "    </head>"
+        ])
+        assert expected_head in tree.to_html()
+
+        # Pages without styles do not link to any CSS
+        tree = ww.Page([TestPage.Text("a")]).build(critical_css=".a {}")
+        assert "    <head></head>" in tree.to_html()
+
+    def test_page_inline_css(self):
+        page = ww.Page([TestPage.Styled()])
+        tree = page.build(css_file_name="main.css")
+        ww.Page.inline_css(tree, ".a {}", css_file_name="main.css")
+        assert tree.to_html() == page.build(
+            css_file_name="main.css", critical_css=".a {}").to_html()
+
+    def test_page_link_css(self):
+        page = ww.Page([TestPage.Styled()])
+        tree = page.build()
+        ww.Page.link_css(tree, ["a.css", "b.css"])
+        expected_head = "\n".join([
+            "    <head>",
+            '        <link href="a.css" rel="stylesheet">',
+            '        <link href="b.css" rel="stylesheet">',
+            "    </head>"
+        ])
+        assert expected_head in tree.to_html()
@@ -10,6 +10,7 @@
 #
 # =======================================================================
 
-from .css import apply_css, compile_css, CompiledCSS, default_class_namer
-from .css_rule import ClassRule, CSSRule
+from .css import apply_css, compile_css, CompiledCSS, default_class_namer, \
+    HashedClassNamer, short_class_namer
+from .css_rule import AttributeRule, ClassRule, CSSRule
 from . import sections
@@ -10,13 +10,23 @@
 #
 # =======================================================================
 
-from .css_rule import ClassRule
+from .css_rule import AttributeRule, ClassRule, CSSRule
+import hashlib
+import heapq
+import inspect
 import itertools
+import json
+import os
 from .sections.preamble import Preamble
 from .sections.rule_section import RuleSection
-from typing import Callable, Dict, List, Union
-from webwidgets.compilation.html.html_node import HTMLNode
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, \
+    Sequence, Set, Tuple, Union
+from webwidgets.compilation.html.html_arena import HTMLArena
+from webwidgets.compilation.html.html_node import HTMLNode, \
+    _merge_classes, _merge_styles
 from webwidgets.utility.representation import ReprMixin
+from webwidgets.utility.validation import validate_css_identifier, \
+    validate_css_selector, validate_css_value
 
 
 class CompiledCSS(ReprMixin):
@@ -24,7 +34,9 @@ class CompiledCSS(ReprMixin):
     """
 
     def __init__(self, trees: List[HTMLNode], core: RuleSection,
-                 mapping: Dict[int, List[ClassRule]]):
+                 mapping: Dict[Any, Sequence[ClassRule]],
+                 compact: bool = False, inline: Dict[Any, str] = None,
+                 attribute_rules: List[CSSRule] = None):
         """Stores compiled CSS rules and their mapping to the nodes in the
         given trees.
 
@@ -34,42 +46,202 @@ class CompiledCSS(ReprMixin):
         :param rules: The CSS section containing the compiled CSS rules.
         :type rules: RuleSection
         :param mapping: A dictionary mapping each node ID to a list of rules
-            that achieve the same style.
-        :type mapping: Dict[int, List[ClassRule]]
+            that achieve the same style. If `compact` is True, it maps each
+            distinct non-empty style instead, as a tuple of (property, value)
+            pairs in their original order, to a tuple of rules.
+        :type mapping: Dict[Any, Sequence[ClassRule]]
+        :param compact: Whether the mapping is keyed by style rather than by
+            node. Defaults to False.
+        :type compact: bool
+        :param inline: A dictionary mapping the nodes, or styles if `compact`
+            is True, whose declarations are partly written in their `style`
+            attribute instead of rules to these declarations, as in
+            `margin:0;color:red`. Defaults to None, which means that all
+            declarations are achieved by rules.
+        :type inline: Dict[Any, str]
+        :param attribute_rules: The rules applied to nodes through their
+            attributes rather than their classes, like
+            :py:class:`AttributeRule` objects. They are stored in the
+            `attributes` section and apply to all nodes regardless of the
+            mapping. Defaults to None, which means there is none.
+        :type attribute_rules: List[CSSRule]
         """
         super().__init__()
         self.trees = trees
         self.preamble = Preamble()
+        self.attributes = RuleSection(
+            rules=[] if attribute_rules is None else attribute_rules,
+            title="Attributes")
         self.core = core
         self.mapping = mapping
+        self.compact = compact
+        self.inline = {} if inline is None else inline
 
-    def to_css(self, indent_size: int = 4) -> str:
-        """Converts the `preamble` and `core` sections of the
+    def rules_for(self, node: HTMLNode) -> Sequence[ClassRule]:
+        """Returns the rules that achieve the style of the given node.
+
+        This works with both kinds of mapping. With a compact mapping, the
+        rules are looked up from the current style of the node.
+
+        :param node: A node of one of the compiled trees.
+        :type node: HTMLNode
+        :return: The rules of the node, sorted by class name.
+        :rtype: Sequence[ClassRule]
+        :raises KeyError: If the node, or its style with a compact mapping,
+            was not part of the compilation.
+        """
+        if not self.compact:
+            return self.mapping[id(node)]
+        style = node._style
+        return self.mapping[tuple(style.items())] if style else ()
+
+    def inline_for(self, node: HTMLNode) -> Union[str, None]:
+        """Returns the declarations of the given node that are written in its
+        `style` attribute instead of rules.
+
+        :param node: A node of one of the compiled trees.
+        :type node: HTMLNode
+        :return: The inline declarations of the node, as in
+            `margin:0;color:red`, or None if all of its declarations are
+            achieved by rules.
+        :rtype: Union[str, None]
+        """
+        if not self.inline:
+            return None
+        if not self.compact:
+            return self.inline.get(id(node))
+        style = node._style
+        return self.inline.get(tuple(style.items())) if style else None
+
+    def to_css(self, indent_size: int = 4,
+               node_ids: Iterable[int] = None, minify: bool = False) -> str:
+        """Converts the `preamble`, `attributes` and `core` sections of the
         :py:class:`CompiledCSS` object into CSS code.
 
         Sections are converted with their :py:meth:`RuleSection.to_css`
-        methods.
+        methods. The `attributes` section is left out if it has no rule.
 
         :param indent_size: See :py:meth:`RuleSection.to_css`.
         :type indent_size: int
+        :param node_ids: The IDs of the nodes whose rules to convert, as found
+            in the `mapping` attribute. If given, the `core` section only
+            contains the rules mapped to these nodes, in their original order,
+            while the `attributes` section is kept whole.
+            This is useful to extract the CSS code needed by a single page.
+            It requires a mapping keyed by node. Defaults to None, which
+            converts all rules.
+        :type node_ids: Iterable[int]
+        :param minify: See :py:meth:`RuleSection.to_css`. If True, section
+            titles are left out and the code is written without any
+            whitespace. Defaults to False.
+        :type minify: bool
         :return: The CSS code as a string.
         :rtype: str
+        :raises ValueError: If `node_ids` is given with a compact mapping.
         """
-        return '\n\n'.join(
-            section.to_css(indent_size=indent_size) for section in (
-                self.preamble, self.core
-            ))
+        core = self.core
+        if node_ids is not None:
+            if self.compact:
+                raise ValueError("Cannot select the rules of nodes from a "
+                                 "compact mapping, which is keyed by style")
+            used = _get_used_rules(self.mapping, node_ids)
+            core = RuleSection(rules=[r for r in core.rules if id(r) in used],
+                               title=core.title)
+        sections = (self.preamble, self.attributes, core) \
+            if self.attributes.rules else (self.preamble, core)
+        return ('' if minify else '\n\n').join(
+            section.to_css(indent_size=indent_size, minify=minify)
+            for section in sections)
 
+    def split(self, threshold: float
+              ) -> Tuple[List[ClassRule], List[List[ClassRule]]]:
+        """Splits the rules of the `core` section between rules shared by
+        many trees and rules specific to each tree.
+
+        This is useful to split the style sheet of a website into a file
+        shared by all pages and one file per page, when each tree is a page.
+
+        :param threshold: The minimum fraction of trees that a rule must be
+            used by to be shared, between 0 and 1. With 0, all rules are
+            shared.
+        :type threshold: float
+        :return: A tuple containing the shared rules and the other rules used
+            by each tree, in the order of the `trees` attribute. Rules are in
+            the order of the `core` section. Compact CSS keeps no tree, so all
+            of its rules are shared.
+        :rtype: Tuple[List[ClassRule], List[List[ClassRule]]]
+        """
+        used = [_get_used_rules(self.mapping, [
+            k for k, v in tree.get_styles().items() if v])
+            for tree in self.trees]
+        return _split_rules(self.core.rules, used, threshold)
+
+
+def _get_used_rules(mapping: Dict[int, List[ClassRule]],
+                    node_ids: Iterable[int]) -> Dict[int, ClassRule]:
+    """Returns the rules mapped to the given nodes.
+
+    :param mapping: The mapping of a :py:class:`CompiledCSS` object.
+    :type mapping: Dict[int, List[ClassRule]]
+    :param node_ids: The IDs of the nodes.
+    :type node_ids: Iterable[int]
+    :return: A dictionary mapping the ID of each rule to the rule.
+    :rtype: Dict[int, ClassRule]
+    """
+    return {id(r): r for i in node_ids for r in mapping.get(i, ())}
 
-def apply_css(css: CompiledCSS, tree: HTMLNode) -> None:
+
+def _split_rules(rules: List[ClassRule], used: List[Dict[int, ClassRule]],
+                 threshold: float
+                 ) -> Tuple[List[ClassRule], List[List[ClassRule]]]:
+    """Splits rules between rules shared by many trees and rules specific to
+    each tree.
+
+    :param rules: All rules, in the order to keep.
+    :type rules: List[ClassRule]
+    :param used: The rules used by each tree, as returned by
+        :py:func:`_get_used_rules`.
+    :type used: List[Dict[int, ClassRule]]
+    :param threshold: See :py:meth:`CompiledCSS.split`.
+    :type threshold: float
+    :return: See :py:meth:`CompiledCSS.split`.
+    :rtype: Tuple[List[ClassRule], List[List[ClassRule]]]
+    """
+    # Counting the trees using each rule
+    counts = {}
+    for tree_rules in used:
+        for rule_id in tree_rules:
+            counts[rule_id] = counts.get(rule_id, 0) + 1
+
+    # Sharing rules used by enough trees, as well as rules used by no tree
+    # since no tree-specific file would hold them
+    minimum = threshold * len(used)
+    shared = [r for r in rules if counts.get(id(r), 0) >= minimum
+              or id(r) not in counts]
+    shared_ids = {id(r) for r in shared}
+
+    # Sorting the other rules of each tree in the given order
+    positions = {id(r): i for i, r in enumerate(rules)}
+    specific = [sorted((r for k, r in tree_rules.items()
+                        if k in positions and k not in shared_ids),
+                       key=lambda r: positions[id(r)]) for tree_rules in used]
+    return shared, specific
+
+
+def apply_css(css: CompiledCSS, tree: Union[HTMLNode, HTMLArena]) -> None:
     """Applies the CSS rules to the given tree.
 
     Rules are added as HTML classes to each node with a style in the tree. If a
     node does not have a `class` attribute yet, it will be created for that
     node. Nodes that do not have any style are left untouched.
 
-    Note that this function is recursive and calls itself on each child node of
-    the tree.
+    Declarations that were compiled into inline styles rather than rules are
+    added to the `style` attribute of their node.
+
+    Nodes sharing the same rules and the same original classes share the
+    same `class` string. To add the classes to the HTML code without
+    modifying the tree, pass the compiled CSS to :py:meth:`HTMLNode.to_html`
+    instead.
 
     :param css: The compiled CSS object containing the rules to apply and the
         mapping to each node. It should have been created by invoking
@@ -79,33 +251,84 @@ def apply_css(css: CompiledCSS, tree: HTMLNode) -> None:
     :param tree: The tree to which the CSS rules should be applied. It will be
         modified in place by this function. If you want to keep the original
         tree unchanged, make a deep copy of it using its
-        :py:meth:`HTMLNode.copy` method and pass this copy instead.
-    :type tree: HTMLNode
+        :py:meth:`HTMLNode.copy` method and pass this copy instead. It can also
+        be an :py:class:`HTMLArena`.
+    :type tree: Union[HTMLNode, HTMLArena]
     """
-    # Only modifying nodes if they have a style (and therefore if the list of
-    # rules mapped to them in `css.mapping` is not empty)
-    if tree.style:
+    # Classes are merged once per list of rules and original classes
+    merged = {}
+
+    # Arenas are styled node by node through their own interface
+    mapping, compact, inline = css.mapping, css.compact, css.inline
+    if isinstance(tree, HTMLArena):
+        for key, style in tree.get_styles().items():
+            if style:
+                _, index = key
+                attributes = tree.get_attributes(index)
+                key = tuple(style.items()) if compact else key
+                _add_classes(attributes, mapping[key], merged)
+                if inline and key in inline:
+                    attributes['style'] = _merge_styles(
+                        attributes.get('style'), inline[key])
+                tree.set_attributes(index, attributes)
+        return
 
-        # Listing rules to add as classes. We do not add rules that are already
-        # there.
-        rules_to_add = [r.name for r in css.mapping[id(tree)] if r.name not in
-                        tree.attributes.get('class', '').split(' ')]
+    # Only modifying nodes if they have a style and if the list of rules mapped
+    # to them in `css.mapping` is not empty. Containers are read directly so
+    # that no empty container gets allocated on unstyled nodes.
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        style = node._style
+        if style:
+            key = tuple(style.items()) if compact else id(node)
+            _add_classes(node.attributes, mapping[key], merged)
+            if inline and key in inline:
+                attributes = node.attributes
+                attributes['style'] = _merge_styles(attributes.get('style'),
+                                                    inline[key])
+        if node._children:
+            stack.extend(node._children)
 
-        # Updating the class attribute. If it already exists and is not empty,
-        # we need to insert a space before adding the CSS classes.
-        maybe_space = ' ' if tree.attributes.get(
-            'class', None) and rules_to_add else ''
-        tree.attributes['class'] = tree.attributes.get(
-            'class', '') + maybe_space + ' '.join(rules_to_add)
 
-    # Recursively applying the CSS rules to all child nodes of the tree
-    for child in tree.children:
-        apply_css(css, child)
+def _add_classes(attributes: Dict[str, str], rules: Sequence[ClassRule],
+                 merged: Dict[Tuple[str, int], str]) -> None:
+    """Adds the classes of the given rules to the `class` attribute in the
+    given attributes, creating the attribute if necessary.
+
+    :param attributes: The attributes of a node. They are modified in place.
+    :type attributes: Dict[str, str]
+    :param rules: The rules whose classes to add.
+    :type rules: Sequence[ClassRule]
+    :param merged: A cache of the `class` strings already merged, keyed by
+        original `class` attribute and by ID of the sequence of rules. The
+        sequences must outlive the cache.
+    :type merged: Dict[Tuple[str, int], str]
+    """
+    # Nodes whose declarations were all dropped keep their attributes as is
+    if not rules:
+        return
+
+    # Rules that are already there are not added again
+    original = attributes.get('class')
+    key = (original, id(rules))
+    classes = merged.get(key)
+    if classes is None:
+        classes = _merge_classes(original, [r.name for r in rules])
+        merged[key] = classes
+    attributes['class'] = classes
 
 
-def compile_css(trees: Union[HTMLNode, List[HTMLNode]],
+def compile_css(trees: Union[HTMLNode, HTMLArena,
+                             List[Union[HTMLNode, HTMLArena]]],
                 class_namer: Callable[[List[ClassRule], int],
-                                      str] = None) -> CompiledCSS:
+                                      str] = None,
+                group_rules: bool = False,
+                compact: bool = False,
+                collapse_shorthands: bool = False,
+                drop_global_declarations: bool = False,
+                inline_styles: bool = False,
+                attribute_selectors: Iterable[str] = None) -> CompiledCSS:
     """Computes optimized CSS rules from the given HTML trees.
 
     The main purpose of this function is to reduce the number of CSS rules
@@ -147,8 +370,10 @@ def compile_css(trees: Union[HTMLNode, List[HTMLNode]],
     customized using the `class_namer` argument.
 
     :param trees: A single tree or a list of trees to optimize over. All
-        children are recursively included in the compilation.
-    :type trees: Union[HTMLNode, List[HTMLNode]]
+        children are recursively included in the compilation. Trees can also
+        be :py:class:`HTMLArena` objects, whose nodes are identified in the
+        mapping by the keys returned by :py:meth:`HTMLArena.get_styles`.
+    :type trees: Union[HTMLNode, HTMLArena, List[Union[HTMLNode, HTMLArena]]]
     :param class_namer: A callable that takes two arguments, which are the list
         of all compiled rules and an index within that list, and returns a
         unique name for the HTML class to associate with the rule at the given
@@ -162,41 +387,201 @@ def compile_css(trees: Union[HTMLNode, List[HTMLNode]],
         selectors will be validated with the :py:func:`validate_css_selector`
         function before being written into CSS code.
 
+        If the callable accepts a `usage` argument, it is called with a third
+        keyword argument `usage` listing the number of nodes each rule is
+        applied to, and rules are passed by decreasing usage, so that the
+        most used rules come first. See :py:func:`short_class_namer` for an
+        example.
+
         Defaults to the :py:func:`default_class_namer` function which
         implements a default naming strategy where each class is named `"c{i}"`
         where `i` is the index of the rule in the list.
     :type class_namer: Callable[[List[ClassRule], int], str]
+    :param group_rules: If True, declarations that appear together in the
+        styles of the trees are grouped into combined rules whenever doing so
+        reduces the total size of the HTML and CSS code. Declarations that
+        always appear together always share a rule, and groups of
+        declarations that often appear together get a rule of their own on
+        top of the rules of each declaration. Each node then gets as few
+        classes as possible, with rules that never overlap. Defaults to
+        False, which creates one rule per declaration.
+    :type group_rules: bool
+    :param compact: If True, the result keeps no reference to the trees and
+        its mapping goes from each distinct style to a tuple of rules, as
+        described in :py:class:`CompiledCSS`, so that its size depends on the
+        number of distinct styles rather than on the number of nodes.
+        Unstyled nodes are left out. Rules are then looked up with
+        :py:meth:`CompiledCSS.rules_for` or by the renderers from the current
+        style of each node. Defaults to False.
+    :type compact: bool
+    :param collapse_shorthands: If True, complete groups of longhand
+        properties in the style of a node are folded into their shorthand
+        property before rules are built. For example, `margin-top`,
+        `margin-right`, `margin-bottom` and `margin-left` become a single
+        `margin` declaration, and `flex-grow`, `flex-shrink` and
+        `flex-basis` become a single `flex` declaration. Groups are left
+        untouched if the style also sets the shorthand itself or if any of
+        their values is a CSS-wide keyword like `inherit` or is marked as
+        `!important`. Defaults to False.
+    :type collapse_shorthands: bool
+    :param drop_global_declarations: If True, declarations that the
+        :py:class:`Preamble` already applies to every element with its
+        universal selector, like `margin: 0` or `box-sizing: border-box`,
+        are removed from the style of each node before rules are built.
+        Nodes whose style only contains such declarations receive no rule at
+        all. A declaration is kept if the style also sets a longhand or the
+        shorthand of its property, as the result would then depend on the
+        order of the rules. Defaults to False.
+    :type drop_global_declarations: bool
+    :param inline_styles: If True, each rule is compared with the inline
+        declarations it would replace, and rules whose `class` tokens and CSS
+        code take more bytes than writing their declarations in the `style`
+        attribute of every node using them are not created. This mostly
+        happens to rules used by a single node. The remaining declarations of
+        each node are stored in the :py:attr:`CompiledCSS.inline` attribute
+        and added to its `style` attribute by :py:func:`apply_css` or by the
+        renderers. Their properties and values are validated with
+        :py:func:`validate_css_identifier` and :py:func:`validate_css_value`
+        right away. Defaults to False.
+    :type inline_styles: bool
+    :param attribute_selectors: The names of HTML attributes, like
+        `data-role`, whose values can select rules. For each value of these
+        attributes carried by at least two nodes, the declarations that all
+        of these nodes have in their style are written once in an
+        :py:class:`AttributeRule` like `[data-role="box-item"]`, stored in
+        the :py:attr:`CompiledCSS.attributes` section, instead of being
+        achieved by classes. Nodes with the same style keep receiving the
+        same classes, so a declaration only leaves the classes of a style if
+        all of its nodes get it from an attribute rule. Values whose selector
+        is rejected by :py:func:`validate_css_selector` are ignored. When
+        `compact` is True, the nodes sharing a style should also share these
+        attribute values, since the mapping is keyed by style. Defaults to
+        None, which creates no attribute rule.
+    :type attribute_selectors: Iterable[str]
     :return: The :py:class:`CompiledCSS` object containing the optimized rules.
         Every HTML node present in one or more of the input trees is included
         in the :py:attr:`CompiledCSS.mapping` attribute, even if the node does
         not have a style. Rules are alphabetically ordered by class name in the
-        mapping and in the :py:attr:`CompiledCSS.core` rule section.
+        mapping and in the :py:attr:`CompiledCSS.core` rule section. Nodes
+        with identical styles share the same list of rules in the mapping.
     :rtype: CompiledCSS
     """
     # Handling case of a single tree
-    if isinstance(trees, HTMLNode):
+    if isinstance(trees, (HTMLNode, HTMLArena)):
         trees = [trees]
 
+    # Collecting the styles of all nodes
+    styles = {k: v for tree in trees for k, v in tree.get_styles().items()}
+    return _compile_styles(trees, styles, class_namer, group_rules, compact,
+                           collapse_shorthands, drop_global_declarations,
+                           inline_styles, attribute_selectors)
+
+
+def _compile_styles(trees: List[Union[HTMLNode, HTMLArena]],
+                    styles: Dict[int, Dict[str, str]],
+                    class_namer: Callable[[List[ClassRule], int], str],
+                    group_rules: bool, compact: bool = False,
+                    collapse_shorthands: bool = False,
+                    drop_global_declarations: bool = False,
+                    inline_styles: bool = False,
+                    attribute_selectors: Iterable[str] = None
+                    ) -> CompiledCSS:
+    """Compiles CSS rules from styles that have already been collected from
+    the given trees.
+
+    :param trees: See :py:func:`compile_css`.
+    :type trees: List[Union[HTMLNode, HTMLArena]]
+    :param styles: A dictionary mapping node IDs to styles, as returned by
+        :py:meth:`HTMLNode.get_styles`. Only the nodes it contains are
+        included in the mapping of the result.
+    :type styles: Dict[int, Dict[str, str]]
+    :param class_namer: See :py:func:`compile_css`.
+    :type class_namer: Callable[[List[ClassRule], int], str]
+    :param group_rules: See :py:func:`compile_css`.
+    :type group_rules: bool
+    :param compact: See :py:func:`compile_css`.
+    :type compact: bool
+    :param collapse_shorthands: See :py:func:`compile_css`.
+    :type collapse_shorthands: bool
+    :param drop_global_declarations: See :py:func:`compile_css`.
+    :type drop_global_declarations: bool
+    :param inline_styles: See :py:func:`compile_css`.
+    :type inline_styles: bool
+    :param attribute_selectors: See :py:func:`compile_css`.
+    :type attribute_selectors: Iterable[str]
+    :return: See :py:func:`compile_css`.
+    :rtype: CompiledCSS
+    """
     # Handling default class_namer
     class_namer = default_class_namer if class_namer is None else class_namer
 
-    # We compute a simple mapping where each CSS property defines its own
-    # ruleset
-    styles = {k: v for tree in trees for k, v in tree.get_styles().items()}
-    properties = set(itertools.chain.from_iterable(s.items()
-                     for s in styles.values()))
-    rules = [ClassRule("", dict([p]))  # Initializing with empty name
-             for p in sorted(properties)]
-    for i, rule in enumerate(rules):  # Assigning name from callback
-        rule.name = class_namer(rules, i)
-    rules = sorted(rules, key=lambda r: r.name)  # Sorting by name
-    mapping = {node_id: [r for r in rules if
-                         set(r.declarations.items()).issubset(style.items())]
-               for node_id, style in styles.items()}
-
-    # Packaging the results into a CompiledCSS object
+    # Nodes built by the same code often share identical styles, so rules are
+    # computed and mapped once per distinct style
+    table = _intern_styles(styles)
+
+    # Folding longhands into shorthands and dropping global declarations if
+    # requested, which can make distinct styles identical
+    folded = None
+    if collapse_shorthands or drop_global_declarations:
+        table, folded = _fold_table(table, collapse_shorthands,
+                                    drop_global_declarations)
+
+    # Moving the declarations shared by all nodes with the same attribute
+    # value into attribute rules if requested
+    attribute_rules = None
+    if attribute_selectors:
+        attribute_rules, attribute_folded = _get_attribute_rules(
+            _count_attribute_styles(table, _get_attribute_values(
+                trees, attribute_selectors)))
+        if compact:
+            folded = {k: attribute_folded.get(v, v) for k, v in (
+                folded or {k: k for k in table}).items()}
+        table = _apply_folds(table, attribute_folded)
+
+    # Counting distinct signatures if they are needed to group declarations,
+    # to compare rules with inline styles or to name rules by usage
+    signatures = _get_signatures(table) if group_rules or inline_styles or \
+        _accepts_usage(class_namer) else None
+
+    # If requested, we group declarations into combined rules and map each
+    # style to the groups covering it
+    if group_rules:
+        groups = _group_declarations(signatures)
+        if inline_styles:
+            groups = _filter_inline_groups(groups, signatures)
+        rules = _name_rules(groups, class_namer, signatures)
+        style_rules = _map_groups(table, groups, rules)
+        rules = sorted(rules, key=lambda r: r.name)
+
+    # Otherwise, we compute a simple mapping where each CSS property defines
+    # its own ruleset
+    else:
+        properties = _get_properties(table)
+        if inline_styles:
+            properties = set(g[0] for g in _filter_inline_groups(
+                [(p,) for p in sorted(properties)], signatures))
+        rules = _compile_rules(properties, class_namer, signatures)
+        style_rules = _map_rules(table, rules)
+
+    # Writing the declarations left without a rule inline
+    inline = _get_inline_styles(style_rules) if inline_styles else {}
+
+    # Packaging the results into a CompiledCSS object, whose mapping is keyed
+    # by style if compact or by node otherwise. Compact mappings are keyed by
+    # the styles of the nodes as they were before folding.
     core = RuleSection(rules=rules, title="Core")
-    return CompiledCSS(trees, core, mapping)
+    if compact:
+        style_rules = {k: tuple(v) for k, v in style_rules.items()}
+        if folded is not None:
+            style_rules = {k: style_rules[v] for k, v in folded.items()}
+            inline = {k: inline[v] for k, v in folded.items() if v in inline}
+        return CompiledCSS([], core, {k: v for k, v in style_rules.items()
+                                      if k}, compact=True, inline=inline,
+                           attribute_rules=attribute_rules)
+    return CompiledCSS(trees, core, _map_nodes(table, style_rules),
+                       inline={i: v for k, v in inline.items()
+                               for i in table[k]},
+                       attribute_rules=attribute_rules)
 
 
 def default_class_namer(rules: List[ClassRule], index: int) -> str:
@@ -211,3 +596,996 @@ def default_class_namer(rules: List[ClassRule], index: int) -> str:
     :return: A string like `"c{i}"` where `i` is the index of the rule.
     """
     return f'c{index}'
+
+
+def short_class_namer(rules: List[ClassRule], index: int,
+                      usage: List[int]) -> str:
+    """Class naming function that gives the shortest names to the most used
+    rules.
+
+    Names are the shortest valid CSS identifiers, made of a letter followed by
+    letters or digits: `"a"` to `"z"` and `"A"` to `"Z"` for the 52 most used
+    rules, then `"aa"`, `"ab"`, and so on for the next 3224 rules.
+
+    This function relies on the usage-aware naming interface of
+    :py:func:`compile_css`, which passes rules by decreasing usage.
+
+    :param rules: List of all compiled ClassRule objects, sorted by decreasing
+        usage. This argument is not used in this function.
+    :type rules: List[ClassRule]
+    :param index: Index of the rule whose class is being named.
+    :type index: int
+    :param usage: Number of nodes each rule is applied to. This argument is not
+        used in this function, as rules are already sorted by usage.
+    :type usage: List[int]
+    :return: The `index`-th shortest identifier.
+    :rtype: str
+    """
+    # Finding the length of the name and its index among names of that length
+    length = 1
+    while index >= 52 * 62 ** (length - 1):
+        index -= 52 * 62 ** (length - 1)
+        length += 1
+
+    # Writing the index in base 62 with a first digit in base 52
+    characters = []
+    for _ in range(length - 1):
+        index, digit = divmod(index, 62)
+        characters.append(_NAME_CHARACTERS[digit])
+    characters.append(_NAME_CHARACTERS[index])
+    return ''.join(reversed(characters))
+
+
+# Characters of the names given by short_class_namer, letters first
+_NAME_CHARACTERS = ("abcdefghijklmnopqrstuvwxyz"
+                    "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+                    "0123456789")
+
+
+class HashedClassNamer(ReprMixin):
+    """A class naming strategy where each class name is a short hash of the
+    declarations of its rule.
+
+    Unlike :py:func:`default_class_namer`, which names rules after their
+    position in the list of all rules, the name of a rule only depends on its
+    own declarations, so rules that do not change keep their names when other
+    rules are added or removed. Nodes whose style does not change then keep
+    the same classes, and the HTML code of pages whose styles do not change
+    remains identical.
+
+    Names are made of a letter followed by letters or digits, like those of
+    :py:func:`short_class_namer`. When the hashes of several rules start with
+    the same characters, their names are lengthened with more characters of
+    their hashes until they differ. Rules with identical declarations get a
+    suffix `"_1"`, `"_2"`, and so on, in the order of the rules, after the
+    first one.
+
+    Instances are meant to be passed as the `class_namer` argument of
+    :py:func:`compile_css`:
+
+    .. code-block:: python
+
+        >>> compiled_css = compile_css(tree, class_namer=HashedClassNamer())
+    """
+
+    _repr_exclude = ("_rules", "_names")
+
+    def __init__(self, length: int = 6):
+        """Creates a new namer producing names of the given length.
+
+        :param length: The number of characters in each name, unless it
+            collides with another name and has to be lengthened. Defaults to
+            6, which makes collisions unlikely among thousands of rules.
+        :type length: int
+        :raises ValueError: If the length is lower than 1.
+        """
+        if length < 1:
+            raise ValueError(f"Length must be at least 1, but got: {length}")
+        super().__init__()
+        self.length = length
+        self._rules = None  # Rules that names were last computed for
+        self._names = []
+
+    def __call__(self, rules: List[ClassRule], index: int) -> str:
+        """Returns the name of the rule at the given index.
+
+        Names of all rules are computed on the first call for a given list of
+        rules and reused by the following calls with the same list.
+
+        :param rules: List of all compiled ClassRule objects.
+        :type rules: List[ClassRule]
+        :param index: Index of the rule whose class is being named.
+        :type index: int
+        :return: The name of the rule.
+        :rtype: str
+        """
+        if rules is not self._rules or len(self._names) != len(rules):
+            self._names = self._compute_names(rules)
+            self._rules = rules
+        return self._names[index]
+
+    def _compute_names(self, rules: List[ClassRule]) -> List[str]:
+        """Computes the names of all the given rules.
+
+        :param rules: List of all compiled ClassRule objects.
+        :type rules: List[ClassRule]
+        :return: The name of each rule.
+        :rtype: List[str]
+        """
+        # Hashing the sorted declarations of each rule into a fixed number of
+        # name characters
+        hashes = []
+        for rule in rules:
+            content = json.dumps(sorted(rule.declarations.items()))
+            value = int.from_bytes(hashlib.sha256(
+                content.encode("utf-8")).digest(), "big")
+            value, first = divmod(value, 52)
+            characters = [_NAME_CHARACTERS[first]]
+            for _ in range(43):
+                value, digit = divmod(value, 62)
+                characters.append(_NAME_CHARACTERS[digit])
+            hashes.append(''.join(characters))
+
+        # Each name is the shortest prefix of its hash, of at least `length`
+        # characters, that is not the prefix of any other hash. Only sorted
+        # neighbors can share the longest prefixes with a hash.
+        distinct = sorted(set(hashes))
+        lengths = {}
+        for i, h in enumerate(distinct):
+            length = self.length
+            for neighbor in distinct[max(i - 1, 0):i + 2]:
+                if neighbor != h:
+                    common = len(os.path.commonprefix((h, neighbor)))
+                    length = max(length, common + 1)
+            lengths[h] = length
+
+        # Adding suffixes to the names of rules with identical declarations
+        names = []
+        seen = {}
+        for h in hashes:
+            count = seen.get(h, 0)
+            seen[h] = count + 1
+            name = h[:lengths[h]]
+            names.append(f"{name}_{count}" if count else name)
+        return names
+
+
+def _accepts_usage(class_namer: Callable[..., str]) -> bool:
+    """Returns whether the given class namer accepts a `usage` argument.
+
+    :param class_namer: See :py:func:`compile_css`.
+    :type class_namer: Callable[..., str]
+    :return: True if the class namer can be called with a `usage` keyword
+        argument.
+    :rtype: bool
+    """
+    try:
+        return "usage" in inspect.signature(class_namer).parameters
+    except (TypeError, ValueError):  # Callables without a signature
+        return False
+
+
+def _intern_styles(styles: Dict[int, Dict[str, str]]
+                   ) -> Dict[Tuple[Tuple[str, str], ...], List[int]]:
+    """Groups the nodes of the given styles by distinct style.
+
+    :param styles: A dictionary mapping node IDs to styles, as returned by
+        :py:meth:`HTMLNode.get_styles`.
+    :type styles: Dict[int, Dict[str, str]]
+    :return: A dictionary mapping each distinct style, as a tuple of
+        (property, value) pairs in their original order, to the IDs of the
+        nodes that have it.
+    :rtype: Dict[Tuple[Tuple[str, str], ...], List[int]]
+    """
+    table = {}
+    for node_id, style in styles.items():
+        key = tuple(style.items())
+        node_ids = table.get(key)
+        if node_ids is None:
+            table[key] = [node_id]
+        else:
+            node_ids.append(node_id)
+    return table
+
+
+# Longhand properties folded into each shorthand property, in the order of the
+# shorthand's values
+_SHORTHANDS = {
+    "margin": ("margin-top", "margin-right", "margin-bottom", "margin-left"),
+    "padding": ("padding-top", "padding-right", "padding-bottom",
+                "padding-left"),
+    "flex": ("flex-grow", "flex-shrink", "flex-basis")
+}
+
+# Shorthand property of each longhand property
+_LONGHANDS = {longhand: shorthand for shorthand, longhands in
+              _SHORTHANDS.items() for longhand in longhands}
+
+# Values that apply to a whole property and cannot be part of a shorthand
+_CSS_WIDE_KEYWORDS = {"inherit", "initial", "unset", "revert", "revert-layer"}
+
+
+def _collapse_shorthands(style: Tuple[Tuple[str, str], ...]
+                         ) -> Tuple[Tuple[str, str], ...]:
+    """Folds the complete groups of longhand properties of the given style
+    into their shorthand properties, as described in :py:func:`compile_css`.
+
+    Each shorthand takes the place of the first of its longhands in the
+    style, so the other declarations keep their order.
+
+    :param style: The style, as a tuple of (property, value) pairs.
+    :type style: Tuple[Tuple[str, str], ...]
+    :return: The folded style, or the given style if nothing is folded.
+    :rtype: Tuple[Tuple[str, str], ...]
+    """
+    # Most styles have no longhand at all
+    if not any(p in _LONGHANDS for p, _ in style):
+        return style
+
+    # Finding the value of each shorthand whose group can be folded
+    declarations = dict(style)
+    values = {}
+    for shorthand, longhands in _SHORTHANDS.items():
+        if shorthand in declarations or \
+                any(p not in declarations for p in longhands):
+            continue
+        group = [declarations[p] for p in longhands]
+        if any(v.strip().lower() in _CSS_WIDE_KEYWORDS or "!important" in v
+               for v in group):
+            continue
+
+        # Box sides are written with as few values as possible
+        if len(group) == 4:
+            top, right, bottom, left = group
+            if right == left:
+                if top != bottom:
+                    group = [top, right, bottom]
+                elif top != right:
+                    group = [top, right]
+                else:
+                    group = [top]
+        values[shorthand] = " ".join(group)
+    if not values:
+        return style
+
+    # Writing each shorthand once, where its first longhand was
+    folded = []
+    pending = dict(values)
+    for p, v in style:
+        shorthand = _LONGHANDS.get(p)
+        if shorthand not in values:
+            folded.append((p, v))
+        elif shorthand in pending:
+            folded.append((shorthand, pending.pop(shorthand)))
+    return tuple(folded)
+
+
+def _get_global_declarations(sections: List[RuleSection]
+                             ) -> Dict[str, str]:
+    """Returns the declarations that the given sections apply to every
+    element through a universal selector `*`.
+
+    :param sections: The sections to read, in the order of the CSS code.
+    :type sections: List[RuleSection]
+    :return: A dictionary mapping each property to the value that applies to
+        every element. When several rules set the same property, the last one
+        wins, like in CSS.
+    :rtype: Dict[str, str]
+    """
+    declarations = {}
+    for section in sections:
+        for rule in section.rules:
+            if "*" in (s.strip() for s in rule.selector.split(",")):
+                declarations.update(rule.declarations)
+    return declarations
+
+
+def _drop_declarations(style: Tuple[Tuple[str, str], ...],
+                       declarations: Dict[str, str]
+                       ) -> Tuple[Tuple[str, str], ...]:
+    """Removes the given global declarations from the given style, as
+    described in :py:func:`compile_css`.
+
+    :param style: The style, as a tuple of (property, value) pairs.
+    :type style: Tuple[Tuple[str, str], ...]
+    :param declarations: The global declarations, as returned by
+        :py:func:`_get_global_declarations`.
+    :type declarations: Dict[str, str]
+    :return: The remaining style, or the given style if nothing is dropped.
+    :rtype: Tuple[Tuple[str, str], ...]
+    """
+    # Most styles have no global declaration at all
+    if not any(declarations.get(p) == v for p, v in style):
+        return style
+
+    # Keeping declarations whose property has a related property in the
+    # style, like `margin` with `margin-top`
+    properties = {p for p, _ in style}
+    kept = []
+    for p, v in style:
+        related = set(_SHORTHANDS.get(p, ())) | {_LONGHANDS.get(p)}
+        if declarations.get(p) != v or related & properties:
+            kept.append((p, v))
+    return tuple(kept)
+
+
+def _fold_table(table: Dict[Tuple[Tuple[str, str], ...], List[int]],
+                collapse_shorthands: bool, drop_global_declarations: bool
+                ) -> Tuple[Dict[Tuple[Tuple[str, str], ...], List[int]],
+                           Dict[Tuple[Tuple[str, str], ...],
+                                Tuple[Tuple[str, str], ...]]]:
+    """Folds each distinct style of the given table with
+    :py:func:`_collapse_shorthands` and :py:func:`_drop_declarations`, as
+    requested.
+
+    Shorthands are collapsed first, so that complete groups of longhands
+    equal to a global declaration are dropped as well.
+
+    :param table: The nodes of each distinct style, as returned by
+        :py:func:`_intern_styles`.
+    :type table: Dict[Tuple[Tuple[str, str], ...], List[int]]
+    :param collapse_shorthands: See :py:func:`compile_css`.
+    :type collapse_shorthands: bool
+    :param drop_global_declarations: See :py:func:`compile_css`.
+    :type drop_global_declarations: bool
+    :return: A tuple containing the nodes of each distinct folded style, in
+        the same format as the table, and the folded version of each style
+        of the table.
+    :rtype: Tuple[Dict[Tuple[Tuple[str, str], ...], List[int]],
+        Dict[Tuple[Tuple[str, str], ...], Tuple[Tuple[str, str], ...]]]
+    """
+    declarations = _get_global_declarations([Preamble()]) \
+        if drop_global_declarations else {}
+    folded = {}
+    for key in table:
+        style = _collapse_shorthands(key) if collapse_shorthands else key
+        folded[key] = _drop_declarations(style, declarations) \
+            if declarations else style
+    return _apply_folds(table, folded), folded
+
+
+def _apply_folds(table: Dict[Tuple[Tuple[str, str], ...], List[int]],
+                 folded: Dict[Tuple[Tuple[str, str], ...],
+                              Tuple[Tuple[str, str], ...]]
+                 ) -> Dict[Tuple[Tuple[str, str], ...], List[int]]:
+    """Replaces the styles of the given table with their folded version.
+
+    :param table: The nodes of each distinct style, as returned by
+        :py:func:`_intern_styles`.
+    :type table: Dict[Tuple[Tuple[str, str], ...], List[int]]
+    :param folded: The folded version of the styles of the table. Styles
+        missing from it are kept as they are.
+    :type folded: Dict[Tuple[Tuple[str, str], ...],
+        Tuple[Tuple[str, str], ...]]
+    :return: The nodes of each distinct folded style, in the same format as
+        the table.
+    :rtype: Dict[Tuple[Tuple[str, str], ...], List[int]]
+    """
+    folded_table = {}
+    for key, node_ids in table.items():
+        folded_table.setdefault(folded.get(key, key), []).extend(node_ids)
+    return folded_table
+
+
+def _get_attribute_values(trees: List[Union[HTMLNode, HTMLArena]],
+                          names: Iterable[str]
+                          ) -> Dict[Any, Tuple[Tuple[str, str], ...]]:
+    """Finds the nodes of the given trees that have one of the given
+    attributes.
+
+    :param trees: See :py:func:`compile_css`.
+    :type trees: List[Union[HTMLNode, HTMLArena]]
+    :param names: The names of the attributes to look for.
+    :type names: Iterable[str]
+    :return: A dictionary mapping the key of each node with such attributes,
+        as found in the mapping of :py:func:`compile_css`, to the (name,
+        value) pairs of these attributes.
+    :rtype: Dict[Any, Tuple[Tuple[str, str], ...]]
+    """
+    names = list(names)
+    values = {}
+    for tree in trees:
+        # Arenas are read from their attribute pool, once per distinct set of
+        # attributes
+        if isinstance(tree, HTMLArena):
+            pool, arena_id, found = tree.attribute_pool, id(tree), {}
+            for index, attributes in enumerate(tree._attributes):
+                pairs = found.get(attributes)
+                if pairs is None:
+                    pairs = dict(pool[attributes])
+                    pairs = tuple((n, pairs[n]) for n in names if n in pairs)
+                    found[attributes] = pairs
+                if pairs:
+                    values[(arena_id, index)] = pairs
+            continue
+
+        # Nodes are walked without recursion, reading their containers
+        # directly so that no empty container gets allocated
+        stack = [tree]
+        while stack:
+            node = stack.pop()
+            attributes = node._attributes
+            if attributes:
+                pairs = tuple((n, attributes[n]) for n in names
+                              if n in attributes)
+                if pairs:
+                    values[id(node)] = pairs
+            if node._children:
+                stack.extend(node._children)
+    return values
+
+
+def _count_attribute_styles(table: Dict[Tuple[Tuple[str, str], ...],
+                                        List[int]],
+                            values: Dict[Any, Tuple[Tuple[str, str], ...]]
+                            ) -> Dict[Tuple[Tuple[Tuple[str, str], ...],
+                                            Tuple[Tuple[str, str], ...]],
+                                      int]:
+    """Counts the nodes sharing each combination of style and attribute
+    values.
+
+    :param table: The nodes of each distinct style, as returned by
+        :py:func:`_intern_styles`.
+    :type table: Dict[Tuple[Tuple[str, str], ...], List[int]]
+    :param values: The attribute values of the nodes, as returned by
+        :py:func:`_get_attribute_values`. Nodes missing from the table are
+        counted with an empty style.
+    :type values: Dict[Any, Tuple[Tuple[str, str], ...]]
+    :return: A dictionary mapping each distinct (style, attribute values)
+        pair to the number of nodes that have it.
+    :rtype: Dict[Tuple[Tuple[Tuple[str, str], ...],
+        Tuple[Tuple[str, str], ...]], int]
+    """
+    counts = {}
+    seen = set()
+    for key, node_ids in table.items():
+        remaining = len(node_ids)
+        for node_id in node_ids:
+            pairs = values.get(node_id)
+            if pairs is not None:
+                counts[(key, pairs)] = counts.get((key, pairs), 0) + 1
+                seen.add(node_id)
+                remaining -= 1
+        if remaining:
+            counts[(key, ())] = counts.get((key, ()), 0) + remaining
+    for node_id, pairs in values.items():
+        if node_id not in seen:
+            counts[((), pairs)] = counts.get(((), pairs), 0) + 1
+    return counts
+
+
+def _get_attribute_rules(counts: Dict[Tuple[Tuple[Tuple[str, str], ...],
+                                            Tuple[Tuple[str, str], ...]],
+                                      int]
+                         ) -> Tuple[List[AttributeRule],
+                                    Dict[Tuple[Tuple[str, str], ...],
+                                         Tuple[Tuple[str, str], ...]]]:
+    """Creates one :py:class:`AttributeRule` per attribute value whose nodes
+    all share some declarations, and removes these declarations from their
+    styles.
+
+    An attribute value only gets a rule if at least two nodes have it and if
+    its selector is valid according to :py:func:`validate_css_selector`.
+    Nodes with the same style keep the same style, so a declaration is only
+    removed from a style if the rules of all of its nodes contain it. Nodes
+    with the attribute value may thus get the declaration from both a class
+    and an attribute rule, which is harmless as both set the same value.
+
+    :param counts: The number of nodes sharing each combination of style and
+        attribute values, as returned by :py:func:`_count_attribute_styles`.
+    :type counts: Dict[Tuple[Tuple[Tuple[str, str], ...],
+        Tuple[Tuple[str, str], ...]], int]
+    :return: A tuple containing the rules, sorted by selector, and the
+        folded version of each style that loses declarations.
+    :rtype: Tuple[List[AttributeRule], Dict[Tuple[Tuple[str, str], ...],
+        Tuple[Tuple[str, str], ...]]]
+    """
+    # Intersecting the styles of all nodes with each attribute value
+    shared, usage = {}, {}
+    for (key, pairs), count in counts.items():
+        for pair in pairs:
+            shared[pair] = shared[pair].intersection(key) \
+                if pair in shared else set(key)
+            usage[pair] = usage.get(pair, 0) + count
+
+    # Creating rules for the attribute values worth a rule
+    rules = {}
+    for pair in sorted(shared):
+        if usage[pair] < 2 or not shared[pair]:
+            continue
+        rule = AttributeRule(*pair, dict(sorted(shared[pair])))
+        try:
+            validate_css_selector(rule.selector)
+        except ValueError:
+            continue
+        rules[pair] = rule
+
+    # Removing from each style the declarations that the rules of all of its
+    # nodes achieve
+    removed = {}
+    for (key, pairs), _ in counts.items():
+        covered = set().union(*(shared[p] for p in pairs if p in rules))
+        removed[key] = removed[key] & covered if key in removed else covered
+    folded = {key: tuple(d for d in key if d not in declarations)
+              for key, declarations in removed.items() if declarations}
+    return list(rules.values()), folded
+
+
+def _fold_signatures(counts: Dict[Tuple[Tuple[Tuple[str, str], ...],
+                                        Tuple[Tuple[str, str], ...]], int],
+                     folded: Dict[Tuple[Tuple[str, str], ...],
+                                  Tuple[Tuple[str, str], ...]]
+                     ) -> Dict[FrozenSet[Tuple[str, str]], int]:
+    """Counts the nodes sharing each distinct folded style, like
+    :py:func:`_get_signatures` does after the styles are folded.
+
+    :param counts: See :py:func:`_get_attribute_rules`.
+    :type counts: Dict[Tuple[Tuple[Tuple[str, str], ...],
+        Tuple[Tuple[str, str], ...]], int]
+    :param folded: The folded version of the styles that lose declarations,
+        as returned by :py:func:`_get_attribute_rules`.
+    :type folded: Dict[Tuple[Tuple[str, str], ...],
+        Tuple[Tuple[str, str], ...]]
+    :return: See :py:func:`_get_signatures`.
+    :rtype: Dict[FrozenSet[Tuple[str, str]], int]
+    """
+    signatures = {}
+    for (key, _), count in counts.items():
+        key = folded.get(key, key)
+        if key:
+            signature = frozenset(key)
+            signatures[signature] = signatures.get(signature, 0) + count
+    return signatures
+
+
+def _get_properties(table: Dict[Tuple[Tuple[str, str], ...], List[int]]
+                    ) -> Set[Tuple[str, str]]:
+    """Returns the set of all CSS properties used in the given styles.
+
+    :param table: The nodes of each distinct style, as returned by
+        :py:func:`_intern_styles`.
+    :type table: Dict[Tuple[Tuple[str, str], ...], List[int]]
+    :return: The set of all (property, value) pairs found in the styles.
+    :rtype: Set[Tuple[str, str]]
+    """
+    return set(itertools.chain.from_iterable(table))
+
+
+def _compile_rules(properties: Set[Tuple[str, str]],
+                   class_namer: Callable[[List[ClassRule], int], str],
+                   signatures: Dict[FrozenSet[Tuple[str, str]], int] = None
+                   ) -> List[ClassRule]:
+    """Creates one named :py:class:`ClassRule` per CSS property.
+
+    :param properties: The (property, value) pairs to create rules for.
+    :type properties: Set[Tuple[str, str]]
+    :param class_namer: See :py:func:`compile_css`.
+    :type class_namer: Callable[[List[ClassRule], int], str]
+    :param signatures: See :py:func:`_name_rules`.
+    :type signatures: Dict[FrozenSet[Tuple[str, str]], int]
+    :return: The rules, sorted by class name.
+    :rtype: List[ClassRule]
+    """
+    rules = _name_rules([(p,) for p in properties], class_namer, signatures)
+    return sorted(rules, key=lambda r: r.name)  # Sorting by name
+
+
+def _name_rules(groups: List[Tuple[Tuple[str, str], ...]],
+                class_namer: Callable[[List[ClassRule], int], str],
+                signatures: Dict[FrozenSet[Tuple[str, str]], int] = None
+                ) -> List[ClassRule]:
+    """Creates one named :py:class:`ClassRule` per group of declarations.
+
+    Rules are named in the order of their sorted declarations, regardless of
+    the order of the groups, so that names do not depend on how the groups
+    were found. If the class namer accepts a `usage` argument, rules are
+    named by decreasing usage instead, with ties in the order of their
+    declarations.
+
+    :param groups: The groups of (property, value) pairs to create rules
+        for. Each group must be sorted.
+    :type groups: List[Tuple[Tuple[str, str], ...]]
+    :param class_namer: See :py:func:`compile_css`.
+    :type class_namer: Callable[[List[ClassRule], int], str]
+    :param signatures: The number of nodes sharing each distinct style, as
+        returned by :py:func:`_get_signatures`. Only required if the class
+        namer accepts a `usage` argument.
+    :type signatures: Dict[FrozenSet[Tuple[str, str]], int]
+    :return: The rules, in the order of the groups.
+    :rtype: List[ClassRule]
+    """
+    rules = [ClassRule("", dict(g))  # Initializing with empty name
+             for g in groups]
+    order = sorted(range(len(groups)), key=groups.__getitem__)
+
+    # Naming rules by decreasing usage if the class namer asks for it
+    if _accepts_usage(class_namer):
+        usage = _count_usage(signatures, groups)
+        order.sort(key=lambda i: -usage[i])  # Stable, so ties remain sorted
+        ordered = [rules[i] for i in order]
+        ordered_usage = [usage[i] for i in order]
+        for i, rule in enumerate(ordered):  # Assigning name from callback
+            rule.name = class_namer(ordered, i, usage=ordered_usage)
+        return rules
+
+    ordered = [rules[i] for i in order]
+    for i, rule in enumerate(ordered):  # Assigning name from callback
+        rule.name = class_namer(ordered, i)
+    return rules
+
+
+def _count_usage(signatures: Dict[FrozenSet[Tuple[str, str]], int],
+                 groups: List[Tuple[Tuple[str, str], ...]]) -> List[int]:
+    """Counts the nodes that each group of declarations is applied to.
+
+    :param signatures: The number of nodes sharing each distinct style, as
+        returned by :py:func:`_get_signatures`.
+    :type signatures: Dict[FrozenSet[Tuple[str, str]], int]
+    :param groups: The groups of (property, value) pairs, in the order in
+        which they are applied to cover a style, as described in
+        :py:func:`_map_groups`.
+    :type groups: List[Tuple[Tuple[str, str], ...]]
+    :return: The number of nodes using each group, in the order of the
+        groups.
+    :rtype: List[int]
+    """
+    index = _index_groups(groups)
+    usage = [0] * len(groups)
+    for signature, count in signatures.items():
+        for position in _cover_style(signature, groups, index):
+            usage[position] += count
+    return usage
+
+
+def _filter_inline_groups(groups: List[Tuple[Tuple[str, str], ...]],
+                          signatures: Dict[FrozenSet[Tuple[str, str]], int]
+                          ) -> List[Tuple[Tuple[str, str], ...]]:
+    """Removes the groups of declarations that take fewer bytes as inline
+    styles than as rules.
+
+    A rule costs its own CSS code plus one class in the `class` attribute of
+    every node it is applied to, while an inline group costs its
+    declarations in the `style` attribute of every such node. Sizes are
+    estimated like in :py:func:`_group_declarations`, assuming default class
+    names and indentation, and ties are kept as rules so that the style sheet
+    changes as little as possible.
+
+    :param groups: The groups of (property, value) pairs, in the order in
+        which they are applied to cover a style, as described in
+        :py:func:`_map_groups`.
+    :type groups: List[Tuple[Tuple[str, str], ...]]
+    :param signatures: The number of nodes sharing each distinct style, as
+        returned by :py:func:`_get_signatures`.
+    :type signatures: Dict[FrozenSet[Tuple[str, str]], int]
+    :return: The groups to keep as rules, in their original order.
+    :rtype: List[Tuple[Tuple[str, str], ...]]
+    """
+    # Estimating the size of each class in a `class` attribute and the size
+    # of a rule without its declarations
+    name_size = len(f"c{len(groups)}")
+    class_size = name_size + 1
+    rule_size = name_size + 7
+
+    # Comparing each rule with its declarations written in every node using
+    # it, as in `margin:0;`
+    usage = _count_usage(signatures, groups)
+    kept = []
+    for group, count in zip(groups, usage):
+        rule_cost = rule_size + sum(len(p) + len(v) + 8 for p, v in group) + \
+            count * class_size
+        inline_cost = count * sum(len(p) + len(v) + 2 for p, v in group)
+        if rule_cost <= inline_cost:
+            kept.append(group)
+    return kept
+
+
+def _get_inline_styles(style_rules: Dict[Tuple[Tuple[str, str], ...],
+                                         List[ClassRule]]
+                       ) -> Dict[Tuple[Tuple[str, str], ...], str]:
+    """Writes the declarations of each style that none of its rules achieve
+    as the content of a `style` attribute.
+
+    :param style_rules: The rules of each distinct style, as returned by
+        :py:func:`_map_rules` or :py:func:`_map_groups`.
+    :type style_rules: Dict[Tuple[Tuple[str, str], ...], List[ClassRule]]
+    :return: A dictionary mapping each style with such declarations to
+        these declarations, in their original order, as in
+        `margin:0;color:red`.
+    :rtype: Dict[Tuple[Tuple[str, str], ...], str]
+    :raises ValueError: If a property or a value written inline is invalid.
+    """
+    inline = {}
+    for key, rules in style_rules.items():
+        covered = set(d for r in rules for d in r.declarations.items())
+        remaining = [(p, v) for p, v in key if (p, v) not in covered]
+        if remaining:
+            for p, v in remaining:
+                validate_css_identifier(p)
+                validate_css_value(v)
+            inline[key] = ";".join(f"{p}:{v}" for p, v in remaining)
+    return inline
+
+
+def _map_rules(styles: Iterable[Iterable[Tuple[str, str]]],
+               rules: List[ClassRule]
+               ) -> Dict[Iterable[Tuple[str, str]], List[ClassRule]]:
+    """Maps each distinct style to the rules that together achieve it.
+
+    :param styles: The distinct styles, as collections of (property, value)
+        pairs, such as the keys of the table returned by
+        :py:func:`_intern_styles`.
+    :type styles: Iterable[Iterable[Tuple[str, str]]]
+    :param rules: The compiled rules, sorted by class name.
+    :type rules: List[ClassRule]
+    :return: A dictionary mapping each style to a list of rules.
+    :rtype: Dict[Iterable[Tuple[str, str]], List[ClassRule]]
+    """
+    # Indexing the position of each rule by declaration, so that the rules of
+    # each style are found from its own declarations only, in O(style size)
+    index = {}
+    sizes = []
+    for position, rule in enumerate(rules):
+        sizes.append(len(rule.declarations))
+        for declaration in rule.declarations.items():
+            index.setdefault(declaration, []).append(position)
+
+    # Looking up the rules of each distinct style once
+    single = all(size == 1 for size in sizes)
+    always = [p for p, size in enumerate(sizes) if size == 0]
+    mapping = {}
+    for key in styles:
+        # When every rule has a single declaration, each rule found through
+        # the index applies to the style
+        if single:
+            positions = [p for d in key for p in index.get(d, ())]
+
+        # Otherwise, a rule only applies if all of its declarations are found,
+        # and rules without declarations apply to all nodes
+        else:
+            counts = {}
+            for declaration in key:
+                for position in index.get(declaration, ()):
+                    counts[position] = counts.get(position, 0) + 1
+            positions = always + [p for p, c in counts.items()
+                                  if c == sizes[p]]
+        positions.sort()
+        mapping[key] = [rules[p] for p in positions]
+    return mapping
+
+
+def _map_nodes(table: Dict[Tuple[Tuple[str, str], ...], List[int]],
+               style_rules: Dict[Tuple[Tuple[str, str], ...],
+                                 List[ClassRule]]
+               ) -> Dict[int, List[ClassRule]]:
+    """Maps each node to the rules of its style.
+
+    :param table: The nodes of each distinct style, as returned by
+        :py:func:`_intern_styles`.
+    :type table: Dict[Tuple[Tuple[str, str], ...], List[int]]
+    :param style_rules: The rules of each distinct style, as returned by
+        :py:func:`_map_rules` or :py:func:`_map_groups`.
+    :type style_rules: Dict[Tuple[Tuple[str, str], ...], List[ClassRule]]
+    :return: A dictionary mapping each node ID to a list of rules. Nodes with
+        identical styles share the same list.
+    :rtype: Dict[int, List[ClassRule]]
+    """
+    mapping = {}
+    for key, node_ids in table.items():
+        mapping.update(dict.fromkeys(node_ids, style_rules[key]))
+    return mapping
+
+
+def _get_signatures(table: Dict[Tuple[Tuple[str, str], ...], List[int]]
+                    ) -> Dict[FrozenSet[Tuple[str, str]], int]:
+    """Counts the nodes sharing each distinct style in the given styles,
+    regardless of the order of their declarations.
+
+    :param table: The nodes of each distinct style, as returned by
+        :py:func:`_intern_styles`.
+    :type table: Dict[Tuple[Tuple[str, str], ...], List[int]]
+    :return: A dictionary mapping each distinct non-empty style, as a set of
+        (property, value) pairs, to the number of nodes that have it.
+    :rtype: Dict[FrozenSet[Tuple[str, str]], int]
+    """
+    signatures = {}
+    for key, node_ids in table.items():
+        if key:
+            signature = frozenset(key)
+            signatures[signature] = signatures.get(signature, 0) + \
+                len(node_ids)
+    return signatures
+
+
+def _group_declarations(signatures: Dict[FrozenSet[Tuple[str, str]], int],
+                        max_intersections: int = 32
+                        ) -> List[Tuple[Tuple[str, str], ...]]:
+    """Groups declarations into rules that minimize the total size of the
+    HTML and CSS code.
+
+    Declarations that appear in exactly the same styles are first merged into
+    atoms, as one rule per atom is always smaller than one rule per
+    declaration. Groups of atoms that often appear together are then selected
+    greedily, as long as the bytes they save in `class` attributes and in
+    rules that are no longer needed exceed the bytes of their own rule.
+    Candidate groups are the styles themselves and the intersections of the
+    most common styles.
+
+    Each style is then covered by applying groups in the returned order and
+    taking every group that fits in the declarations not yet covered, which
+    is what :py:func:`_map_groups` does.
+
+    :param signatures: A dictionary mapping each distinct style, as a set of
+        (property, value) pairs, to the number of nodes that have it, as
+        returned by :py:func:`_get_signatures`.
+    :type signatures: Dict[FrozenSet[Tuple[str, str]], int]
+    :param max_intersections: The number of most common styles whose pairwise
+        intersections are considered as candidate groups. Defaults to 32.
+    :type max_intersections: int
+    :return: The groups of (property, value) pairs, each sorted, in the order
+        in which they should be applied to cover a style.
+    :rtype: List[Tuple[Tuple[str, str], ...]]
+    """
+    # Merging declarations that appear in the same styles into atoms. Styles
+    # are sorted so that the result does not depend on hashing.
+    styles = sorted(tuple(sorted(s)) for s in signatures)
+    counts = [signatures[frozenset(s)] for s in styles]
+    occurrences = {}
+    for i, style in enumerate(styles):
+        for declaration in style:
+            occurrences.setdefault(declaration, []).append(i)
+    atoms_by_occurrence = {}
+    for declaration, occurrence in occurrences.items():
+        atoms_by_occurrence.setdefault(tuple(occurrence), []).append(
+            declaration)
+    atoms = sorted(tuple(sorted(a)) for a in atoms_by_occurrence.values())
+    atom_ids = {d: i for i, atom in enumerate(atoms) for d in atom}
+
+    # Estimating the size of each class in a `class` attribute, the size of a
+    # rule without its declarations, and the size of each atom's declarations
+    # in CSS code, assuming default class names and indentation
+    name_size = len(f"c{len(atoms)}")
+    class_size = name_size + 1
+    rule_size = name_size + 7
+    atom_sizes = [sum(len(p) + len(v) + 8 for p, v in atom) for atom in atoms]
+
+    # Tracking the atoms of each style that no group covers yet, and the
+    # styles in which each atom is not covered yet
+    remaining = [set(atom_ids[d] for d in style) for style in styles]
+    postings = [set() for _ in atoms]
+    for i, atom_set in enumerate(remaining):
+        for atom in atom_set:
+            postings[atom].add(i)
+
+    def get_benefit(group: Tuple[int, ...]) -> Tuple[int, List[int]]:
+        # Finding the styles that can use the group, starting from the atom
+        # with the fewest uncovered styles
+        rarest = min(group, key=lambda a: len(postings[a]))
+        users = [i for i in postings[rarest] if remaining[i].issuperset(group)]
+        if not users:
+            return 0, users
+
+        # Each user replaces the classes of the atoms with a single class, and
+        # atoms used by no other style no longer need their own rule
+        saved = sum(counts[i] for i in users) * (len(group) - 1) * class_size
+        saved += sum(rule_size + atom_sizes[a] for a in group
+                     if len(postings[a]) == len(users))
+        cost = rule_size + sum(atom_sizes[a] for a in group)
+        return saved - cost, users
+
+    # Listing candidate groups: every style with several atoms, and the
+    # intersections of the most common ones
+    candidates = set(tuple(sorted(r)) for r in remaining if len(r) > 1)
+    common = sorted(range(len(styles)), key=lambda i: -counts[i] * len(
+        remaining[i]))[:max_intersections]
+    for i, j in itertools.combinations(common, 2):
+        intersection = remaining[i] & remaining[j]
+        if len(intersection) > 1:
+            candidates.add(tuple(sorted(intersection)))
+
+    # Selecting groups greedily. Benefits can only be recomputed lazily, so a
+    # candidate is selected once its benefit, recomputed, is still the
+    # largest.
+    heap = [(-get_benefit(c)[0], c) for c in candidates]
+    heapq.heapify(heap)
+    groups = []
+    while heap and heap[0][0] < 0:
+        _, group = heapq.heappop(heap)
+        benefit, users = get_benefit(group)
+        if benefit <= 0:
+            continue
+        if heap and -heap[0][0] > benefit:
+            heapq.heappush(heap, (-benefit, group))
+            continue
+
+        # Covering the group's atoms in every style that uses it, and adding
+        # the styles' new remainders as candidates
+        groups.append(group)
+        for i in users:
+            remaining[i].difference_update(group)
+            for atom in group:
+                postings[atom].discard(i)
+            remainder = tuple(sorted(remaining[i]))
+            if len(remainder) > 1 and remainder not in candidates:
+                candidates.add(remainder)
+                heapq.heappush(heap, (-get_benefit(remainder)[0], remainder))
+
+    # Atoms that remain uncovered in some style keep a rule of their own,
+    # applied after all groups
+    groups = [tuple(sorted(d for a in g for d in atoms[a])) for g in groups]
+    return groups + [atom for a, atom in enumerate(atoms) if postings[a]]
+
+
+def _map_groups(styles: Iterable[Iterable[Tuple[str, str]]],
+                groups: List[Tuple[Tuple[str, str], ...]],
+                rules: List[ClassRule]
+                ) -> Dict[Iterable[Tuple[str, str]], List[ClassRule]]:
+    """Maps each distinct style to the rules of the groups that cover it.
+
+    Each style is covered by applying groups in the given order and taking
+    every group whose declarations are all part of the style and not covered
+    yet.
+
+    :param styles: See :py:func:`_map_rules`.
+    :type styles: Iterable[Iterable[Tuple[str, str]]]
+    :param groups: The groups of (property, value) pairs, as returned by
+        :py:func:`_group_declarations`.
+    :type groups: List[Tuple[Tuple[str, str], ...]]
+    :param rules: The rule of each group, in the order of the groups.
+    :type rules: List[ClassRule]
+    :return: A dictionary mapping each style to a list of rules, sorted by
+        class name.
+    :rtype: Dict[Iterable[Tuple[str, str]], List[ClassRule]]
+    """
+    index = _index_groups(groups)
+    mapping = {}
+    for key in styles:
+        cover = [rules[p] for p in _cover_style(frozenset(key), groups, index)]
+        cover.sort(key=lambda r: r.name)
+        mapping[key] = cover
+    return mapping
+
+
+def _index_groups(groups: List[Tuple[Tuple[str, str], ...]]
+                  ) -> Dict[Tuple[str, str], List[int]]:
+    """Indexes the position of each group of declarations by declaration.
+
+    :param groups: The groups of (property, value) pairs.
+    :type groups: List[Tuple[Tuple[str, str], ...]]
+    :return: A dictionary mapping each (property, value) pair to the
+        positions of the groups containing it, in increasing order.
+    :rtype: Dict[Tuple[str, str], List[int]]
+    """
+    index = {}
+    for position, group in enumerate(groups):
+        for declaration in group:
+            index.setdefault(declaration, []).append(position)
+    return index
+
+
+def _cover_style(signature: FrozenSet[Tuple[str, str]],
+                 groups: List[Tuple[Tuple[str, str], ...]],
+                 index: Dict[Tuple[str, str], List[int]]) -> List[int]:
+    """Covers a style with groups of declarations, taking every group whose
+    declarations are all part of the style and not covered yet, in the order
+    of the groups.
+
+    :param signature: The style to cover, as a set of (property, value)
+        pairs.
+    :type signature: FrozenSet[Tuple[str, str]]
+    :param groups: The groups of (property, value) pairs.
+    :type groups: List[Tuple[Tuple[str, str], ...]]
+    :param index: The index of the groups, as returned by
+        :py:func:`_index_groups`.
+    :type index: Dict[Tuple[str, str], List[int]]
+    :return: The positions of the groups covering the style, in increasing
+        order.
+    :rtype: List[int]
+    """
+    uncovered = set(signature)
+    cover = []
+    for position in sorted(set(p for d in signature
+                               for p in index.get(d, ()))):
+        if uncovered.issuperset(groups[position]):
+            uncovered.difference_update(groups[position])
+            cover.append(position)
+    return cover
@@ -35,7 +35,7 @@ class CSSRule(ReprMixin):
         self.selector = selector
         self.declarations = declarations
 
-    def to_css(self, indent_size: int = 4) -> str:
+    def to_css(self, indent_size: int = 4, minify: bool = False) -> str:
         """Converts the rule into CSS code.
 
         The rule's name is converted to a class selector.
@@ -48,24 +48,34 @@ class CSSRule(ReprMixin):
         :param indent_size: The number of spaces to use for indentation in the
             CSS code. Defaults to 4.
         :type indent_size: int
+        :param minify: If True, the rule is written on a single line without
+            any whitespace nor final semicolon, as in `.c0{margin:0;color:red}`.
+            `indent_size` is then ignored. Defaults to False.
+        :type minify: bool
         :return: The CSS code as a string.
         :rtype: str
         """
-        # Defining indentation
-        indentation = get_indentation(level=1, size=indent_size)
-
         # Validating the selector
         validate_css_selector(self.selector)
 
-        # Writing down each property
-        css_code = self.selector + " {\n"
+        # Validating each property
         for property_name, value in self.declarations.items():
             validate_css_identifier(property_name)
             validate_css_value(value)
-            css_code += f"{indentation}{property_name}: {value};\n"
-        css_code += "}"
 
-        return css_code
+        # Writing down the minified rule on a single line
+        if minify:
+            return self.selector + "{" + ";".join(
+                f"{p}:{v}" for p, v in self.declarations.items()) + "}"
+
+        # Otherwise, writing down each property on its own line
+        indentation = get_indentation(level=1, size=indent_size)
+        return "\n".join([
+            self.selector + " {",
+            *(f"{indentation}{p}: {v};"
+              for p, v in self.declarations.items()),
+            "}"
+        ])
 
 
 class ClassRule(CSSRule):
@@ -104,3 +114,24 @@ class ClassRule(CSSRule):
         """
         self._name = value
         self.selector = f".{value}"  # Updating the selector
+
+
+class AttributeRule(CSSRule):
+    """A CSS rule that targets the HTML elements whose attribute has a given
+    value, such as `[data-role="box-item"]`.
+    """
+
+    def __init__(self, attribute: str, value: str,
+                 declarations: Dict[str, str]):
+        """Creates a new CSS attribute rule.
+
+        :param attribute: The name of the HTML attribute.
+        :type attribute: str
+        :param value: The value of the attribute that elements must have.
+        :type value: str
+        :param declarations: See :py:meth:`CSSRule.__init__`.
+        :type declarations: Dict[str, str]
+        """
+        super().__init__(f'[{attribute}="{value}"]', declarations)
+        self.attribute = attribute
+        self.value = value
@@ -81,8 +81,9 @@ class CSSSection(ABC, ReprMixin):
         inserted before the result of :py:meth:`CSSSection.compile_content` in
         the CSS code.
 
-        If the section has no title, this function will produce the same result
-        as :py:meth:`CSSSection.compile_content`.
+        If the section has no title, or if the keyword argument `minify` is
+        True, this function will produce the same result as
+        :py:meth:`CSSSection.compile_content`.
 
         :param args: Arguments to pass to
             :py:meth:`CSSSection.compile_content`.
@@ -93,8 +94,8 @@ class CSSSection(ABC, ReprMixin):
         :return: The CSS code for the section.
         :rtype: str
         """
-        # If no title, we just return the compiled content
-        if self.title is None:
+        # If no title or if minifying, we just return the compiled content
+        if self.title is None or kwargs.get("minify", False):
             return self.compile_content(*args, **kwargs)
 
         # Otherwise, we turn the title into a comment and validate it
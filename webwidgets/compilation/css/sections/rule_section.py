@@ -30,14 +30,19 @@ class RuleSection(CSSSection):
         super().__init__(title=title)
         self.rules = [] if rules is None else rules
 
-    def compile_content(self, indent_size: int = 4) -> str:
+    def compile_content(self, indent_size: int = 4,
+                        minify: bool = False) -> str:
         """Compiles the CSS representation of the rules contained in the
         section.
 
         :param indent_size: See :py:meth:`CSSRule.to_css`.
         :type indent_size: int
+        :param minify: See :py:meth:`CSSRule.to_css`. If True, rules are not
+            separated by blank lines.
+        :type minify: bool
         :return: The CSS representation of the rules.
         :rtype: str
         """
-        return "\n\n".join([
-            rule.to_css(indent_size=indent_size) for rule in self.rules])
+        return ("" if minify else "\n\n").join([
+            rule.to_css(indent_size=indent_size, minify=minify)
+            for rule in self.rules])
@@ -10,6 +10,8 @@
 #
 # =======================================================================
 
+from .html_arena import HTMLArena
+from .html_containers import TrackedDict, TrackedList
 from .html_node import HTMLNode, no_start_tag, no_end_tag, one_line, RawText, \
     RootNode
 from .html_tags import *
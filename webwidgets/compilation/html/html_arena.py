@@ -0,0 +1,746 @@
+# =======================================================================
+#
+#  This file is part of WebWidgets, a Python package for designing web
+#  UIs.
+#
+#  You should have received a copy of the MIT License along with
+#  WebWidgets. If not, see <https://opensource.org/license/mit>.
+#
+#  Copyright(C) 2025, mlaasri
+#
+# =======================================================================
+
+from array import array
+from .html_node import HTMLNode, RawText, _build_start_tag, _CUSTOM, \
+    _EMPTY_STYLE, _FRAGMENT, _get_tag_descriptor, _INLINE, _LINES, \
+    _merge_classes, _merge_styles, _NEW_LINE, _RAW, _ROOT
+from .html_tags import Style
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, List, Mapping, Tuple, Union
+from webwidgets.utility.indentation import get_indentation
+from webwidgets.utility.representation import ReprMixin
+from webwidgets.utility.sanitizing import sanitize_html_text
+from webwidgets.utility.validation import validate_html_class
+
+
+class HTMLArena(ReprMixin):
+    """A compact representation of an HTML tree for very large documents.
+
+    Instead of one Python object per node, an arena stores its nodes in flat
+    parallel arrays of integers, where each node is identified by its index:
+
+    - the index of the node's class in :py:attr:`HTMLArena.classes`;
+    - the indices of the node's parent, first child, last child, and next
+      sibling, or -1 if there is none;
+    - the indices of the node's attributes and style in pools of interned
+      tuples of (name, value) pairs;
+    - the index of the node's text in a pool of interned strings, or -1 if the
+      node is neither a :py:class:`RawText` node nor a :py:class:`Style`
+      element.
+
+    The root of the tree is always the node at index 0. Arenas render to the
+    same HTML code as the equivalent :py:class:`HTMLNode` tree and can be
+    passed to :py:func:`compile_css` and :py:func:`apply_css`.
+
+    Nodes of any :py:class:`HTMLNode` subclass can be stored in an arena, but
+    only their class, attributes, style, text, and children are kept. Nodes
+    whose class overrides :py:meth:`HTMLNode.to_html` are converted back into
+    regular nodes to be rendered.
+    """
+
+    def __init__(self):
+        """Creates a new empty arena."""
+        super().__init__()
+        self.classes: List[type] = []
+        self.attribute_pool: List[Tuple[Tuple[str, str], ...]] = [()]
+        self.style_pool: List[Tuple[Tuple[str, str], ...]] = [()]
+        self.text_pool: List[str] = []
+        self._tags = array('i')
+        self._parents = array('i')
+        self._first_children = array('i')
+        self._last_children = array('i')
+        self._next_siblings = array('i')
+        self._attributes = array('i')
+        self._styles = array('i')
+        self._texts = array('i')
+
+        # Indices of interned values, and tags rendered for each pair of
+        # class and attributes
+        self._class_ids = {}
+        self._attribute_ids = {(): 0}
+        self._style_ids = {(): 0}
+        self._text_ids = {}
+        self._tag_cache = {}
+
+    # Internal indices and caches, which are not part of the representation
+    _repr_exclude = ("_tags", "_parents", "_first_children", "_last_children",
+                     "_next_siblings", "_attributes", "_styles", "_texts",
+                     "_class_ids", "_attribute_ids", "_style_ids",
+                     "_text_ids", "_tag_cache")
+
+    def __len__(self) -> int:
+        """Returns the number of nodes in the arena.
+
+        :return: The number of nodes.
+        :rtype: int
+        """
+        return len(self._tags)
+
+    @staticmethod
+    def _intern(value: Any, pool: List[Any], ids: Dict[Any, int]) -> int:
+        """Returns the index of the given value in the given pool, adding the
+        value to the pool if it is not there yet.
+
+        :param value: The value to intern.
+        :type value: Any
+        :param pool: The pool of interned values.
+        :type pool: List[Any]
+        :param ids: A dictionary mapping each value of the pool to its index.
+        :type ids: Dict[Any, int]
+        :return: The index of the value in the pool.
+        :rtype: int
+        """
+        index = ids.get(value)
+        if index is None:
+            index = ids[value] = len(pool)
+            pool.append(value)
+        return index
+
+    def add(self, cls: type = HTMLNode, parent: int = -1,
+            attributes: Dict[str, str] = None, style: Dict[str, str] = None,
+            text: str = None) -> int:
+        """Adds a node as the last child of the given parent.
+
+        :param cls: The class of the node. Defaults to
+            :py:class:`HTMLNode`.
+        :type cls: type
+        :param parent: The index of the parent node, or -1 to add the root
+            node of an empty arena. Defaults to -1.
+        :type parent: int
+        :param attributes: The attributes of the node. Defaults to no
+            attribute.
+        :type attributes: Dict[str, str]
+        :param style: The style of the node. Defaults to no style.
+        :type style: Dict[str, str]
+        :param text: The text of the node if it is a :py:class:`RawText`
+            node or a :py:class:`Style` element, or None otherwise. Defaults
+            to None.
+        :type text: str
+        :return: The index of the new node.
+        :rtype: int
+        :raises ValueError: If the parent does not exist, or if no parent is
+            given and the arena already has a root node.
+        """
+        index = len(self._tags)
+        if parent == -1 and index > 0:
+            raise ValueError("Arena already has a root node")
+        if not -1 <= parent < index:
+            raise ValueError(f"Invalid parent index: {parent}")
+
+        # Linking the node to its parent and previous sibling
+        if parent != -1:
+            previous = self._last_children[parent]
+            if previous == -1:
+                self._first_children[parent] = index
+            else:
+                self._next_siblings[previous] = index
+            self._last_children[parent] = index
+
+        # Storing the node's data
+        self._tags.append(self._intern(cls, self.classes, self._class_ids))
+        self._parents.append(parent)
+        self._first_children.append(-1)
+        self._last_children.append(-1)
+        self._next_siblings.append(-1)
+        self._attributes.append(self._intern(
+            tuple(attributes.items()) if attributes else (),
+            self.attribute_pool, self._attribute_ids))
+        self._styles.append(self._intern(
+            tuple(style.items()) if style else (),
+            self.style_pool, self._style_ids))
+        self._texts.append(-1 if text is None else self._intern(
+            text, self.text_pool, self._text_ids))
+        return index
+
+    def add_text(self, text: str, parent: int = -1) -> int:
+        """Adds a :py:class:`RawText` node as the last child of the given
+        parent.
+
+        :param text: The text of the node.
+        :type text: str
+        :param parent: See :py:meth:`HTMLArena.add`.
+        :type parent: int
+        :return: The index of the new node.
+        :rtype: int
+        """
+        return self.add(RawText, parent=parent, text=text)
+
+    def get_class(self, index: int) -> type:
+        """Returns the class of the given node.
+
+        :param index: The index of the node.
+        :type index: int
+        :return: The class of the node.
+        :rtype: type
+        """
+        return self.classes[self._tags[index]]
+
+    def get_parent(self, index: int) -> int:
+        """Returns the parent of the given node.
+
+        :param index: The index of the node.
+        :type index: int
+        :return: The index of the parent node, or -1 for the root node.
+        :rtype: int
+        """
+        return self._parents[index]
+
+    def get_children(self, index: int) -> List[int]:
+        """Returns the children of the given node.
+
+        :param index: The index of the node.
+        :type index: int
+        :return: The indices of the children, in order.
+        :rtype: List[int]
+        """
+        children = []
+        child = self._first_children[index]
+        while child != -1:
+            children.append(child)
+            child = self._next_siblings[child]
+        return children
+
+    def get_attributes(self, index: int) -> Dict[str, str]:
+        """Returns a copy of the attributes of the given node.
+
+        :param index: The index of the node.
+        :type index: int
+        :return: The attributes of the node.
+        :rtype: Dict[str, str]
+        """
+        return dict(self.attribute_pool[self._attributes[index]])
+
+    def set_attributes(self, index: int, attributes: Dict[str, str]) -> None:
+        """Sets the attributes of the given node.
+
+        :param index: The index of the node.
+        :type index: int
+        :param attributes: The new attributes of the node.
+        :type attributes: Dict[str, str]
+        """
+        self._attributes[index] = self._intern(
+            tuple(attributes.items()), self.attribute_pool,
+            self._attribute_ids)
+
+    def get_style(self, index: int) -> Dict[str, str]:
+        """Returns a copy of the style of the given node.
+
+        :param index: The index of the node.
+        :type index: int
+        :return: The style of the node.
+        :rtype: Dict[str, str]
+        """
+        return dict(self.style_pool[self._styles[index]])
+
+    def set_style(self, index: int, style: Dict[str, str]) -> None:
+        """Sets the style of the given node.
+
+        :param index: The index of the node.
+        :type index: int
+        :param style: The new style of the node.
+        :type style: Dict[str, str]
+        """
+        self._styles[index] = self._intern(
+            tuple(style.items()), self.style_pool, self._style_ids)
+
+    def get_text(self, index: int) -> Union[str, None]:
+        """Returns the text of the given node.
+
+        :param index: The index of the node.
+        :type index: int
+        :return: The text of the node, or None if it is not a
+            :py:class:`RawText` node.
+        :rtype: Union[str, None]
+        """
+        text = self._texts[index]
+        return None if text == -1 else self.text_pool[text]
+
+    def get_styles(self) -> Dict[Tuple[int, int], Mapping[str, str]]:
+        """Returns a dictionary mapping every node of the arena to its style.
+
+        This method is the counterpart of :py:meth:`HTMLNode.get_styles`.
+        Nodes are identified by a tuple `(id(arena), index)`. Nodes sharing
+        the same style share the same read-only mapping.
+
+        :return: A dictionary mapping node keys to styles.
+        :rtype: Dict[Tuple[int, int], Mapping[str, str]]
+        """
+        styles = [_EMPTY_STYLE] + [MappingProxyType(dict(s))
+                                   for s in self.style_pool[1:]]
+        arena_id = id(self)
+        return {(arena_id, i): styles[s] for i, s in enumerate(self._styles)}
+
+    @classmethod
+    def from_node(cls, node: HTMLNode) -> 'HTMLArena':
+        """Creates an arena from the given tree.
+
+        :param node: The root of the tree.
+        :type node: HTMLNode
+        :return: A new arena representing the tree.
+        :rtype: HTMLArena
+        """
+        arena = cls()
+        stack = [(node, -1)]
+        while stack:
+            current, parent = stack.pop()
+            is_text = _get_tag_descriptor(type(current)).render_kind == \
+                _RAW or isinstance(current, (RawText, Style))
+            index = arena.add(type(current), parent=parent,
+                              attributes=current._attributes,
+                              style=current._style,
+                              text=current.text if is_text else None)
+            stack += ((c, index) for c in reversed(current._children or ()))
+        return arena
+
+    def to_node(self, index: int = 0) -> HTMLNode:
+        """Converts the given node and its descendants into a regular tree of
+        :py:class:`HTMLNode` objects.
+
+        Nodes are created without calling the `__init__` method of their
+        class, so only their children, attributes, style, and text are set.
+
+        :param index: The index of the root of the tree to convert. Defaults
+            to 0, the root of the arena.
+        :type index: int
+        :return: The root of the new tree.
+        :rtype: HTMLNode
+        """
+        root = None
+        stack = [(index, None)]
+        while stack:
+            current, parent = stack.pop()
+            node_cls = self.classes[self._tags[current]]
+            node = node_cls.__new__(node_cls)
+            HTMLNode.__init__(
+                node,
+                attributes=dict(self.attribute_pool[self._attributes[current]]),
+                style=dict(self.style_pool[self._styles[current]]))
+            text = self._texts[current]
+            if text != -1:
+                node.text = self.text_pool[text]
+            if parent is None:
+                root = node
+            else:
+                parent.children.append(node)
+            stack += ((c, node) for c in reversed(self.get_children(current)))
+        return root
+
+    def _get_tags(self, tag: int, attributes: int) -> Tuple[str, str]:
+        """Returns the start and end tags of nodes with the given class and
+        attributes.
+
+        Tags are computed once per pair of class and attributes by a
+        childless node of that class.
+
+        :param tag: The index of the class.
+        :type tag: int
+        :param attributes: The index of the attributes in the attribute pool.
+        :type attributes: int
+        :return: A tuple (start tag, end tag).
+        :rtype: Tuple[str, str]
+        """
+        tags = self._tag_cache.get((tag, attributes))
+        if tags is None:
+            tags = self._build_tags(tag, dict(self.attribute_pool[attributes]))
+            self._tag_cache[(tag, attributes)] = tags
+        return tags
+
+    def _get_tags_with_classes(self, tag: int, attributes: int,
+                               rules: List[Any],
+                               cache: Dict[Tuple[Any, ...], Tuple[str, str]],
+                               declarations: str = None
+                               ) -> Tuple[str, str]:
+        """Returns the start and end tags of nodes with the given class and
+        attributes, with the classes of the given rules added to their
+        `class` attribute and the given declarations added to their `style`
+        attribute.
+
+        The arena is not modified, so that it can be rendered with other
+        rules at the same time. Tags are cached in the given dictionary
+        instead.
+
+        :param tag: The index of the class.
+        :type tag: int
+        :param attributes: The index of the attributes in the attribute pool.
+        :type attributes: int
+        :param rules: The rules whose classes to add, as found in the mapping
+            of a :py:class:`CompiledCSS` object.
+        :type rules: List[ClassRule]
+        :param cache: A dictionary caching tags during a render.
+        :type cache: Dict[Tuple[Any, ...], Tuple[str, str]]
+        :param declarations: The inline declarations to add, as found in the
+            `inline` attribute of a :py:class:`CompiledCSS` object. Defaults
+            to None, which adds none.
+        :type declarations: str
+        :return: A tuple (start tag, end tag).
+        :rtype: Tuple[str, str]
+        """
+        names = tuple(r.name for r in rules)
+        key = (tag, attributes, names, declarations)
+        tags = cache.get(key)
+        if tags is None:
+            pairs = dict(self.attribute_pool[attributes])
+            if names:
+                pairs["class"] = _merge_classes(pairs.get("class"), names)
+            if declarations:
+                pairs["style"] = _merge_styles(pairs.get("style"),
+                                               declarations)
+            tags = self._build_tags(tag, pairs)
+            cache[key] = tags
+        return tags
+
+    def _build_tags(self, tag: int,
+                    attributes: Dict[str, str]) -> Tuple[str, str]:
+        """Builds the start and end tags of a node with the given class and
+        attributes.
+
+        :param tag: The index of the class.
+        :type tag: int
+        :param attributes: The attributes of the node.
+        :type attributes: Dict[str, str]
+        :return: A tuple (start tag, end tag).
+        :rtype: Tuple[str, str]
+        """
+        # Tags of classes that do not customize them are built directly
+        node_cls = self.classes[tag]
+        descriptor = _get_tag_descriptor(node_cls)
+        if descriptor.builds_start_tag and descriptor.end_tag is not None \
+                and node_cls.validate_attributes is \
+                HTMLNode.validate_attributes:
+            if "class" in attributes:
+                validate_html_class(attributes["class"])
+            return _build_start_tag(descriptor.name, attributes), \
+                descriptor.end_tag
+
+        # Other tags are built by a node of the class
+        node = node_cls.__new__(node_cls)
+        HTMLNode.__init__(node, attributes=attributes)
+        return node.start_tag, node.end_tag
+
+    def to_html(self, collapse_empty: bool = True, indent_size: int = 4,
+                indent_level: int = 0, force_one_line: bool = False,
+                return_lines: bool = False, minify: bool = False,
+                **kwargs: Any) -> Union[str, List[str]]:
+        """Converts the arena into HTML code.
+
+        The result is the same as that of :py:meth:`HTMLNode.to_html` called
+        on the equivalent tree of :py:class:`HTMLNode` objects.
+
+        :param collapse_empty: See :py:meth:`HTMLNode.to_html`.
+        :type collapse_empty: bool
+        :param indent_size: See :py:meth:`HTMLNode.to_html`.
+        :type indent_size: int
+        :param indent_level: See :py:meth:`HTMLNode.to_html`.
+        :type indent_level: int
+        :param force_one_line: See :py:meth:`HTMLNode.to_html`.
+        :type force_one_line: bool
+        :param return_lines: See :py:meth:`HTMLNode.to_html`.
+        :type return_lines: bool
+        :param minify: See :py:meth:`HTMLNode.to_html`.
+        :type minify: bool
+        :param kwargs: See :py:meth:`HTMLNode.to_html`.
+        :type kwargs: Any
+        :return: See :py:meth:`HTMLNode.to_html`.
+        :rtype: str or List[str]
+        """
+        # A root node with a custom `to_html` method is rendered by itself
+        if _get_tag_descriptor(self.get_class(0)).render_kind == _CUSTOM:
+            return self.to_node().to_html(
+                collapse_empty=collapse_empty, indent_size=indent_size,
+                indent_level=indent_level, force_one_line=force_one_line,
+                return_lines=return_lines, minify=minify, **kwargs)
+
+        if minify:
+            html = _render_minified_arena(self, kwargs)
+            return [html] if return_lines else html
+        pieces = _render_arena(self, collapse_empty, indent_size,
+                               indent_level, force_one_line, kwargs)
+        if self._renders_on_one_line(collapse_empty, force_one_line):
+            html = ''.join(pieces)
+            return [html] if return_lines else html
+        lines = list(pieces)
+        return lines if return_lines else '\n'.join(lines)
+
+    def iter_html(self, collapse_empty: bool = True, indent_size: int = 4,
+                  indent_level: int = 0, force_one_line: bool = False,
+                  minify: bool = False, **kwargs: Any) -> Iterator[str]:
+        """Converts the arena into HTML code, yielding the code in chunks as
+        it is being generated.
+
+        This method is the counterpart of :py:meth:`HTMLNode.iter_html`.
+
+        :param collapse_empty: See :py:meth:`HTMLNode.to_html`.
+        :type collapse_empty: bool
+        :param indent_size: See :py:meth:`HTMLNode.to_html`.
+        :type indent_size: int
+        :param indent_level: See :py:meth:`HTMLNode.to_html`.
+        :type indent_level: int
+        :param force_one_line: See :py:meth:`HTMLNode.to_html`.
+        :type force_one_line: bool
+        :param minify: See :py:meth:`HTMLNode.to_html`.
+        :type minify: bool
+        :param kwargs: See :py:meth:`HTMLNode.to_html`.
+        :type kwargs: Any
+        :return: An iterator over the chunks of HTML code.
+        :rtype: Iterator[str]
+        """
+        if _get_tag_descriptor(self.get_class(0)).render_kind == _CUSTOM:
+            yield from self.to_node().iter_html(
+                collapse_empty=collapse_empty, indent_size=indent_size,
+                indent_level=indent_level, force_one_line=force_one_line,
+                minify=minify, **kwargs)
+            return
+
+        # If the root renders on a single line, chunks are parts of that line
+        if minify:
+            force_one_line, indent_level = True, 0
+        pieces = _render_arena(self, collapse_empty, indent_size,
+                               indent_level, force_one_line, kwargs)
+        if self._renders_on_one_line(collapse_empty, force_one_line):
+            yield from pieces
+            return
+
+        # Otherwise, chunks are lines separated by line breaks
+        separator = ''
+        for line in pieces:
+            yield separator + line
+            separator = '\n'
+
+    def _renders_on_one_line(self, collapse_empty: bool,
+                             force_one_line: bool) -> bool:
+        """Returns whether the root node renders all of its content on a
+        single line when converted to HTML code with the given options.
+
+        :param collapse_empty: See :py:meth:`HTMLNode.to_html`.
+        :type collapse_empty: bool
+        :param force_one_line: See :py:meth:`HTMLNode.to_html`.
+        :type force_one_line: bool
+        :return: True if the root node renders on a single line, False
+            otherwise.
+        :rtype: bool
+        """
+        return _get_tag_descriptor(self.get_class(0)).one_line or \
+            force_one_line or (collapse_empty and
+                               self._first_children[0] == -1)
+
+
+def _render_arena(arena: HTMLArena, collapse_empty: bool, indent_size: int,
+                  indent_level: int, force_one_line: bool,
+                  kwargs: Dict[str, Any]) -> Iterator[str]:
+    """Renders the given arena into HTML code without recursion.
+
+    This function is the counterpart of the rendering engine of
+    :py:class:`HTMLNode` trees and yields the same lines or fragments of code.
+
+    :param arena: The arena to render. Its root node must not have a custom
+        `to_html` method.
+    :type arena: HTMLArena
+    :param collapse_empty: See :py:meth:`HTMLNode.to_html`.
+    :type collapse_empty: bool
+    :param indent_size: See :py:meth:`HTMLNode.to_html`.
+    :type indent_size: int
+    :param indent_level: See :py:meth:`HTMLNode.to_html`.
+    :type indent_level: int
+    :param force_one_line: See :py:meth:`HTMLNode.to_html`.
+    :type force_one_line: bool
+    :param kwargs: See :py:meth:`HTMLNode.to_html`.
+    :type kwargs: Dict[str, Any]
+    :return: An iterator over lines or fragments of HTML code.
+    :rtype: Iterator[str]
+    """
+    replace_all_entities = kwargs.get("replace_all_entities", False)
+    css = kwargs.get("css")
+    mapping = None if css is None else css.mapping
+    # Compact mappings are keyed by style, just like the style pool
+    keys = arena.style_pool if css is not None and css.compact else None
+    inline = None if css is None else css.inline
+    tag_cache = {}  # Tags with classes, computed once per render
+    indentations = {}  # Indentation strings, computed once per level
+    descriptors = [_get_tag_descriptor(c) for c in arena.classes]
+    tags, texts, attributes = arena._tags, arena._texts, arena._attributes
+    styles = arena._styles
+    first_children, next_siblings = arena._first_children, \
+        arena._next_siblings
+
+    # A root node rendering on one line has no line to trim, and its content
+    # is only indented if it is raw text or if the line is not forced
+    multi_line = not arena._renders_on_one_line(collapse_empty,
+                                                force_one_line)
+    if multi_line:
+        stack = [(_LINES, 0, indent_level)]
+    else:
+        stack = [(_INLINE, 0, indent_level if descriptors[tags[0]]
+                  .render_kind == _RAW or not force_one_line else 0)]
+
+    line = []  # Fragments of the line currently being written
+    while stack:
+        operation, item, level = stack.pop()
+
+        # Fragments of code are added as is to the current line
+        if operation == _FRAGMENT:
+            line.append(item)
+            continue
+
+        # Any other operation in multi-line mode that does not happen within
+        # the current line starts a new line, so we yield the current one
+        # unless it is empty
+        if multi_line and operation != _INLINE:
+            text = ''.join(line)
+            if text.strip(' '):
+                yield text
+            line = []
+
+        # Retrieving the indentation
+        indentation = indentations.get(level)
+        if indentation is None:
+            indentation = get_indentation(level, indent_size)
+            indentations[level] = indentation
+
+        # A new line starts with the given fragment
+        if operation == _NEW_LINE:
+            line += (indentation, item)
+            continue
+
+        # Otherwise, we render the node based on its kind
+        index = item
+        descriptor = descriptors[tags[index]]
+        kind = descriptor.render_kind
+        if kind == _RAW:
+            line += (indentation, sanitize_html_text(
+                arena.text_pool[texts[index]],
+                replace_all_entities=replace_all_entities))
+        elif kind == _CUSTOM:
+            node = arena.to_node(index)
+            if operation == _INLINE:
+                line += node.to_html(indent_level=0, force_one_line=True,
+                                     return_lines=True,
+                                     collapse_empty=collapse_empty, **kwargs)
+            else:
+                stack += ((_NEW_LINE, l, -1) for l in reversed(
+                    node.to_html(collapse_empty=collapse_empty,
+                                 indent_size=indent_size, indent_level=level,
+                                 return_lines=True, **kwargs)))
+        else:
+            children = []
+            child = first_children[index]
+            while child != -1:
+                children.append(child)
+                child = next_siblings[child]
+
+            # Root nodes act as an array of elements, one level up
+            if kind == _ROOT:
+                level -= 1
+                indentation = get_indentation(level, indent_size)
+
+            # Opening the element and pushing its closing tag and its children
+            # (in reverse order, as the stack is last in, first out)
+            rules = declarations = None
+            if mapping and styles[index]:
+                key = (id(arena), index) if keys is None \
+                    else keys[styles[index]]
+                rules = mapping.get(key)
+                declarations = inline.get(key) if inline else None
+            if rules or declarations:
+                start_tag, end_tag = arena._get_tags_with_classes(
+                    tags[index], attributes[index], rules or (), tag_cache,
+                    declarations)
+            else:
+                start_tag, end_tag = arena._get_tags(tags[index],
+                                                     attributes[index])
+            line += (indentation, start_tag)
+            if operation == _INLINE or descriptor.one_line or (
+                    collapse_empty and not children):
+                stack.append((_FRAGMENT, end_tag, 0))
+                stack += ((_INLINE, c, 0) for c in reversed(children))
+            else:
+                stack.append((_NEW_LINE, end_tag, level))
+                stack += ((_LINES, c, level + 1) for c in reversed(children))
+
+        # In single-line mode, fragments are yielded as soon as possible
+        if not multi_line and line:
+            yield ''.join(line)
+            line = []
+
+    # Yielding the last line, which is only trimmed in multi-line mode
+    text = ''.join(line)
+    if text.strip(' ') or (text and not multi_line):
+        yield text
+
+
+def _render_minified_arena(arena: HTMLArena, kwargs: Dict[str, Any]) -> str:
+    """Renders the given arena into minified HTML code without recursion.
+
+    This function is the counterpart of the minified rendering of
+    :py:class:`HTMLNode` trees.
+
+    :param arena: The arena to render. Its root node must not have a custom
+        `to_html` method.
+    :type arena: HTMLArena
+    :param kwargs: See :py:meth:`HTMLNode.to_html`.
+    :type kwargs: Dict[str, Any]
+    :return: The minified HTML code.
+    :rtype: str
+    """
+    replace_all_entities = kwargs.get("replace_all_entities", False)
+    css = kwargs.get("css")
+    mapping = None if css is None else css.mapping
+    # Compact mappings are keyed by style, just like the style pool
+    keys = arena.style_pool if css is not None and css.compact else None
+    inline = None if css is None else css.inline
+    tag_cache = {}  # Tags with classes, computed once per render
+    kinds = [_get_tag_descriptor(c).render_kind for c in arena.classes]
+    tags, texts, attributes = arena._tags, arena._texts, arena._attributes
+    styles = arena._styles
+    first_children, next_siblings = arena._first_children, \
+        arena._next_siblings
+    buffer = []
+
+    # The stack holds node indices to render and end tags to write
+    stack = [0]
+    while stack:
+        item = stack.pop()
+        if type(item) is str:
+            buffer.append(item)
+            continue
+        kind = kinds[tags[item]]
+        if kind == _RAW:
+            buffer.append(sanitize_html_text(
+                arena.text_pool[texts[item]],
+                replace_all_entities=replace_all_entities))
+        elif kind == _CUSTOM:
+            buffer += arena.to_node(item).to_html(
+                indent_level=0, force_one_line=True, return_lines=True,
+                **kwargs)
+        else:
+            rules = declarations = None
+            if mapping and styles[item]:
+                key = (id(arena), item) if keys is None \
+                    else keys[styles[item]]
+                rules = mapping.get(key)
+                declarations = inline.get(key) if inline else None
+            if rules or declarations:
+                start_tag, end_tag = arena._get_tags_with_classes(
+                    tags[item], attributes[item], rules or (), tag_cache,
+                    declarations)
+            else:
+                start_tag, end_tag = arena._get_tags(tags[item],
+                                                     attributes[item])
+            buffer.append(start_tag)
+            stack.append(end_tag)
+            position = len(stack)
+            child = first_children[item]
+            while child != -1:
+                stack.append(child)
+                child = next_siblings[child]
+            stack[position:] = stack[:position - 1:-1]
+    return ''.join(buffer)
@@ -0,0 +1,182 @@
+# =======================================================================
+#
+#  This file is part of WebWidgets, a Python package for designing web
+#  UIs.
+#
+#  You should have received a copy of the MIT License along with
+#  WebWidgets. If not, see <https://opensource.org/license/mit>.
+#
+#  Copyright(C) 2025, mlaasri
+#
+# =======================================================================
+
+from typing import Any, Tuple
+import weakref
+
+
+class _Tracked:
+    """A mixin for containers that notify the HTML nodes owning them whenever
+    their content changes.
+
+    Owners are held through weak references and are notified by a call to
+    their `_on_change()` method with the container as argument.
+    """
+
+    __slots__ = ()
+
+    def add_owner(self, owner: Any) -> None:
+        """Registers an owner to notify when the container changes.
+
+        :param owner: The owner to register.
+        :type owner: Any
+        """
+        self._owners += (weakref.ref(owner),)
+
+    def remove_owner(self, owner: Any) -> None:
+        """Unregisters an owner of the container.
+
+        :param owner: The owner to unregister.
+        :type owner: Any
+        """
+        self._owners = tuple(r for r in self._owners if r() is not owner)
+
+    def _notify(self) -> None:
+        """Notifies all owners that the container has changed."""
+        for reference in self._owners:
+            owner = reference()
+            if owner is not None:
+                owner._on_change(self)
+
+
+class TrackedDict(_Tracked, dict):
+    """A dictionary that notifies the HTML nodes owning it whenever its
+    content changes.
+
+    Copying or pickling a :py:class:`TrackedDict` produces a regular
+    dictionary.
+    """
+
+    __slots__ = ("_owners",)
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        """Creates a new dictionary without any owner.
+
+        :param args: Arguments to pass to the `dict` constructor.
+        :type args: Any
+        :param kwargs: Keyword arguments to pass to the `dict` constructor.
+        :type kwargs: Any
+        """
+        super().__init__(*args, **kwargs)
+        self._owners: Tuple[weakref.ref, ...] = ()
+
+    def __reduce__(self):
+        return dict, (dict(self),)
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._notify()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._notify()
+
+    def __ior__(self, other):
+        result = super().__ior__(other)
+        self._notify()
+        return result
+
+    def clear(self):
+        super().clear()
+        self._notify()
+
+    def pop(self, *args):
+        result = super().pop(*args)
+        self._notify()
+        return result
+
+    def popitem(self):
+        result = super().popitem()
+        self._notify()
+        return result
+
+    def setdefault(self, key, default=None):
+        result = super().setdefault(key, default)
+        self._notify()
+        return result
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._notify()
+
+
+class TrackedList(_Tracked, list):
+    """A list that notifies the HTML nodes owning it whenever its content
+    changes.
+
+    Copying or pickling a :py:class:`TrackedList` produces a regular list.
+    """
+
+    __slots__ = ("_owners",)
+
+    def __init__(self, *args: Any):
+        """Creates a new list without any owner.
+
+        :param args: Arguments to pass to the `list` constructor.
+        :type args: Any
+        """
+        super().__init__(*args)
+        self._owners: Tuple[weakref.ref, ...] = ()
+
+    def __reduce__(self):
+        return list, (list(self),)
+
+    def __setitem__(self, index, value):
+        super().__setitem__(index, value)
+        self._notify()
+
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        self._notify()
+
+    def __iadd__(self, other):
+        result = super().__iadd__(other)
+        self._notify()
+        return result
+
+    def __imul__(self, n):
+        result = super().__imul__(n)
+        self._notify()
+        return result
+
+    def append(self, item):
+        super().append(item)
+        self._notify()
+
+    def clear(self):
+        super().clear()
+        self._notify()
+
+    def extend(self, items):
+        super().extend(items)
+        self._notify()
+
+    def insert(self, index, item):
+        super().insert(index, item)
+        self._notify()
+
+    def pop(self, *args):
+        result = super().pop(*args)
+        self._notify()
+        return result
+
+    def remove(self, item):
+        super().remove(item)
+        self._notify()
+
+    def reverse(self):
+        super().reverse()
+        self._notify()
+
+    def sort(self, *args, **kwargs):
+        super().sort(*args, **kwargs)
+        self._notify()
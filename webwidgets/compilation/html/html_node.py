@@ -11,12 +11,27 @@
 # =======================================================================
 
 import copy
-import itertools
-from typing import Any, Dict, List, Union
+from dataclasses import dataclass
+from .html_containers import _Tracked, TrackedDict, TrackedList
+from types import MappingProxyType
+from typing import Any, AsyncIterator, Dict, Iterator, List, Sequence, \
+    Set, TextIO, Tuple, TYPE_CHECKING, Union
+import weakref
 from webwidgets.utility.indentation import get_indentation
-from webwidgets.utility.representation import ReprMixin
+from webwidgets.utility.representation import get_variables, ReprMixin
 from webwidgets.utility.sanitizing import sanitize_html_text
-from webwidgets.utility.validation import validate_html_class
+from webwidgets.utility.streaming import aiter_chunks
+from webwidgets.utility.validation import validate_css_identifier, \
+    validate_html_class
+
+# The CSS compiler depends on this module, so it is only imported for type
+# checking
+if TYPE_CHECKING:
+    from webwidgets.compilation.css import CompiledCSS
+
+
+# Style returned for nodes whose style has never been allocated
+_EMPTY_STYLE = MappingProxyType({})
 
 
 class HTMLNode(ReprMixin):
@@ -25,6 +40,14 @@ class HTMLNode(ReprMixin):
 
     one_line: bool = False
 
+    # Nodes are slotted to save memory. Containers are only allocated when
+    # accessed through their properties, so they are None for most leaves.
+    __slots__ = ("_children", "_attributes", "_style", "_start_tag",
+                 "_html_cache", "_parents", "__weakref__")
+
+    # Internal render caches, which are not part of the node's representation
+    _repr_exclude = ("_start_tag", "_html_cache", "_parents")
+
     def __init__(self, children: List['HTMLNode'] = None,
                  attributes: Dict[str, str] = None, style: Dict[str, str] = None):
         """Creates an HTMLNode with optional children, attributes, and style.
@@ -37,9 +60,205 @@ class HTMLNode(ReprMixin):
         :type style: Dict[str, str]
         """
         super().__init__()
-        self.children = [] if children is None else children
-        self.attributes = {} if attributes is None else attributes
-        self.style = {} if style is None else style
+        self._start_tag = None  # Cached start tag, built on first access
+        self._html_cache = None  # Cached HTML code, filled by cached renders
+        self._parents = None  # Parents to invalidate, set by cached renders
+        # A new node has no cache to invalidate, so containers are stored
+        # directly. Containers given by the caller are stored as is, so the
+        # caller can keep modifying them.
+        reference = weakref.ref(self)
+        self._children = _track(children, TrackedList, reference)
+        self._attributes = _track(attributes, TrackedDict, reference)
+        self._style = _track(style, TrackedDict, reference)
+
+    def __copy__(self) -> 'HTMLNode':
+        """Returns a shallow copy of the node.
+
+        Shallow copies share their containers with the original node, so any
+        container that has not been allocated yet is allocated first.
+
+        :return: A shallow copy of the node.
+        :rtype: HTMLNode
+        """
+        self._get_container("_children", TrackedList)
+        self._get_container("_attributes", TrackedDict)
+        self._get_container("_style", TrackedDict)
+        other = self.__class__.__new__(self.__class__)
+        other.__setstate__(self.__getstate__())
+        return other
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """Returns the state of the node for copying or pickling it.
+
+        Render caches and references to parents are not part of the state.
+
+        :return: The state of the node.
+        :rtype: Dict[str, Any]
+        """
+        return dict(get_variables(self), _html_cache=None, _parents=None)
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """Restores the state of the node after copying or unpickling it.
+
+        Shallow copies share the tracked containers of the original node, so
+        the copy is registered here as one of their owners. Deep copies and
+        pickled nodes hold regular containers, which are stored as is.
+
+        :param state: The state of the node.
+        :type state: Dict[str, Any]
+        """
+        for name, value in state.items():
+            setattr(self, name, value)
+        for name, tracked_type in (("_children", TrackedList),
+                                   ("_attributes", TrackedDict),
+                                   ("_style", TrackedDict)):
+            value = state.get(name)
+            setattr(self, name, None)
+            self._set_container(name, value, tracked_type)
+
+    @property
+    def children(self) -> List['HTMLNode']:
+        """Returns the children of the HTML node.
+
+        Children allocated by the node are stored in a :py:class:`TrackedList`
+        that notifies the node when it is modified, so the node can invalidate
+        its render caches. The list is only allocated when first accessed. A
+        list given by the caller is returned as is (see
+        :py:meth:`HTMLNode.to_html` for its effect on caching).
+
+        :return: The children of the HTML node.
+        :rtype: List[HTMLNode]
+        """
+        return self._get_container("_children", TrackedList)
+
+    @children.setter
+    def children(self, value: List['HTMLNode']) -> None:
+        """Sets the children of the HTML node.
+
+        :param value: The new children. The list is stored as is, without
+            being copied.
+        :type value: List[HTMLNode]
+        """
+        self._set_container("_children", value, TrackedList)
+
+    @property
+    def attributes(self) -> Dict[str, str]:
+        """Returns the attributes of the HTML node.
+
+        Attributes allocated by the node are stored in a
+        :py:class:`TrackedDict` that notifies the node when it is modified, so
+        the node can invalidate its cached start tag and render caches. The
+        dictionary is only allocated when first accessed. A dictionary given by
+        the caller is returned as is.
+
+        :return: The attributes of the HTML node.
+        :rtype: Dict[str, str]
+        """
+        return self._get_container("_attributes", TrackedDict)
+
+    @attributes.setter
+    def attributes(self, value: Dict[str, str]) -> None:
+        """Sets the attributes of the HTML node.
+
+        :param value: The new attributes. The dictionary is stored as is,
+            without being copied.
+        :type value: Dict[str, str]
+        """
+        self._set_container("_attributes", value, TrackedDict)
+
+    @property
+    def style(self) -> Dict[str, str]:
+        """Returns the style of the HTML node.
+
+        A style allocated by the node is stored in a :py:class:`TrackedDict`
+        that notifies the node when it is modified, so the node can invalidate
+        its render caches. The dictionary is only allocated when first
+        accessed. A dictionary given by the caller is returned as is.
+
+        :return: The style of the HTML node.
+        :rtype: Dict[str, str]
+        """
+        return self._get_container("_style", TrackedDict)
+
+    @style.setter
+    def style(self, value: Dict[str, str]) -> None:
+        """Sets the style of the HTML node.
+
+        :param value: The new style. The dictionary is stored as is,
+            without being copied.
+        :type value: Dict[str, str]
+        """
+        self._set_container("_style", value, TrackedDict)
+
+    def _get_container(self, name: str, tracked_type: type) -> Any:
+        """Returns the container stored in the given variable, allocating an
+        empty tracked container owned by the node if there is none yet.
+
+        :param name: The name of the variable holding the container.
+        :type name: str
+        :param tracked_type: The type of tracked container to use, either
+            :py:class:`TrackedList` or :py:class:`TrackedDict`.
+        :type tracked_type: type
+        :return: The container.
+        :rtype: Any
+        """
+        container = getattr(self, name)
+        if container is None:
+            container = tracked_type()
+            container.add_owner(self)
+            setattr(self, name, container)
+        return container
+
+    def _set_container(self, name: str, value: Any, tracked_type: type) -> None:
+        """Stores the given container in the given variable, registering the
+        node as one of its owners if it is a tracked container.
+
+        Regular containers are stored as is, so the caller can keep modifying
+        them.
+
+        :param name: The name of the variable holding the container.
+        :type name: str
+        :param value: The container to store, or None for an empty container.
+        :type value: Any
+        :param tracked_type: The type of tracked container to use, either
+            :py:class:`TrackedList` or :py:class:`TrackedDict`.
+        :type tracked_type: type
+        """
+        previous = getattr(self, name)
+        if isinstance(previous, _Tracked):
+            previous.remove_owner(self)
+        value = _track(value, tracked_type, weakref.ref(self))
+        setattr(self, name, value)
+        self._on_change(value)
+
+    def _on_change(self, container: Any) -> None:
+        """Invalidates the caches of the node after one of its containers has
+        changed.
+
+        :param container: The container that has changed.
+        :type container: Any
+        """
+        if container is None or container is self._attributes:
+            self._start_tag = None
+        self._invalidate()
+
+    def _invalidate(self) -> None:
+        """Marks the node and its ancestors as dirty by clearing their render
+        caches.
+
+        Ancestors are only known to the node if they have been rendered with
+        `cache=True` (see :py:meth:`HTMLNode.to_html`). The walk stops at
+        ancestors that have no render cache, since their own ancestors cannot
+        have cached their HTML code either.
+        """
+        nodes = [self]
+        while nodes:
+            node = nodes.pop()
+            node._html_cache = None
+            for reference in node._parents or ():
+                parent = reference()
+                if parent is not None and parent._html_cache:
+                    nodes.append(parent)
 
     def _get_tag_name(self) -> str:
         """Returns the tag name of the HTML node.
@@ -60,7 +279,7 @@ class HTMLNode(ReprMixin):
         :rtype: str
         """
         return ' '.join(
-            f'{k}="{v}"' for k, v in sorted(self.attributes.items())
+            f'{k}="{v}"' for k, v in sorted((self._attributes or {}).items())
         )
 
     @property
@@ -70,25 +289,39 @@ class HTMLNode(ReprMixin):
         :return: A string containing the closing tag of the element.
         :rtype: str
         """
-        return f"</{self._get_tag_name()}>"
+        end_tag = _get_tag_descriptor(type(self)).end_tag
+        return f"</{self._get_tag_name()}>" if end_tag is None else end_tag
 
     @property
     def start_tag(self) -> str:
         """Returns the opening tag of the HTML node, including any attributes.
 
         Attributes are validated with :py:meth:`HTMLNode.validate_attributes`
-        before rendering.
+        before rendering. The start tag is then cached until the attributes
+        change, unless they are held in a regular dictionary whose changes
+        cannot be detected, or unless the class overrides the
+        `_get_tag_name` or `_render_attributes` method, whose results may
+        depend on other variables of the node.
 
         :return: A string containing the opening tag of the element with its attributes.
         :rtype: str
         """
+        # Returning the cached start tag if any
+        if self._start_tag is not None:
+            return self._start_tag
+
         # Rendering attributes
         self.validate_attributes()
         attributes = self._render_attributes()
         maybe_space = ' ' if attributes else ''
 
-        # Building start tag
-        return f"<{self._get_tag_name()}{maybe_space}{attributes}>"
+        # Building start tag, which is only cached if it only depends on the
+        # attributes and if changes to the attributes are tracked
+        start_tag = f"<{self._get_tag_name()}{maybe_space}{attributes}>"
+        if _get_tag_descriptor(type(self)).builds_start_tag \
+                and _is_tracked(self._attributes):
+            self._start_tag = start_tag
+        return start_tag
 
     def add(self, child: 'HTMLNode') -> None:
         """Adds a child to the HTML node.
@@ -118,22 +351,35 @@ class HTMLNode(ReprMixin):
         recursively, to their style.
 
         Nodes are identified by their ID as obtained from Python's built-in
-        `id()` function.
+        `id()` function. Nodes whose style has never been set or accessed are
+        mapped to an empty read-only mapping.
 
         :return: A dictionary mapping node IDs to styles.
         :rtype: Dict[int, Dict[str, str]]
         """
-        styles = {id(self): self.style}
-        for child in self.children:
-            styles.update(child.get_styles())
+        # Walking the tree in document order without recursion
+        styles = {}
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            style = node._style
+            styles[id(node)] = _EMPTY_STYLE if style is None else style
+            children = node._children
+            if children:
+                stack += reversed(children)
         return styles
 
     def to_html(self, collapse_empty: bool = True,
                 indent_size: int = 4, indent_level: int = 0,
                 force_one_line: bool = False, return_lines: bool = False,
+                cache: bool = False, minify: bool = False,
+                css: 'CompiledCSS' = None,
                 **kwargs: Any) -> Union[str, List[str]]:
         """Converts the HTML node into HTML code.
 
+        The tree is rendered iteratively, visiting each node exactly once, so
+        its depth is not limited by Python's recursion limit.
+
         :param collapse_empty: If True, collapses elements without any children
             into a single line. Defaults to True.
         :type collapse_empty: bool
@@ -153,6 +399,32 @@ class HTMLNode(ReprMixin):
         :type force_one_line: bool
         :param return_lines: Whether to return the lines of HTML code individually. Defaults to False.
         :type return_lines: bool
+        :param cache: If True, the HTML code of each subtree is kept in memory
+            and reused by subsequent renders with the same arguments until the
+            subtree changes. Changes are detected when children, attributes,
+            style, or text are modified in place or reassigned. Changes to
+            regular containers given by the caller, rather than allocated by
+            the node or given as :py:class:`TrackedList` or
+            :py:class:`TrackedDict`, are detected by comparing their content
+            with a snapshot each time the cache is reused, which costs a pass
+            over these containers. Subtrees containing nodes that override
+            `to_html` are not cached. Defaults to False.
+        :type cache: bool
+        :param minify: If True, renders the node without any indentation or
+            line break, ignoring `indent_size`, `indent_level`, and
+            `force_one_line`. The result is the same as with
+            `force_one_line=True` and `indent_level=0` but is produced by a
+            faster renderer. Defaults to False.
+        :type minify: bool
+        :param css: Compiled CSS whose classes to add to the nodes of the tree
+            while their start tags are written, as :py:func:`apply_css` would,
+            but without modifying the tree. The tree can then be rendered
+            again, with other CSS or from several threads at once. Classes
+            are only added to nodes whose start tag is built from their
+            attributes. With `cache`, renders with different CSS objects are
+            cached separately, so the CSS must not be modified once it has
+            been used. Defaults to None, which renders the tree as is.
+        :type css: CompiledCSS
         :param **kwargs: Additional keyword arguments to pass down to child elements.
         :type **kwargs: Any
         :return: A string containing the HTML representation of the element if
@@ -160,48 +432,193 @@ class HTMLNode(ReprMixin):
             from that HTML code if `return_lines` is `True`.
         :rtype: str or List[str]
         """
-        # Opening the element
-        indentation = "" if force_one_line else get_indentation(
-            indent_level, indent_size)
-        html_lines = [indentation + self.start_tag]
-
-        # If content must be in one line
-        if self.one_line or force_one_line or (collapse_empty
-                                               and not self.children):
-            html_lines += list(itertools.chain.from_iterable(
-                [c.to_html(collapse_empty=collapse_empty,
-                           indent_level=0, force_one_line=True, return_lines=True,
-                           **kwargs)
-                 for c in self.children]))
-            html_lines += [self.end_tag]
-            html_lines = [''.join(html_lines)]  # Flattening the line
-
-        # If content spans multi-line
-        else:
-            html_lines += list(itertools.chain.from_iterable(
-                [c.to_html(collapse_empty=collapse_empty,
-                           indent_size=indent_size,
-                           indent_level=indent_level + 1,
-                           return_lines=True,
-                           **kwargs)
-                 for c in self.children]))
-            html_lines += [indentation + self.end_tag]
-            html_lines = [l for l in html_lines if any(
-                c != ' ' for c in l)]  # Trimming empty lines
-
-        # If return_lines is True, return a list of lines
-        if return_lines:
-            return html_lines
-
-        # Otherwise, return a single string
-        return '\n'.join(html_lines)
+        if css is not None:
+            kwargs["css"] = css
+        return _to_html(self, _NODE, collapse_empty=collapse_empty,
+                        indent_size=indent_size, indent_level=indent_level,
+                        force_one_line=force_one_line,
+                        return_lines=return_lines, cache=cache,
+                        minify=minify, **kwargs)
+
+    def iter_html(self, collapse_empty: bool = True,
+                  indent_size: int = 4, indent_level: int = 0,
+                  force_one_line: bool = False, cache: bool = False,
+                  minify: bool = False, css: 'CompiledCSS' = None,
+                  **kwargs: Any) -> Iterator[str]:
+        """Converts the HTML node into HTML code, yielding the code in chunks
+        as it is being generated.
+
+        Chunks are yielded in document order and their concatenation is
+        exactly the string returned by :py:meth:`HTMLNode.to_html` when called
+        with the same arguments. Unlike :py:meth:`HTMLNode.to_html`, however,
+        this method never holds the entire document in memory, which makes it
+        suitable for very large trees.
+
+        :param collapse_empty: See :py:meth:`HTMLNode.to_html`.
+        :type collapse_empty: bool
+        :param indent_size: See :py:meth:`HTMLNode.to_html`.
+        :type indent_size: int
+        :param indent_level: See :py:meth:`HTMLNode.to_html`.
+        :type indent_level: int
+        :param force_one_line: See :py:meth:`HTMLNode.to_html`.
+        :type force_one_line: bool
+        :param cache: See :py:meth:`HTMLNode.to_html`. When True, the first
+            chunk is only yielded once the entire tree has been rendered.
+        :type cache: bool
+        :param minify: See :py:meth:`HTMLNode.to_html`. Minified code is
+            streamed in fragments of its single line.
+        :type minify: bool
+        :param css: See :py:meth:`HTMLNode.to_html`.
+        :type css: CompiledCSS
+        :param kwargs: See :py:meth:`HTMLNode.to_html`.
+        :type kwargs: Any
+        :return: An iterator over the chunks of HTML code.
+        :rtype: Iterator[str]
+        """
+        if css is not None:
+            kwargs["css"] = css
+
+        # Nodes that override `to_html` cannot be streamed any further
+        kind = _get_tag_descriptor(type(self)).render_kind
+        if kind == _CUSTOM:
+            yield self.to_html(collapse_empty=collapse_empty,
+                               indent_size=indent_size,
+                               indent_level=indent_level,
+                               force_one_line=force_one_line, cache=cache,
+                               minify=minify, **kwargs)
+            return
+
+        # Minified code is a single line without indentation
+        if minify:
+            force_one_line, indent_level = True, 0
+
+        # If the node renders on a single line, chunks are parts of that line
+        pieces = _render_html(self, kind, collapse_empty, indent_size,
+                              indent_level, force_one_line, cache, kwargs)
+        if _renders_on_one_line(self, collapse_empty, force_one_line):
+            yield from pieces
+            return
+
+        # Otherwise, chunks are lines separated by line breaks
+        separator = ''
+        for line in pieces:
+            yield separator + line
+            separator = '\n'
+
+    def write_html(self, file: TextIO, **kwargs: Any) -> None:
+        """Converts the HTML node into HTML code and writes it to the given
+        file-like object.
+
+        The code is written chunk by chunk as it is generated by
+        :py:meth:`HTMLNode.iter_html`, so the document is never held entirely
+        in memory.
+
+        :param file: A file-like object opened in text mode, for example the
+            result of `open("index.html", "w")` or an `io.StringIO` object.
+        :type file: TextIO
+        :param kwargs: Keyword arguments to pass to
+            :py:meth:`HTMLNode.iter_html`.
+        :type kwargs: Any
+        """
+        for chunk in self.iter_html(**kwargs):
+            file.write(chunk)
+
+    def aiter_html(self, chunk_size: int = 65536, encoding: str = "utf-8",
+                   **kwargs: Any) -> AsyncIterator[bytes]:
+        """Converts the HTML node into HTML code, yielding the encoded code
+        asynchronously in chunks of bytes as it is being generated.
+
+        The code is generated lazily by :py:meth:`HTMLNode.iter_html` and
+        control is given back to the event loop after each chunk, so that
+        rendering a very large tree does not block other tasks. This makes it
+        suitable for streaming pages from an asynchronous web server.
+
+        :param chunk_size: See :py:func:`aiter_chunks`.
+        :type chunk_size: int
+        :param encoding: See :py:func:`aiter_chunks`.
+        :type encoding: str
+        :param kwargs: Keyword arguments to pass to
+            :py:meth:`HTMLNode.iter_html`.
+        :type kwargs: Any
+        :return: An asynchronous iterator over the chunks of encoded HTML
+            code.
+        :rtype: AsyncIterator[bytes]
+        """
+        return aiter_chunks(self.iter_html(**kwargs), chunk_size=chunk_size,
+                            encoding=encoding)
 
     def validate_attributes(self) -> None:
         """Validate the node's attributes and raises an exception with a
         descriptive error message if any attribute is invalid.
         """
-        if "class" in self.attributes:
-            validate_html_class(self.attributes["class"])
+        attributes = self._attributes
+        if attributes and "class" in attributes:
+            validate_html_class(attributes["class"])
+
+
+def _track(value: Any, tracked_type: type, reference: weakref.ref) -> Any:
+    """Registers the given node as an owner of the given container if it is a
+    tracked container, and returns the container.
+
+    Regular containers are returned as is rather than copied, so the caller
+    keeps sharing them with the node.
+
+    :param value: The container, or None for an empty container.
+    :type value: Any
+    :param tracked_type: The type of tracked container the node allocates,
+        either :py:class:`TrackedList` or :py:class:`TrackedDict`.
+    :type tracked_type: type
+    :param reference: A weak reference to the node owning the container.
+    :type reference: weakref.ref
+    :return: The container.
+    :rtype: Any
+    """
+    if isinstance(value, tracked_type):
+        value._owners += (reference,)
+    return value
+
+
+def _snapshot(node: HTMLNode) -> Tuple[Any, Any, Any]:
+    """Returns a snapshot of the containers of the given node whose changes
+    are not tracked, to compare with a later snapshot.
+
+    :param node: The node.
+    :type node: HTMLNode
+    :return: A tuple (children, attributes, style) where each tracked
+        container is replaced by None and each other container by a tuple of
+        its content.
+    :rtype: Tuple[Any, Any, Any]
+    """
+    children, attributes, style = node._children, node._attributes, \
+        node._style
+    return (None if _is_tracked(children) else tuple(children),
+            None if _is_tracked(attributes) else tuple(attributes.items()),
+            None if _is_tracked(style) else tuple(style.items()))
+
+
+def _is_tracked(container: Any) -> bool:
+    """Returns whether the changes to the given container of a node are
+    detected by the node.
+
+    :param container: The container, or None if the node has not allocated
+        it yet.
+    :type container: Any
+    :return: True if the container is None or tracked, False otherwise.
+    :rtype: bool
+    """
+    return container is None or isinstance(container, _Tracked)
+
+
+# Tag descriptor of each node class, computed once per class and cleared by
+# the decorators that modify class-level tag facts
+_TAG_DESCRIPTORS = {}
+
+
+# Properties shared by all classes without a start tag or an end tag
+_NO_START_TAG = property(
+    lambda _: '', doc="This element does not have a start tag")
+_NO_END_TAG = property(
+    lambda _: '', doc="This element does not have an end tag")
 
 
 def no_start_tag(cls):
@@ -210,8 +627,8 @@ def no_start_tag(cls):
     :param cls: A subclass of HTMLNode whose start tag should be removed.
     :return: The given class with an empty start tag.
     """
-    cls.start_tag = property(
-        lambda _: '', doc="This element does not have a start tag")
+    cls.start_tag = _NO_START_TAG
+    _TAG_DESCRIPTORS.clear()
     return cls
 
 
@@ -221,8 +638,8 @@ def no_end_tag(cls):
     :param cls: A subclass of HTMLNode whose end tag should be removed.
     :return: The given class with an empty end tag.
     """
-    cls.end_tag = property(
-        lambda _: '', doc="This element does not have an end tag")
+    cls.end_tag = _NO_END_TAG
+    _TAG_DESCRIPTORS.clear()
     return cls
 
 
@@ -233,6 +650,7 @@ def one_line(cls):
     :return: The given class with the `one_line` attribute set to True.
     """
     cls.one_line = True
+    _TAG_DESCRIPTORS.clear()
     return cls
 
 
@@ -242,6 +660,8 @@ def one_line(cls):
 class RawText(HTMLNode):
     """A raw text node that contains text without any HTML tags."""
 
+    __slots__ = ("_text",)
+
     def __init__(self, text: str):
         """Creates a raw text node.
 
@@ -252,9 +672,29 @@ class RawText(HTMLNode):
         super().__init__()
         self.text = text
 
+    @property
+    def text(self) -> str:
+        """Returns the text content of the node.
+
+        :return: The text content of the node.
+        :rtype: str
+        """
+        return self._text
+
+    @text.setter
+    def text(self, value: str) -> None:
+        """Sets the text content of the node and invalidates the render caches
+        of its ancestors.
+
+        :param value: The new text content of the node.
+        :type value: str
+        """
+        self._text = value
+        self._invalidate()
+
     def to_html(self, indent_size: int = 4, indent_level: int = 0,
                 return_lines: bool = False, replace_all_entities: bool = False,
-                **kwargs: Any) -> Union[str, List[str]]:
+                minify: bool = False, **kwargs: Any) -> Union[str, List[str]]:
         """Converts the raw text node to HTML.
 
         The text is sanitized by the :py:func:`sanitize_html_text` function before
@@ -268,17 +708,17 @@ class RawText(HTMLNode):
         :type return_lines: bool
         :param replace_all_entities: See :py:func:`sanitize_html_text`.
         :type replace_all_entities: bool
+        :param minify: See :py:meth:`HTMLNode.to_html`.
+        :type minify: bool
         :param kwargs: Other keyword arguments. These are ignored.
         :type kwargs: Any
         :return: See :py:meth:`HTMLNode.to_html`.
         :rtype: str or List[str]
         """
-        sanitized = sanitize_html_text(
-            self.text, replace_all_entities=replace_all_entities)
-        line = get_indentation(indent_level, indent_size) + sanitized
-        if return_lines:
-            return [line]
-        return line
+        return _to_html(self, _RAW, indent_size=indent_size,
+                        indent_level=indent_level, return_lines=return_lines,
+                        replace_all_entities=replace_all_entities,
+                        minify=minify)
 
 
 @no_start_tag
@@ -289,6 +729,8 @@ class RootNode(HTMLNode):
     This is the top-level node that contains all other nodes.
     """
 
+    __slots__ = ()
+
     def to_html(self, indent_level: int = 0, **kwargs: Any) -> Union[str, List[str]]:
         """Converts the root node to HTML code.
 
@@ -305,4 +747,566 @@ class RootNode(HTMLNode):
         :return: See :py:meth:`HTMLNode.to_html`.
         :type return: str or List[str]
         """
-        return super().to_html(indent_level=indent_level - 1, **kwargs)
+        return _to_html(self, _ROOT, indent_level=indent_level, **kwargs)
+
+
+# Kinds of nodes handled by the rendering engine: regular HTML nodes, root
+# nodes (whose indentation level is shifted by one), raw text nodes, and nodes
+# with a custom `to_html` method that the engine calls as is
+_NODE, _ROOT, _RAW, _CUSTOM = range(4)
+
+
+# Operations on the stack of the rendering engine: rendering a node on its own
+# lines, rendering a node within the current line, adding a fragment of code to
+# the current line, starting a new line with a fragment of code, and storing
+# the code of a subtree into its render cache
+_LINES, _INLINE, _FRAGMENT, _NEW_LINE, _STORE = range(5)
+
+
+@dataclass(frozen=True)
+class _TagDescriptor:
+    """Class-level facts about the tags of an :py:class:`HTMLNode` subclass,
+    computed once per class and shared by all of its instances.
+    """
+
+    # The tag name, e.g. "div"
+    name: str
+
+    # Whether the start tag is built by `HTMLNode.start_tag`, as opposed to
+    # being empty or custom
+    has_start_tag: bool
+
+    # Whether the start tag is built by `HTMLNode.start_tag` from the node's
+    # attributes only. If False, it is empty, custom, or built with a tag name
+    # or rendered attributes that the class overrides and that may depend on
+    # other variables of the node, so it cannot be memoized.
+    builds_start_tag: bool
+
+    # The end tag, e.g. "</div>", or None if it must be retrieved from each
+    # node because the class overrides the tag or its name
+    end_tag: Union[str, None]
+
+    # Whether nodes of the class render on a single line
+    one_line: bool
+
+    # How the rendering engine renders nodes of the class (one of `_NODE`,
+    # `_ROOT`, `_RAW` or `_CUSTOM`)
+    render_kind: int
+
+
+def _get_tag_descriptor(cls: type) -> _TagDescriptor:
+    """Returns the tag descriptor of the given node class, computing it on
+    first use.
+
+    :param cls: A subclass of :py:class:`HTMLNode`.
+    :type cls: type
+    :return: The tag descriptor of the class.
+    :rtype: _TagDescriptor
+    """
+    descriptor = _TAG_DESCRIPTORS.get(cls)
+    if descriptor is None:
+        name = cls.__name__.lower()
+        if cls.end_tag is _NO_END_TAG:
+            end_tag = ''
+        elif cls.end_tag is HTMLNode.end_tag and \
+                cls._get_tag_name is HTMLNode._get_tag_name:
+            end_tag = f"</{name}>"
+        else:
+            end_tag = None
+        has_start_tag = cls.start_tag is HTMLNode.start_tag
+        descriptor = _TagDescriptor(
+            name=name,
+            has_start_tag=has_start_tag,
+            builds_start_tag=has_start_tag
+            and cls._get_tag_name is HTMLNode._get_tag_name
+            and cls._render_attributes is HTMLNode._render_attributes,
+            end_tag=end_tag,
+            one_line=bool(cls.one_line),
+            render_kind={HTMLNode.to_html: _NODE, RootNode.to_html: _ROOT,
+                         RawText.to_html: _RAW}.get(cls.to_html, _CUSTOM))
+        _TAG_DESCRIPTORS[cls] = descriptor
+    return descriptor
+
+
+def _renders_on_one_line(node: HTMLNode, collapse_empty: bool,
+                         force_one_line: bool) -> bool:
+    """Returns whether the given node renders all of its content on a single
+    line when converted to HTML code with the given options.
+
+    :param node: The node to check.
+    :type node: HTMLNode
+    :param collapse_empty: See :py:meth:`HTMLNode.to_html`.
+    :type collapse_empty: bool
+    :param force_one_line: See :py:meth:`HTMLNode.to_html`.
+    :type force_one_line: bool
+    :return: True if the node renders on a single line, False otherwise.
+    :rtype: bool
+    """
+    return _get_tag_descriptor(type(node)).one_line or force_one_line or (
+        collapse_empty and not node._children)
+
+
+def _add_parent(node: HTMLNode, parent: HTMLNode) -> None:
+    """Registers the given parent on the given node, so the node can
+    invalidate the render cache of the parent when it changes.
+
+    :param node: The child node.
+    :type node: HTMLNode
+    :param parent: The parent node.
+    :type parent: HTMLNode
+    """
+    reference = weakref.ref(parent)
+    parents = node._parents
+    if parents is None:
+        node._parents = (reference,)
+    elif reference not in parents:
+        node._parents = parents + (reference,)
+
+
+def _merge_classes(classes: Union[str, None], names: List[str]) -> str:
+    """Adds the given class names to a `class` attribute, skipping those that
+    are already there.
+
+    :param classes: The value of the `class` attribute, or None if there is no
+        such attribute.
+    :type classes: Union[str, None]
+    :param names: The class names to add.
+    :type names: List[str]
+    :return: The new value of the `class` attribute.
+    :rtype: str
+    """
+    if not classes:
+        return ' '.join(names)
+    present = set(classes.split(' '))
+    names = [n for n in names if n not in present]
+    return classes + ' ' + ' '.join(names) if names else classes
+
+
+def _merge_styles(style: Union[str, None], declarations: str) -> str:
+    """Adds the given inline declarations to a `style` attribute.
+
+    :param style: The value of the `style` attribute, or None if there is no
+        such attribute.
+    :type style: Union[str, None]
+    :param declarations: The declarations to add, as in `margin:0;color:red`.
+    :type declarations: str
+    :return: The new value of the `style` attribute.
+    :rtype: str
+    """
+    if not style:
+        return declarations
+    return style + declarations if style.rstrip().endswith(';') \
+        else style + ';' + declarations
+
+
+def _build_start_tag(name: str, attributes: Dict[str, str]) -> str:
+    """Builds a start tag like :py:attr:`HTMLNode.start_tag` from a tag name
+    and attributes, without any validation.
+
+    :param name: The tag name.
+    :type name: str
+    :param attributes: The attributes of the tag.
+    :type attributes: Dict[str, str]
+    :return: The start tag, with attributes sorted by name.
+    :rtype: str
+    """
+    rendered = ' '.join(f'{k}="{v}"' for k, v in sorted(attributes.items()))
+    return f"<{name} {rendered}>" if rendered else f"<{name}>"
+
+
+def _render_start_tag(node: HTMLNode, attributes: Dict[str, str]) -> str:
+    """Builds the start tag of the given node as :py:attr:`HTMLNode.start_tag`
+    does, but with the given attributes instead of the node's own ones.
+
+    The tag is built by the `_get_tag_name` and `_render_attributes` methods
+    of the node, so overrides of these methods are taken into account. The
+    node is left unchanged and its caches are not invalidated.
+
+    :param node: The node whose start tag to build.
+    :type node: HTMLNode
+    :param attributes: The attributes to render.
+    :type attributes: Dict[str, str]
+    :return: The start tag.
+    :rtype: str
+    """
+    own_attributes = node._attributes
+    node._attributes = attributes
+    try:
+        rendered = node._render_attributes()
+        maybe_space = ' ' if rendered else ''
+        return f"<{node._get_tag_name()}{maybe_space}{rendered}>"
+    finally:
+        node._attributes = own_attributes
+
+
+def _get_start_tag(node: HTMLNode, descriptor: _TagDescriptor,
+                   mapping: Union[Dict[Any, Sequence[Any]], None],
+                   compact: bool, validated: Set[str],
+                   tags: Dict[Tuple[Any, ...], str],
+                   inline: Dict[Any, str] = None) -> str:
+    """Returns the start tag of the given node, with the classes of the rules
+    mapped to it and its inline declarations if any.
+
+    The start tag of the node itself is not modified, so the tree can be
+    rendered with other rules at the same time.
+
+    :param node: The node whose start tag to return.
+    :type node: HTMLNode
+    :param descriptor: The tag descriptor of the node's class.
+    :type descriptor: _TagDescriptor
+    :param mapping: The mapping of a :py:class:`CompiledCSS` object, or None
+        to return the node's own start tag.
+    :type mapping: Union[Dict[Any, Sequence[ClassRule]], None]
+    :param compact: Whether the mapping is keyed by style rather than by
+        node ID.
+    :type compact: bool
+    :param validated: The class names validated so far during the render.
+        New names are validated and added to it.
+    :type validated: Set[str]
+    :param tags: A dictionary caching start tags with classes during the
+        render, by tag name, attributes, rules and inline declarations.
+    :type tags: Dict[Tuple[Any, ...], str]
+    :param inline: The inline declarations of a :py:class:`CompiledCSS`
+        object, keyed like `mapping`. Defaults to None, which means there is
+        none.
+    :type inline: Dict[Any, str]
+    :return: The start tag.
+    :rtype: str
+    """
+    if not descriptor.has_start_tag:
+        return node.start_tag
+
+    # Adding classes and inline declarations to a copy of the attributes if
+    # rules or declarations are mapped to the node
+    style = node._style
+    if mapping is not None and style:
+        node_key = tuple(style.items()) if compact else id(node)
+        rules = mapping.get(node_key)
+        declarations = inline.get(node_key) if inline else None
+        if rules or declarations:
+            # Nodes whose start tag only depends on their attributes share
+            # it with all nodes of the same name, attributes, rules and
+            # declarations, whose attributes were validated already
+            attributes = node._attributes
+            key = (descriptor.name,
+                   tuple(attributes.items()) if attributes else (),
+                   tuple(rules or ()), declarations)
+            if descriptor.builds_start_tag:
+                start_tag = tags.get(key)
+                if start_tag is not None:
+                    return start_tag
+
+            # The merged attribute is valid if the node's attributes are and
+            # if each class name is, so names are only validated once
+            node.validate_attributes()
+            names = [r.name for r in rules or ()]
+            for name in names:
+                if name not in validated:
+                    validate_css_identifier(name)
+                    validated.add(name)
+            attributes = dict(attributes or ())
+            if names:
+                attributes["class"] = _merge_classes(attributes.get("class"),
+                                                     names)
+            if declarations:
+                attributes["style"] = _merge_styles(attributes.get("style"),
+                                                    declarations)
+            if not descriptor.builds_start_tag:
+                return _render_start_tag(node, attributes)
+            start_tag = _build_start_tag(key[0], attributes)
+            tags[key] = start_tag
+            return start_tag
+
+    start_tag = node._start_tag
+    return node.start_tag if start_tag is None else start_tag
+
+
+def _render_html(root: HTMLNode, kind: int, collapse_empty: bool,
+                 indent_size: int, indent_level: int, force_one_line: bool,
+                 cache: bool, kwargs: Dict[str, Any]) -> Iterator[str]:
+    """Renders the given tree into HTML code without recursion.
+
+    Every node is visited exactly once with an explicit stack, so the depth of
+    the tree is not limited by Python's recursion limit. If the root node
+    renders on multiple lines, this function yields each line of code, in
+    order, with empty lines already trimmed. If the root node renders on a
+    single line, this function yields the fragments of that line.
+
+    :param root: The root of the tree to render.
+    :type root: HTMLNode
+    :param kind: The render kind to use for the root node. It can differ from
+        the kind of the root node's class when an overriding `to_html` method
+        calls the engine through its base class.
+    :type kind: int
+    :param collapse_empty: See :py:meth:`HTMLNode.to_html`.
+    :type collapse_empty: bool
+    :param indent_size: See :py:meth:`HTMLNode.to_html`.
+    :type indent_size: int
+    :param indent_level: See :py:meth:`HTMLNode.to_html`.
+    :type indent_level: int
+    :param force_one_line: See :py:meth:`HTMLNode.to_html`.
+    :type force_one_line: bool
+    :param cache: See :py:meth:`HTMLNode.to_html`. When True, the code is
+        only yielded once the entire tree has been rendered.
+    :type cache: bool
+    :param kwargs: See :py:meth:`HTMLNode.to_html`.
+    :type kwargs: Dict[str, Any]
+    :return: An iterator over lines or fragments of HTML code.
+    :rtype: Iterator[str]
+    """
+    replace_all_entities = kwargs.get("replace_all_entities", False)
+    css = kwargs.get("css")
+    mapping = None if css is None else css.mapping
+    compact = css is not None and css.compact
+    inline = None if css is None else css.inline
+    validated = set()  # Class names validated during the render
+    tags = {}  # Start tags with classes, shared by similar nodes
+    indentations = {}  # Indentation strings, computed once per level
+
+    # A root node rendering on one line has no line to trim, and its content
+    # is only indented if it is raw text or if the line is not forced
+    multi_line = not _renders_on_one_line(root, collapse_empty,
+                                          force_one_line)
+    if multi_line:
+        stack = [(_LINES, root, indent_level)]
+    else:
+        stack = [(_INLINE, root, indent_level if kind == _RAW
+                  or not force_one_line else 0)]
+
+    # Subtrees being captured into render caches. Captures are numbered by
+    # nesting depth, and all captures numbered below `poisoned` contain a
+    # node with a custom `to_html` method whose output cannot be cached.
+    open_captures = 0
+    poisoned = 0
+
+    # Nodes whose containers are not tracked, with a snapshot of these
+    # containers, in the order in which they were rendered. Each capture
+    # stores the nodes rendered within it, and its cache is only reused as
+    # long as their snapshots have not changed.
+    watched = []
+
+    lines = []  # Lines written in multi-line mode but not yielded yet
+    line = []  # Fragments of the line currently being written
+    while stack:
+        operation, item, level = stack.pop()
+
+        # Fragments of code are added as is to the current line
+        if operation == _FRAGMENT:
+            line.append(item)
+            continue
+
+        # Storing the code of a subtree into its render cache once the subtree
+        # has been rendered. In multi-line mode, subtrees are made of whole
+        # lines, so the last line of the subtree is written first.
+        if operation == _STORE:
+            node, key, start, number, inline, first_watched = item
+            if inline:
+                pieces = tuple(line[start:])
+            else:
+                text = ''.join(line)
+                if text.strip(' '):
+                    lines.append(text)
+                line = []
+                pieces = tuple(lines[start:])
+            if number >= poisoned:
+                if node._html_cache is None:
+                    node._html_cache = {}
+                node._html_cache[key] = (pieces,
+                                         tuple(watched[first_watched:]))
+                for child in node._children:
+                    _add_parent(child, node)
+            open_captures -= 1
+            poisoned = min(poisoned, open_captures)
+            continue
+
+        # Any other operation in multi-line mode that does not happen within
+        # the current line starts a new line, so we write the current one
+        # unless it is empty
+        if multi_line and operation != _INLINE:
+            text = ''.join(line)
+            if text.strip(' '):
+                lines.append(text)
+            line = []
+
+        # Retrieving the indentation
+        indentation = indentations.get(level)
+        if indentation is None:
+            indentation = get_indentation(level, indent_size)
+            indentations[level] = indentation
+
+        # A new line starts with the given fragment
+        if operation == _NEW_LINE:
+            line += (indentation, item)
+
+        # Otherwise, we render the node based on its kind
+        else:
+            node = item
+            descriptor = _get_tag_descriptor(type(node))
+            node_kind = kind if node is root else descriptor.render_kind
+            if node_kind == _RAW:
+                line += (indentation, sanitize_html_text(
+                    node.text, replace_all_entities=replace_all_entities))
+            elif node_kind == _CUSTOM:
+                poisoned = open_captures
+                if operation == _INLINE:
+                    line += node.to_html(collapse_empty=collapse_empty,
+                                         indent_level=0, force_one_line=True,
+                                         return_lines=True, **kwargs)
+                else:
+                    stack += ((_NEW_LINE, l, -1) for l in reversed(
+                        node.to_html(collapse_empty=collapse_empty,
+                                     indent_size=indent_size,
+                                     indent_level=level, return_lines=True,
+                                     **kwargs)))
+            else:
+                children = node._children or ()
+
+                # Reusing the render cache of the subtree if possible, or
+                # capturing the subtree into the cache otherwise
+                if cache and children:
+                    key = (operation, level, collapse_empty, indent_size,
+                           replace_all_entities, css)
+                    entry = node._html_cache and node._html_cache.get(key)
+                    if entry is not None and all(
+                            _snapshot(n) == s for n, s in entry[1]):
+                        if operation == _INLINE:
+                            line += entry[0]
+                        else:
+                            lines += entry[0]
+                        watched += entry[1]
+                        continue
+                    stack.append((_STORE, (
+                        node, key, len(line) if operation == _INLINE
+                        else len(lines), open_captures,
+                        operation == _INLINE, len(watched)), 0))
+                    open_captures += 1
+
+                # Changes to containers that are not tracked are detected by
+                # comparing snapshots when reusing the caches
+                if cache and not (_is_tracked(node._children)
+                                  and _is_tracked(node._attributes)
+                                  and _is_tracked(node._style)):
+                    watched.append((node, _snapshot(node)))
+
+                # Root nodes act as an array of elements, one level up
+                if node_kind == _ROOT:
+                    level -= 1
+                    indentation = get_indentation(level, indent_size)
+
+                # Opening the element and pushing its closing tag and its
+                # children (in reverse order, as the stack is last in, first
+                # out)
+                line += (indentation, _get_start_tag(
+                    node, descriptor, mapping, compact, validated, tags,
+                    inline))
+                end_tag = descriptor.end_tag
+                if end_tag is None:
+                    end_tag = node.end_tag
+                if operation == _INLINE or descriptor.one_line or (
+                        collapse_empty and not children):
+                    stack.append((_FRAGMENT, end_tag, 0))
+                    stack += ((_INLINE, c, 0) for c in reversed(children))
+                else:
+                    stack.append((_NEW_LINE, end_tag, level))
+                    stack += ((_LINES, c, level + 1)
+                              for c in reversed(children))
+
+        # Code is yielded as soon as possible, unless it is being captured
+        # into render caches, in which case it is yielded at the end
+        if not cache:
+            if lines:
+                yield from lines
+                lines = []
+            elif not multi_line and line:
+                yield ''.join(line)
+                line = []
+
+    # Writing the last line, which is only trimmed in multi-line mode
+    text = ''.join(line)
+    if text.strip(' ') or (text and not multi_line):
+        lines.append(text)
+    yield from lines
+
+
+def _render_minified_html(root: HTMLNode, kind: int,
+                          kwargs: Dict[str, Any]) -> str:
+    """Renders the given tree into minified HTML code without recursion.
+
+    This is a fast path of :py:func:`_render_html` for output without any
+    indentation or line break: the tags and text of every node are written
+    straight into a single buffer.
+
+    :param root: The root of the tree to render.
+    :type root: HTMLNode
+    :param kind: The render kind to use for the root node.
+    :type kind: int
+    :param kwargs: See :py:meth:`HTMLNode.to_html`.
+    :type kwargs: Dict[str, Any]
+    :return: The minified HTML code.
+    :rtype: str
+    """
+    replace_all_entities = kwargs.get("replace_all_entities", False)
+    css = kwargs.get("css")
+    mapping = None if css is None else css.mapping
+    compact = css is not None and css.compact
+    inline = None if css is None else css.inline
+    validated = set()  # Class names validated during the render
+    tags = {}  # Start tags with classes, shared by similar nodes
+    buffer = []
+
+    # The stack holds nodes to render and end tags to write
+    stack = [root]
+    while stack:
+        item = stack.pop()
+        if type(item) is str:
+            buffer.append(item)
+            continue
+        descriptor = _get_tag_descriptor(type(item))
+        node_kind = kind if item is root else descriptor.render_kind
+        if node_kind == _RAW:
+            buffer.append(sanitize_html_text(
+                item.text, replace_all_entities=replace_all_entities))
+        elif node_kind == _CUSTOM:
+            buffer += item.to_html(indent_level=0, force_one_line=True,
+                                   return_lines=True, **kwargs)
+        else:
+            buffer.append(_get_start_tag(item, descriptor, mapping, compact,
+                                         validated, tags, inline))
+            end_tag = descriptor.end_tag
+            stack.append(item.end_tag if end_tag is None else end_tag)
+            stack += reversed(item._children or ())
+    return ''.join(buffer)
+
+
+def _to_html(node: HTMLNode, kind: int, collapse_empty: bool = True,
+             indent_size: int = 4, indent_level: int = 0,
+             force_one_line: bool = False, return_lines: bool = False,
+             cache: bool = False, minify: bool = False,
+             **kwargs: Any) -> Union[str, List[str]]:
+    """Renders the given node with the rendering engine and assembles the
+    result like :py:meth:`HTMLNode.to_html`.
+
+    :param node: The node to render.
+    :type node: HTMLNode
+    :param kind: The render kind to use for the node.
+    :type kind: int
+    :param kwargs: See :py:meth:`HTMLNode.to_html`.
+    :type kwargs: Any
+    :return: See :py:meth:`HTMLNode.to_html`.
+    :rtype: str or List[str]
+    """
+    # Minified code is rendered by the fast path, unless the render cache is
+    # requested, which only the main engine supports
+    if minify:
+        if not cache:
+            html = _render_minified_html(node, kind, kwargs)
+            return [html] if return_lines else html
+        force_one_line, indent_level = True, 0
+
+    pieces = _render_html(node, kind, collapse_empty, indent_size,
+                          indent_level, force_one_line, cache, kwargs)
+    if _renders_on_one_line(node, collapse_empty, force_one_line):
+        html = ''.join(pieces)
+        return [html] if return_lines else html
+    lines = list(pieces)
+    return lines if return_lines else '\n'.join(lines)
@@ -10,8 +10,11 @@
 #
 # =======================================================================
 
+from .html_containers import TrackedList
 from .html_node import HTMLNode, no_end_tag, one_line, RawText
-from typing import Dict
+from typing import Any, Dict, List, Union
+from webwidgets.utility.indentation import get_indentation
+from webwidgets.utility.validation import validate_html_style_content
 
 
 @one_line
@@ -22,6 +25,8 @@ class TextNode(HTMLNode):
     :py:class:`RawText` node with the text to be rendered.
     """
 
+    __slots__ = ()
+
     def __init__(self, text: str, attributes: Dict[str, str] = None,
                  style: Dict[str, str] = None):
         """Creates a new text node with the given text and attributes.
@@ -35,19 +40,21 @@ class TextNode(HTMLNode):
             dictionary.
         :type style: Dict[str, str]
         """
-        super().__init__(children=[
+        super().__init__(children=TrackedList([
             RawText(text)
-        ], attributes=attributes, style=style)
+        ]), attributes=attributes, style=style)
 
 
 class Body(HTMLNode):
     """The `<body>` element containing the visible content of a document."""
-    pass
+
+    __slots__ = ()
 
 
 class Div(HTMLNode):
     """A `<div>` element used for grouping elements."""
-    pass
+
+    __slots__ = ()
 
 
 @one_line
@@ -55,6 +62,8 @@ class Div(HTMLNode):
 class Doctype(HTMLNode):
     """The `<!DOCTYPE html>` doctype declaration of a document."""
 
+    __slots__ = ()
+
     def __init__(self):
         """Creates a `<!DOCTYPE html>` doctype declaration element."""
         super().__init__()
@@ -67,16 +76,106 @@ class Doctype(HTMLNode):
 
 class Head(HTMLNode):
     """The `<head>` element containing metadata about a document."""
-    pass
+
+    __slots__ = ()
 
 
 class Html(HTMLNode):
     """The `<html>` element of an HTML document."""
-    pass
+
+    __slots__ = ()
 
 
 @one_line
 @no_end_tag
 class Link(HTMLNode):
     """A `<link>` element for linking to external resources."""
-    pass
+
+    __slots__ = ()
+
+
+class Style(HTMLNode):
+    """A `<style>` element containing CSS code.
+
+    Unlike text in :py:class:`RawText` nodes, the CSS code is not sanitized:
+    it is written as is between the tags of the element, one line of code per
+    line of HTML code.
+    """
+
+    __slots__ = ("_text",)
+
+    def __init__(self, text: str, attributes: Dict[str, str] = None):
+        """Creates a `<style>` element with the given CSS code.
+
+        :param text: The CSS code of the element. It is validated with
+            :py:func:`validate_html_style_content` when converted to HTML.
+        :type text: str
+        :param attributes: See :py:meth:`HTMLNode.__init__`. Defaults to an
+            empty dictionary.
+        :type attributes: Dict[str, str]
+        """
+        super().__init__(attributes=attributes)
+        self.text = text
+
+    @property
+    def text(self) -> str:
+        """Returns the CSS code of the element.
+
+        :return: The CSS code of the element.
+        :rtype: str
+        """
+        return self._text
+
+    @text.setter
+    def text(self, value: str) -> None:
+        """Sets the CSS code of the element and invalidates the render caches
+        of its ancestors.
+
+        :param value: The new CSS code of the element.
+        :type value: str
+        """
+        self._text = value
+        self._invalidate()
+
+    def to_html(self, indent_size: int = 4, indent_level: int = 0,
+                force_one_line: bool = False, return_lines: bool = False,
+                minify: bool = False,
+                **kwargs: Any) -> Union[str, List[str]]:
+        """Converts the element to HTML code.
+
+        Non-empty lines of CSS code are indented one level below the tags of
+        the element, or joined with spaces if the element is rendered on one
+        line.
+
+        :param indent_size: See :py:meth:`HTMLNode.to_html`.
+        :type indent_size: int
+        :param indent_level: See :py:meth:`HTMLNode.to_html`.
+        :type indent_level: int
+        :param force_one_line: See :py:meth:`HTMLNode.to_html`.
+        :type force_one_line: bool
+        :param return_lines: See :py:meth:`HTMLNode.to_html`.
+        :type return_lines: bool
+        :param minify: See :py:meth:`HTMLNode.to_html`.
+        :type minify: bool
+        :param kwargs: Other keyword arguments. These are ignored.
+        :type kwargs: Any
+        :return: See :py:meth:`HTMLNode.to_html`.
+        :rtype: str or List[str]
+        """
+        validate_html_style_content(self.text)
+        code = [line for line in self.text.split('\n') if line.strip()]
+
+        # On one line, lines of CSS code are stripped and joined
+        if force_one_line or minify:
+            indentation = '' if minify else get_indentation(indent_level,
+                                                            indent_size)
+            html = indentation + self.start_tag + ' '.join(
+                line.strip() for line in code) + self.end_tag
+            return [html] if return_lines else html
+
+        # Otherwise, each line of CSS code is indented within the element
+        indentation = get_indentation(indent_level, indent_size)
+        inner = get_indentation(indent_level + 1, indent_size)
+        lines = [indentation + self.start_tag] + \
+            [inner + line for line in code] + [indentation + self.end_tag]
+        return lines if return_lines else '\n'.join(lines)
@@ -15,4 +15,5 @@ from .indentation import *
 from .representation import *
 from .sanitizing import *
 from .sizes import *
+from .streaming import *
 from .validation import *
@@ -10,6 +10,9 @@
 #
 # =======================================================================
 
+from typing import Any, Dict
+
+
 class ReprMixin:
     """A mixin class that is represented with its variables when printed.
 
@@ -22,13 +25,56 @@ class ReprMixin:
     >>> obj = MyClass(1, 2)
     >>> print(obj)
     MyClass(a=1, b=2)
+
+    A private variable backing a property of the same name without the leading
+    underscore (like `_a` behind a property `a`) is represented under the name
+    of the property. Variables whose names are listed in the class attribute
+    `_repr_exclude` are not represented at all.
     """
 
+    __slots__ = ()
+
+    # Names of the variables that are not represented
+    _repr_exclude = ()
+
     def __repr__(self) -> str:
         """Returns a string exposing all member variables of the class.
 
         :return: A string representing the class with its variables.
         :rtype: str
         """
-        variables = ', '.join(f'{k}={repr(v)}' for k, v in vars(self).items())
-        return f"{self.__class__.__name__}({variables})"
+        cls = self.__class__
+        items = []
+        for k, v in get_variables(self).items():
+            if k in cls._repr_exclude:
+                continue
+            if k.startswith('_') and isinstance(getattr(cls, k[1:], None),
+                                                property):
+                k = k[1:]
+                v = getattr(self, k)
+            items.append(f'{k}={repr(v)}')
+        return f"{cls.__name__}({', '.join(items)})"
+
+
+def get_variables(obj: Any) -> Dict[str, Any]:
+    """Returns the member variables of the given object, including those
+    stored in slots.
+
+    Variables stored in slots come first, from the base class to the derived
+    classes, followed by variables stored in the object's `__dict__`, if any.
+    Slots that have not been assigned are skipped.
+
+    :param obj: The object whose variables to return.
+    :type obj: Any
+    :return: A dictionary mapping variable names to their values.
+    :rtype: Dict[str, Any]
+    """
+    variables = {}
+    for cls in reversed(type(obj).__mro__):
+        slots = cls.__dict__.get("__slots__", ())
+        for name in (slots,) if isinstance(slots, str) else slots:
+            if name not in ("__dict__", "__weakref__") and \
+                    hasattr(obj, name):
+                variables[name] = getattr(obj, name)
+    variables.update(getattr(obj, "__dict__", {}))
+    return variables
@@ -0,0 +1,58 @@
+# =======================================================================
+#
+#  This file is part of WebWidgets, a Python package for designing web
+#  UIs.
+#
+#  You should have received a copy of the MIT License along with
+#  WebWidgets. If not, see <https://opensource.org/license/mit>.
+#
+#  Copyright(C) 2025, mlaasri
+#
+# =======================================================================
+
+import asyncio
+import codecs
+from typing import AsyncIterator, Iterable
+
+
+async def aiter_chunks(pieces: Iterable[str], chunk_size: int = 65536,
+                       encoding: str = "utf-8") -> AsyncIterator[bytes]:
+    """Encodes the given pieces of text and yields them asynchronously in
+    chunks of bytes.
+
+    Control is given back to the event loop after each chunk, so that encoding
+    a long text does not block other tasks.
+
+    :param pieces: The pieces of text to encode, for example the chunks of
+        code yielded by :py:meth:`HTMLNode.iter_html`. Pieces are consumed
+        lazily.
+    :type pieces: Iterable[str]
+    :param chunk_size: The size of each chunk in bytes. All chunks have
+        exactly this size except for the last one, which may be shorter.
+        Defaults to 64 KiB.
+    :type chunk_size: int
+    :param encoding: The encoding to use. Pieces are encoded incrementally,
+        so stateful encodings like UTF-16 only write their byte order mark
+        once. Defaults to UTF-8.
+    :type encoding: str
+    :return: An asynchronous iterator over the chunks of bytes.
+    :rtype: AsyncIterator[bytes]
+    """
+    if chunk_size < 1:
+        raise ValueError(f"Chunk size must be positive, got {chunk_size}")
+    encoder = codecs.getincrementalencoder(encoding)()
+    buffer = bytearray()
+    for piece in pieces:
+        buffer += encoder.encode(piece)
+
+        # Yielding all complete chunks and keeping the rest for later
+        if len(buffer) >= chunk_size:
+            data = bytes(buffer)
+            end = len(data) - len(data) % chunk_size
+            buffer = bytearray(data[end:])
+            for start in range(0, end, chunk_size):
+                yield data[start:start + chunk_size]
+                await asyncio.sleep(0)
+    buffer += encoder.encode("", final=True)
+    if buffer:
+        yield bytes(buffer)
@@ -93,9 +93,13 @@ def validate_css_selector(selector: str) -> None:
       `*::after`
     - any combination of special selectors separated by a comma and a single
       space (e.g. `*::before, *::after`)
-    - or a class selector, which is defined as a dot `.` followed by a valid
+    - a class selector, which is defined as a dot `.` followed by a valid
       CSS identifier, as defined and enforced by the
       :py:func:`validate_css_identifier` function
+    - or an attribute selector matching an exact value, such as
+      `[data-role="box-item"]`, where the attribute name is a valid CSS
+      identifier and the value only contains letters, digits, underscores
+      `_` and hyphens `-`
 
     Note that this function imposes stricter rules than the official CSS
     Selector Level 4 specification (see source:
@@ -105,8 +109,8 @@ def validate_css_selector(selector: str) -> None:
 
     :param selector: The CSS selector to validate.
     :type selector: str
-    :raises ValueError: If the selector is not a special selector nor a valid
-        CSS identifier.
+    :raises ValueError: If the selector is not a special selector, a valid
+        class selector nor a valid attribute selector.
     """
     # Checking if the selector is a special selector
     if selector in SPECIAL_SELECTORS:
@@ -116,6 +120,15 @@ def validate_css_selector(selector: str) -> None:
     if all(part in SPECIAL_SELECTORS for part in selector.split(", ")):
         return
 
+    # Checking if the selector is an attribute selector
+    if selector.startswith("["):
+        match = re.match(r'^\[([^=\]]*)="([a-zA-Z0-9_-]+)"\]$', selector)
+        if not match:
+            raise ValueError("Attribute selector must be of the form "
+                             f"[name=\"value\"] but got: {selector}")
+        validate_css_identifier(match.group(1))
+        return
+
     # Otherwise, checking if the selector is a class selector
     if not selector.startswith("."):
         raise ValueError("Class selector must start with '.' but got: "
@@ -193,3 +206,22 @@ def validate_html_class(class_attribute: str) -> None:
     # Check each class individually
     for c in class_attribute.split(' '):
         validate_css_identifier(c)
+
+
+def validate_html_style_content(css: str) -> None:
+    """Checks if the given CSS code can be written as is into an HTML
+    `<style>` element and raises an exception if not.
+
+    The content of a `<style>` element is raw text that ends at the first
+    `</style` sequence, in any case, according to rule 13.1.2.6 of the HTML5
+    specification (see source:
+    https://html.spec.whatwg.org/multipage/syntax.html#cdata-rcdata-restrictions),
+    so this function checks that the code does not contain that sequence.
+
+    :param css: The CSS code to validate.
+    :type css: str
+    :raises ValueError: If the code contains the sequence `</style`.
+    """
+    if "</style" in css.lower():
+        raise ValueError("Invalid content for a <style> element: CSS code "
+                         f"cannot contain '</style' but got: '{css}'")
@@ -10,5 +10,6 @@
 #
 # =======================================================================
 
+from .asgi import WebsiteApp
 from .compiled_website import CompiledWebsite
 from .website import Website
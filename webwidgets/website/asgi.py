@@ -0,0 +1,141 @@
+# =======================================================================
+#
+#  This file is part of WebWidgets, a Python package for designing web
+#  UIs.
+#
+#  You should have received a copy of the MIT License along with
+#  WebWidgets. If not, see <https://opensource.org/license/mit>.
+#
+#  Copyright(C) 2025, mlaasri
+#
+# =======================================================================
+
+from .compiled_website import CompiledWebsite
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+from webwidgets.utility.representation import ReprMixin
+from webwidgets.utility.streaming import aiter_chunks
+
+
+class WebsiteApp(ReprMixin):
+    """An ASGI application that serves a :py:class:`CompiledWebsite` from
+    memory.
+
+    The application can be run by any ASGI server, for example with
+    `uvicorn.run(WebsiteApp(website.compile()))`. Pages and the style sheet
+    are streamed in chunks, giving control back to the event loop between
+    chunks, so that a large page does not block other requests.
+
+    If the CSS files of the website are named after their content, they are
+    served with a `cache-control` header allowing browsers to cache them
+    forever.
+
+    Routes are built once when the application is created, so each request
+    is answered with a single lookup.
+    """
+
+    # Routes built from the other variables
+    _repr_exclude = ("_routes",)
+
+    def __init__(self, compiled: CompiledWebsite, paths: List[str] = None,
+                 css_file_name: str = None,
+                 chunk_size: int = 65536):
+        """Creates a new application serving the given compiled website.
+
+        :param compiled: The compiled website to serve.
+        :type compiled: CompiledWebsite
+        :param paths: The URL path of each page, in the same order as
+            :py:attr:`CompiledWebsite.html_content`. Defaults to `"/"` for the
+            first page and `"/{i}"` for the page at index `i` otherwise.
+        :type paths: List[str]
+        :param css_file_name: The name of the CSS file linked to the pages,
+            which is served at `"/{css_file_name}"`. The other files of
+            :py:attr:`CompiledWebsite.css_files`, if any, are served at their
+            own names. Defaults to None, which uses the
+            :py:attr:`CompiledWebsite.css_file_name` attribute.
+        :type css_file_name: str
+        :param chunk_size: See :py:func:`aiter_chunks`.
+        :type chunk_size: int
+        """
+        super().__init__()
+        self.compiled = compiled
+        self.paths = ["/" if i == 0 else f"/{i}" for i in range(
+            len(compiled.html_content))] if paths is None else paths
+        self.css_file_name = compiled.css_file_name \
+            if css_file_name is None else css_file_name
+        self.chunk_size = chunk_size
+        self._routes = self._get_routes()
+
+    def _get_routes(self) -> Dict[str, Tuple[str, str, bool]]:
+        """Returns a dictionary mapping each URL path to the content served at
+        that path, its media type, and whether it can be cached forever.
+
+        :return: A dictionary of routes.
+        :rtype: Dict[str, Tuple[str, str, bool]]
+        """
+        immutable = self.compiled.immutable
+        routes = {path: (html, "text/html", False) for path, html in
+                  zip(self.paths, self.compiled.html_content)}
+        routes["/" + self.css_file_name] = (self.compiled.css_content,
+                                            "text/css", immutable)
+        for name, css in self.compiled.css_files.items():
+            routes["/" + name] = (css, "text/css", immutable)
+        return routes
+
+    async def __call__(self, scope: Dict[str, Any],
+                       receive: Callable[[], Awaitable[Dict[str, Any]]],
+                       send: Callable[[Dict[str, Any]], Awaitable[None]]
+                       ) -> None:
+        """Handles an ASGI connection.
+
+        Only HTTP and lifespan connections are supported. `GET` and `HEAD`
+        requests are answered with the content of the requested path, or
+        with a 404 status if there is no such content.
+
+        :param scope: The connection scope.
+        :type scope: Dict[str, Any]
+        :param receive: An awaitable callable returning the next event.
+        :type receive: Callable[[], Awaitable[Dict[str, Any]]]
+        :param send: An awaitable callable sending an event.
+        :type send: Callable[[Dict[str, Any]], Awaitable[None]]
+        """
+        # Acknowledging server startup and shutdown
+        if scope["type"] == "lifespan":
+            while True:
+                message = await receive()
+                if message["type"] == "lifespan.startup":
+                    await send({"type": "lifespan.startup.complete"})
+                elif message["type"] == "lifespan.shutdown":
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+        if scope["type"] != "http":
+            raise ValueError(
+                f"Unsupported ASGI connection type: {scope['type']}")
+
+        # Finding the content to serve
+        route = self._routes.get(scope["path"])
+        if scope["method"] not in ("GET", "HEAD"):
+            status, headers, content = 405, [(b"allow", b"GET, HEAD")], ""
+        elif route is None:
+            status, headers, content = 404, [], "Not Found"
+        else:
+            content, media_type, immutable = route
+            status = 200
+            headers = [(b"content-type",
+                        f"{media_type}; charset=utf-8".encode())]
+            if immutable:
+                headers.append((b"cache-control",
+                                b"public, max-age=31536000, immutable"))
+        if status != 200:
+            headers.append((b"content-type", b"text/plain; charset=utf-8"))
+
+        # Streaming the content in chunks, the last of which is an empty body
+        # signaling the end of the response
+        await send({"type": "http.response.start", "status": status,
+                    "headers": headers})
+        if scope["method"] != "HEAD":
+            async for chunk in aiter_chunks((content,),
+                                            chunk_size=self.chunk_size):
+                await send({"type": "http.response.body", "body": chunk,
+                            "more_body": True})
+        await send({"type": "http.response.body", "body": b"",
+                    "more_body": False})
@@ -10,7 +10,7 @@
 #
 # =======================================================================
 
-from typing import List
+from typing import Dict, List
 from webwidgets.utility.representation import ReprMixin
 
 
@@ -19,16 +19,40 @@ class CompiledWebsite(ReprMixin):
     :py:class:`Website` object.
     """
 
-    def __init__(self, html_content: List[str], css_content: str):
+    def __init__(self, html_content: List[str], css_content: str,
+                 timings: Dict[str, float] = None,
+                 css_files: Dict[str, str] = None,
+                 css_file_name: str = "styles.css",
+                 immutable: bool = False):
         """Stores compiled HTML and CSS content.
 
         :param html_content: The compiled HTML code of each page in the
             website.
         :type html_content: List[str]
         :param css_content: The compiled CSS code of the website, shared across
-            all pages.
+            all pages. If the CSS code is split into several files, this is
+            the code of the shared file.
         :type css_content: str
+        :param timings: The time taken by each phase of the compilation, in
+            seconds, as measured by :py:meth:`Website.compile`. Defaults to
+            an empty dictionary.
+        :type timings: Dict[str, float]
+        :param css_files: The code of each CSS file linked to the pages, by
+            file name, including the shared file. Defaults to an empty
+            dictionary, in which case `css_content` is the only file.
+        :type css_files: Dict[str, str]
+        :param css_file_name: The name of the CSS file holding `css_content`,
+            as linked to the pages. Defaults to "styles.css".
+        :type css_file_name: str
+        :param immutable: Whether CSS files are named after their content, in
+            which case their code never changes for a given name and they
+            can be cached forever. Defaults to False.
+        :type immutable: bool
         """
         super().__init__()
         self.html_content = html_content
         self.css_content = css_content
+        self.timings = {} if timings is None else timings
+        self.css_files = {} if css_files is None else css_files
+        self.css_file_name = css_file_name
+        self.immutable = immutable
@@ -11,8 +11,24 @@
 # =======================================================================
 
 from .compiled_website import CompiledWebsite
-from typing import Any, Callable, List
-from webwidgets.compilation.css import apply_css, compile_css, ClassRule
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+import gc
+import hashlib
+import os
+import time
+from typing import Any, Callable, Dict, FrozenSet, Iterator, List, Tuple, \
+    Union
+from webwidgets.compilation.css import AttributeRule, ClassRule, \
+    CompiledCSS, default_class_namer
+from webwidgets.compilation.css.css import _apply_folds, _compile_rules, \
+    _compile_styles, _count_attribute_styles, _filter_inline_groups, \
+    _fold_signatures, _fold_table, _get_attribute_rules, \
+    _get_attribute_values, _get_inline_styles, _get_signatures, \
+    _get_used_rules, _group_declarations, _intern_styles, _map_groups, \
+    _map_nodes, _map_rules, _name_rules, _split_rules
+from webwidgets.compilation.css.sections import RuleSection
+from webwidgets.compilation.html.html_node import RootNode
 from webwidgets.utility.representation import ReprMixin
 from webwidgets.widgets.containers.page import Page
 
@@ -45,6 +61,17 @@ class Website(ReprMixin):
                 indent_level: int = 0,
                 indent_size: int = 4,
                 class_namer: Callable[[List[ClassRule], int], str] = None,
+                group_rules: bool = False,
+                collapse_shorthands: bool = False,
+                drop_global_declarations: bool = False,
+                inline_styles: bool = False,
+                attribute_selectors: List[str] = None,
+                minify: bool = False,
+                minify_css: bool = False,
+                workers: int = 1,
+                critical_css_size: int = 0,
+                split_css: float = None,
+                css_hash_length: int = 0,
                 **kwargs: Any) -> CompiledWebsite:
         """Compiles the website into HTML and CSS code.
 
@@ -61,28 +88,558 @@ class Website(ReprMixin):
         :type indent_size: int
         :param class_namer: See :py:func:`compile_css`.
         :type class_namer: Callable[[List[ClassRule], int], str]
+        :param group_rules: See :py:func:`compile_css`.
+        :type group_rules: bool
+        :param collapse_shorthands: See :py:func:`compile_css`.
+        :type collapse_shorthands: bool
+        :param drop_global_declarations: See :py:func:`compile_css`.
+        :type drop_global_declarations: bool
+        :param inline_styles: See :py:func:`compile_css`.
+        :type inline_styles: bool
+        :param attribute_selectors: See :py:func:`compile_css`. For example,
+            `["data-role"]` gives the fixed declarations of the items of
+            every :py:class:`Box` a single attribute rule.
+        :type attribute_selectors: List[str]
+        :param minify: See :py:meth:`HTMLNode.to_html`. Only applies to the
+            HTML code.
+        :type minify: bool
+        :param minify_css: See :py:meth:`CompiledCSS.to_css`. Applies to all
+            CSS files and to the CSS code inlined into pages. Defaults to
+            False.
+        :type minify_css: bool
+        :param workers: The number of processes to build and render pages
+            with. If greater than 1, pages are built and rendered in a pool of
+            worker processes, largest pages first, and the result is identical
+            to that of a serial compilation. In that case, pages and keyword
+            arguments must be picklable, and each page is built twice, so
+            :py:meth:`Page.build` must always return the same tree for a given
+            page. Defaults to 1, which compiles all pages serially in the
+            current process.
+        :type workers: int
+        :param critical_css_size: The maximum size of the CSS code to inline
+            into each page, in bytes. The code needed by each page, made of
+            the preamble and of the rules mapped to the page's nodes, is
+            inlined with :py:meth:`Page.inline_css` if it does not exceed this
+            size, so the page can be displayed before the CSS file is loaded.
+            Defaults to 0, which never inlines any CSS code.
+        :type critical_css_size: int
+        :param split_css: If given, splits the CSS code into several files
+            with :py:meth:`CompiledCSS.split`, using this value as the
+            minimum fraction of pages that a rule must be used by to be
+            shared. Shared rules and the preamble go into the file named
+            `css_file_name`, and the other rules of the page at index `i` go
+            into a file named after it, like `"styles-{i}.css"`. Each page
+            links to the shared file and to its own file, if any. Defaults to
+            None, which puts all rules into a single file.
+        :type split_css: float
+        :param css_hash_length: If greater than 0, each CSS file is named
+            after the first hexadecimal characters of the SHA-256 digest of
+            its code, like `"styles.3fa2c1.css"` with a length of 6, and pages
+            link to these names. The name of a file then changes whenever its
+            code does, so files can be cached by browsers forever. Defaults to
+            0, which keeps the names unchanged.
+        :type css_hash_length: int
         :param kwargs: See :py:meth:`HTMLNode.to_html`.
         :type kwargs: Any
         :return: A new :py:class:`CompiledWebsite` object containing the
-            compiled HTML and CSS code.
+            compiled HTML and CSS code. Its `timings` attribute holds the time
+            spent in each phase of the compilation, in seconds: `"build"` for
+            building pages and collecting their styles, `"css"` for compiling
+            the CSS code, and `"render"` for rendering pages into HTML code.
+            With several workers, `"render"` includes building pages again in
+            the worker processes. Its `css_files` attribute holds the code of
+            each CSS file by file name, and its `css_file_name` attribute
+            holds the name of the file shared by all pages.
         :rtype: CompiledWebsite
         """
-        # Building the HTML representation of each page
-        trees = [page.build(css_file_name=css_file_name)
-                 for page in self.pages]
-
-        # Compiling HTML and CSS code
-        compiled_css = compile_css(trees, class_namer)
-        for tree in trees:
-            apply_css(compiled_css, tree)
-        html_content = [tree.to_html(
+        html_kwargs = dict(
             collapse_empty=collapse_empty,
             force_one_line=force_one_line,
             indent_level=indent_level,
             indent_size=indent_size,
+            minify=minify,
             **kwargs
-        ) for tree in trees]
-        css_content = compiled_css.to_css(indent_size=indent_size)
+        )
+        css_kwargs = dict(indent_size=indent_size, minify=minify_css)
+        fold_kwargs = dict(collapse_shorthands=collapse_shorthands,
+                           drop_global_declarations=drop_global_declarations)
+
+        timings = {}
+
+        # Compiling pages in a pool of processes if requested
+        if workers > 1:
+            html_content, css_files, shared_name = _compile_in_parallel(
+                self.pages, workers, css_file_name, class_namer, group_rules,
+                fold_kwargs, inline_styles, attribute_selectors,
+                critical_css_size, split_css,
+                css_hash_length, css_kwargs, html_kwargs, timings)
+
+        # Otherwise, compiling pages in the current process in three passes.
+        # The trees are made of many objects but contain no reference cycle,
+        # so the garbage collector is paused while they are processed.
+        else:
+            with _paused_gc():
+                # Building the HTML representation of each page and
+                # collecting the styles of its nodes at the same time
+                start = time.perf_counter()
+                page_styles = [{} for _ in self.pages]
+                trees = [page.build(css_file_name=css_file_name, styles=s)
+                         for page, s in zip(self.pages, page_styles)]
+                timings["build"] = time.perf_counter() - start
+
+                # Compiling CSS rules for the nodes that have a style
+                start = time.perf_counter()
+                compiled_css = _compile_styles(
+                    trees, {k: v for styles in page_styles
+                            for k, v in styles.items() if v},
+                    class_namer, group_rules, inline_styles=inline_styles,
+                    attribute_selectors=attribute_selectors, **fold_kwargs)
+
+                # Writing the CSS code into files, split if requested
+                used = None
+                if split_css is not None:
+                    used = [_get_used_rules(compiled_css.mapping, [
+                        k for k, v in styles.items() if v])
+                        for styles in page_styles]
+                css_files, page_files = _write_css_files(
+                    compiled_css, used, split_css, css_file_name,
+                    css_hash_length, css_kwargs)
+                shared_name = next(iter(css_files))
+
+                # Linking each page to its CSS files if they are not the one
+                # it was built with, and inlining its rules if requested
+                if page_files is not None or critical_css_size > 0 or \
+                        shared_name != css_file_name:
+                    for i, (tree, styles) in enumerate(zip(trees,
+                                                           page_styles)):
+                        _link_page_css(
+                            tree, compiled_css, styles,
+                            [shared_name] if page_files is None
+                            else page_files[i],
+                            css_kwargs, critical_css_size)
+                timings["css"] = time.perf_counter() - start
+
+                # Rendering each page with the classes of its nodes, without
+                # modifying the trees
+                start = time.perf_counter()
+                html_content = [tree.to_html(css=compiled_css, **html_kwargs)
+                                for tree in trees]
+                timings["render"] = time.perf_counter() - start
 
         # Storing the result in a new CompiledWebsite object
-        return CompiledWebsite(html_content, css_content)
+        return CompiledWebsite(html_content, css_files[shared_name], timings,
+                               css_files, shared_name,
+                               immutable=css_hash_length > 0)
+
+
+@contextmanager
+def _paused_gc() -> Iterator[None]:
+    """Pauses the cyclic garbage collector within a `with` block, if it is
+    enabled.
+
+    Collections are triggered by allocations, so building large trees can
+    spend much of its time traversing nodes that cannot be collected.
+
+    :return: An iterator yielding once, for use as a context manager.
+    :rtype: Iterator[None]
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _split_css_files(css: CompiledCSS, used: List[Dict[int, ClassRule]],
+                     threshold: float, css_file_name: str,
+                     css_kwargs: Dict[str, Any]
+                     ) -> Tuple[Dict[str, str], List[List[str]]]:
+    """Splits compiled CSS into a shared file and one file per page.
+
+    :param css: The compiled CSS.
+    :type css: CompiledCSS
+    :param used: The rules used by each page, as returned by
+        :py:func:`_get_used_rules`.
+    :type used: List[Dict[int, ClassRule]]
+    :param threshold: See :py:meth:`CompiledCSS.split`.
+    :type threshold: float
+    :param css_file_name: The name of the shared file.
+    :type css_file_name: str
+    :param css_kwargs: Keyword arguments to pass to
+        :py:meth:`CompiledCSS.to_css`.
+    :type css_kwargs: Dict[str, Any]
+    :return: A tuple containing the code of each file by file name, starting
+        with the shared file, and the names of the files to link to each
+        page.
+    :rtype: Tuple[Dict[str, str], List[List[str]]]
+    """
+    shared, specific = _split_rules(css.core.rules, used, threshold)
+    shared_css = CompiledCSS([], RuleSection(rules=shared,
+                                             title=css.core.title), {},
+                             attribute_rules=css.attributes.rules)
+    css_files = {css_file_name: shared_css.to_css(**css_kwargs)}
+    page_files = []
+    root, extension = os.path.splitext(css_file_name)
+    for i, rules in enumerate(specific):
+        names = [css_file_name]
+        if rules:
+            name = f"{root}-{i}{extension}"
+            css_files[name] = RuleSection(rules=rules, title=f"Page {i}") \
+                .to_css(**css_kwargs)
+            names.append(name)
+        page_files.append(names)
+    return css_files, page_files
+
+
+def _write_css_files(css: CompiledCSS,
+                     used: Union[List[Dict[int, ClassRule]], None],
+                     threshold: Union[float, None], css_file_name: str,
+                     hash_length: int, css_kwargs: Dict[str, Any]
+                     ) -> Tuple[Dict[str, str], Union[List[List[str]], None]]:
+    """Converts compiled CSS into the CSS files of a website, split and named
+    after their content if requested.
+
+    :param css: The compiled CSS.
+    :type css: CompiledCSS
+    :param used: See :py:func:`_split_css_files`. Only required if the CSS
+        code is split.
+    :type used: Union[List[Dict[int, ClassRule]], None]
+    :param threshold: See :py:meth:`CompiledCSS.split`, or None to write a
+        single file.
+    :type threshold: Union[float, None]
+    :param css_file_name: The name of the shared file.
+    :type css_file_name: str
+    :param hash_length: See the `css_hash_length` argument of
+        :py:meth:`Website.compile`.
+    :type hash_length: int
+    :param css_kwargs: Keyword arguments to pass to
+        :py:meth:`CompiledCSS.to_css`.
+    :type css_kwargs: Dict[str, Any]
+    :return: A tuple containing the code of each file by file name, starting
+        with the shared file, and the names of the files to link to each page,
+        or None if each page links to the shared file only.
+    :rtype: Tuple[Dict[str, str], Union[List[List[str]], None]]
+    """
+    if threshold is None:
+        css_files = {css_file_name: css.to_css(**css_kwargs)}
+        page_files = None
+    else:
+        css_files, page_files = _split_css_files(
+            css, used, threshold, css_file_name, css_kwargs)
+
+    # Naming files after their content if requested
+    if hash_length > 0:
+        names = {name: _hash_file_name(name, code, hash_length)
+                 for name, code in css_files.items()}
+        css_files = {names[name]: code for name, code in css_files.items()}
+        if page_files is not None:
+            page_files = [[names[name] for name in files]
+                          for files in page_files]
+    return css_files, page_files
+
+
+def _hash_file_name(file_name: str, content: str, length: int) -> str:
+    """Inserts a digest of the given content into the given file name, before
+    its extension.
+
+    :param file_name: The file name.
+    :type file_name: str
+    :param content: The content of the file.
+    :type content: str
+    :param length: The number of hexadecimal characters of the digest.
+    :type length: int
+    :return: The new file name, like `"styles.3fa2c1.css"`.
+    :rtype: str
+    """
+    digest = hashlib.sha256(content.encode("utf-8")).hexdigest()[:length]
+    root, extension = os.path.splitext(file_name)
+    return f"{root}.{digest}{extension}"
+
+
+def _link_page_css(tree: RootNode, css: CompiledCSS,
+                   styles: Dict[int, Dict[str, str]],
+                   css_file_names: List[str], css_kwargs: Dict[str, Any],
+                   critical_css_size: int) -> None:
+    """Links a page to the given CSS files and inlines the CSS code it needs
+    into its head if the code does not exceed the given size.
+
+    :param tree: The tree of the page, as returned by :py:meth:`Page.build`.
+    :type tree: RootNode
+    :param css: The compiled CSS, whose mapping covers the nodes of the page.
+    :type css: CompiledCSS
+    :param styles: The styles of the nodes of the page, as returned by
+        :py:meth:`HTMLNode.get_styles`.
+    :type styles: Dict[int, Dict[str, str]]
+    :param css_file_names: See :py:meth:`Page.link_css`.
+    :type css_file_names: List[str]
+    :param css_kwargs: Keyword arguments to pass to
+        :py:meth:`CompiledCSS.to_css`.
+    :type css_kwargs: Dict[str, Any]
+    :param critical_css_size: See :py:meth:`Website.compile`.
+    :type critical_css_size: int
+    """
+    # Pages without any style do not link to any CSS file
+    node_ids = [k for k, v in styles.items() if v]
+    if not node_ids:
+        return
+    critical_css = None
+    if critical_css_size > 0:
+        code = css.to_css(node_ids=node_ids, **css_kwargs)
+        if len(code.encode("utf-8")) <= critical_css_size:
+            critical_css = code
+    Page.link_css(tree, css_file_names, critical_css)
+
+
+def _analyze_page(page: Page, css_file_name: str, fold_kwargs: Dict[str, bool],
+                  attribute_selectors: List[str]
+                  ) -> Tuple[Dict[FrozenSet[Tuple[str, str]], int], int,
+                             Dict[Tuple[Any, Any], int]]:
+    """Builds the given page and returns the distinct styles it uses along
+    with its number of nodes.
+
+    This function runs in a worker process of
+    :py:meth:`Website.compile`.
+
+    :param page: The page to analyze.
+    :type page: Page
+    :param css_file_name: See :py:meth:`Page.build`.
+    :type css_file_name: str
+    :param fold_kwargs: The `collapse_shorthands` and
+        `drop_global_declarations` arguments of :py:func:`compile_css`.
+    :type fold_kwargs: Dict[str, bool]
+    :param attribute_selectors: See :py:func:`compile_css`.
+    :type attribute_selectors: List[str]
+    :return: A tuple containing the number of nodes sharing each distinct
+        style in the page, after folding its styles if requested, as returned
+        by :py:func:`_get_signatures`, the number of nodes in the page, and
+        the number of nodes sharing each combination of style and attribute
+        values, as returned by :py:func:`_count_attribute_styles`, or None if
+        `attribute_selectors` is None.
+    :rtype: Tuple[Dict[FrozenSet[Tuple[str, str]], int], int,
+        Dict[Tuple[Any, Any], int]]
+    """
+    tree = page.build(css_file_name=css_file_name)
+    styles = tree.get_styles()
+    table = _intern_styles(styles)
+    if any(fold_kwargs.values()):
+        table, _ = _fold_table(table, **fold_kwargs)
+    counts = _count_attribute_styles(table, _get_attribute_values(
+        [tree], attribute_selectors)) if attribute_selectors else None
+    return _get_signatures(table), len(styles), counts
+
+
+def _render_page(page: Page, css_file_name: str, rules: List[ClassRule],
+                 groups: List[Tuple[Tuple[str, str], ...]],
+                 fold_kwargs: Dict[str, bool], inline_styles: bool,
+                 attribute_rules: List[AttributeRule],
+                 attribute_folded: Dict[Tuple[Tuple[str, str], ...],
+                                        Tuple[Tuple[str, str], ...]],
+                 css_file_names: List[str], critical_css_size: int,
+                 css_kwargs: Dict[str, Any],
+                 html_kwargs: Dict[str, Any]) -> str:
+    """Builds the given page and converts it into HTML code with the classes
+    of the given CSS rules.
+
+    This function runs in a worker process of
+    :py:meth:`Website.compile`.
+
+    :param page: The page to render.
+    :type page: Page
+    :param css_file_name: See :py:meth:`Page.build`.
+    :type css_file_name: str
+    :param rules: The rules compiled over the entire website, sorted by class
+        name, or in the order of `groups` if declarations are grouped.
+    :type rules: List[ClassRule]
+    :param groups: The groups of declarations of each rule, as returned by
+        :py:func:`_group_declarations`, or None if each rule has a single
+        declaration.
+    :type groups: List[Tuple[Tuple[str, str], ...]]
+    :param fold_kwargs: The `collapse_shorthands` and
+        `drop_global_declarations` arguments of :py:func:`compile_css`.
+    :type fold_kwargs: Dict[str, bool]
+    :param inline_styles: See :py:func:`compile_css`. The given rules must
+        already leave out the declarations to write inline.
+    :type inline_styles: bool
+    :param attribute_rules: The attribute rules compiled over the entire
+        website, as returned by :py:func:`_get_attribute_rules`, or None.
+    :type attribute_rules: List[AttributeRule]
+    :param attribute_folded: The styles that lose declarations to the
+        attribute rules, as returned by :py:func:`_get_attribute_rules`.
+    :type attribute_folded: Dict[Tuple[Tuple[str, str], ...],
+        Tuple[Tuple[str, str], ...]]
+    :param css_file_names: The names of the CSS files to link to the page
+        instead of `css_file_name`, or None to keep it.
+    :type css_file_names: List[str]
+    :param critical_css_size: See :py:meth:`Website.compile`.
+    :type critical_css_size: int
+    :param css_kwargs: Keyword arguments to pass to
+        :py:meth:`CompiledCSS.to_css`.
+    :type css_kwargs: Dict[str, Any]
+    :param html_kwargs: Keyword arguments to pass to
+        :py:meth:`HTMLNode.to_html`.
+    :type html_kwargs: Dict[str, Any]
+    :return: The HTML code of the page.
+    :rtype: str
+    """
+    styles = {}
+    tree = page.build(css_file_name=css_file_name, styles=styles)
+    styles = {k: v for k, v in styles.items() if v}
+    table = _intern_styles(styles)
+    if any(fold_kwargs.values()):
+        table, _ = _fold_table(table, **fold_kwargs)
+    if attribute_folded:
+        table = _apply_folds(table, attribute_folded)
+    if groups is None:
+        style_rules = _map_rules(table, rules)
+    else:
+        style_rules = _map_groups(table, groups, rules)
+        rules = sorted(rules, key=lambda r: r.name)
+    inline = _get_inline_styles(style_rules) if inline_styles else {}
+    css = CompiledCSS([tree], RuleSection(rules=rules, title="Core"),
+                      _map_nodes(table, style_rules),
+                      inline={i: v for k, v in inline.items()
+                              for i in table[k]},
+                      attribute_rules=attribute_rules)
+    if css_file_names is not None or critical_css_size > 0:
+        _link_page_css(tree, css, styles, css_file_names or [css_file_name],
+                       css_kwargs, critical_css_size)
+    return tree.to_html(css=css, **html_kwargs)
+
+
+def _compile_in_parallel(pages: List[Page], workers: int, css_file_name: str,
+                         class_namer: Callable[[List[ClassRule], int], str],
+                         group_rules: bool, fold_kwargs: Dict[str, bool],
+                         inline_styles: bool, attribute_selectors: List[str],
+                         critical_css_size: int,
+                         split_css: float, css_hash_length: int,
+                         css_kwargs: Dict[str, Any],
+                         html_kwargs: Dict[str, Any],
+                         timings: Dict[str, float]
+                         ) -> Tuple[List[str], Dict[str, str], str]:
+    """Compiles the given pages in a pool of worker processes.
+
+    Pages are compiled in two phases. First, workers build every page to
+    collect the distinct styles it uses and its size. The rules of the shared
+    style sheet are then compiled and named in the current process, exactly
+    like :py:func:`compile_css` would. Finally, workers build every page
+    again, apply the rules, and render the page, starting with the largest
+    pages so that a single slow page does not hold up the end of the
+    compilation.
+
+    :param pages: The pages to compile.
+    :type pages: List[Page]
+    :param workers: The number of worker processes.
+    :type workers: int
+    :param css_file_name: See :py:meth:`Page.build`.
+    :type css_file_name: str
+    :param class_namer: See :py:func:`compile_css`.
+    :type class_namer: Callable[[List[ClassRule], int], str]
+    :param group_rules: See :py:func:`compile_css`.
+    :type group_rules: bool
+    :param fold_kwargs: The `collapse_shorthands` and
+        `drop_global_declarations` arguments of :py:func:`compile_css`.
+    :type fold_kwargs: Dict[str, bool]
+    :param inline_styles: See :py:func:`compile_css`.
+    :type inline_styles: bool
+    :param attribute_selectors: See :py:func:`compile_css`.
+    :type attribute_selectors: List[str]
+    :param critical_css_size: See :py:meth:`Website.compile`.
+    :type critical_css_size: int
+    :param split_css: See :py:meth:`Website.compile`.
+    :type split_css: float
+    :param css_hash_length: See :py:meth:`Website.compile`.
+    :type css_hash_length: int
+    :param css_kwargs: Keyword arguments to pass to
+        :py:meth:`CompiledCSS.to_css`.
+    :type css_kwargs: Dict[str, Any]
+    :param html_kwargs: Keyword arguments to pass to
+        :py:meth:`HTMLNode.to_html`.
+    :type html_kwargs: Dict[str, Any]
+    :param timings: A dictionary in which to store the time spent in each
+        phase, as described in :py:meth:`Website.compile`.
+    :type timings: Dict[str, float]
+    :return: A tuple containing the HTML code of each page, in order, the
+        code of each CSS file by file name, and the name of the file shared
+        by all pages.
+    :rtype: Tuple[List[str], Dict[str, str], str]
+    """
+    class_namer = default_class_namer if class_namer is None else class_namer
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Collecting the styles and size of each page
+        start = time.perf_counter()
+        analyses = list(executor.map(
+            _analyze_page, pages, [css_file_name] * len(pages),
+            [fold_kwargs] * len(pages), [attribute_selectors] * len(pages)))
+        timings["build"] = time.perf_counter() - start
+
+        # Compiling the attribute rules over all pages if requested, in which
+        # case the styles of each page are folded accordingly
+        start = time.perf_counter()
+        attribute_rules, attribute_folded = None, {}
+        if attribute_selectors:
+            counts = {}
+            for _, _, page_counts in analyses:
+                for key, count in page_counts.items():
+                    counts[key] = counts.get(key, 0) + count
+            attribute_rules, attribute_folded = _get_attribute_rules(counts)
+            analyses = [(_fold_signatures(c, attribute_folded), size, c)
+                        for _, size, c in analyses]
+
+        # Compiling the rules shared by all pages
+        signatures = {}
+        for page_signatures, _, _ in analyses:
+            for signature, count in page_signatures.items():
+                signatures[signature] = signatures.get(signature, 0) + count
+        if group_rules:
+            groups = _group_declarations(signatures)
+            if inline_styles:
+                groups = _filter_inline_groups(groups, signatures)
+            rules = _name_rules(groups, class_namer, signatures)
+        else:
+            groups = None
+            properties = set().union(*signatures)
+            if inline_styles:
+                properties = set(g[0] for g in _filter_inline_groups(
+                    [(p,) for p in sorted(properties)], signatures))
+            rules = _compile_rules(properties, class_namer, signatures)
+        core = RuleSection(rules=sorted(rules, key=lambda r: r.name),
+                           title="Core")
+        compiled_css = CompiledCSS([], core, {},
+                                   attribute_rules=attribute_rules)
+
+        # Writing the CSS code into files, split if requested, in which case
+        # the rules of each page are found from its distinct styles
+        used = None
+        if split_css is not None:
+            used = []
+            for page_signatures, _, _ in analyses:
+                style_rules = _map_rules(page_signatures, rules) \
+                    if groups is None \
+                    else _map_groups(page_signatures, groups, rules)
+                used.append(_get_used_rules(style_rules, style_rules))
+        css_files, page_files = _write_css_files(
+            compiled_css, used, split_css, css_file_name, css_hash_length,
+            css_kwargs)
+        shared_name = next(iter(css_files))
+        if page_files is None:
+            page_files = [None if shared_name == css_file_name
+                          else [shared_name]] * len(pages)
+        timings["css"] = time.perf_counter() - start
+
+        # Rendering pages from largest to smallest. Sorting is stable, so
+        # pages of equal size are submitted in their original order.
+        start = time.perf_counter()
+        order = sorted(range(len(pages)), key=lambda i: -analyses[i][1])
+        futures = {i: executor.submit(_render_page, pages[i], css_file_name,
+                                      rules, groups, fold_kwargs,
+                                      inline_styles, attribute_rules,
+                                      attribute_folded, page_files[i],
+                                      critical_css_size, css_kwargs,
+                                      html_kwargs)
+                   for i in order}
+        html_content = [futures[i].result() for i in range(len(pages))]
+        timings["render"] = time.perf_counter() - start
+
+    return html_content, css_files, shared_name
@@ -12,7 +12,9 @@
 
 from .container import Container
 from dataclasses import dataclass
-from typing import Dict, Union
+from typing import Any, Dict, Union
+from webwidgets.compilation.html.html_containers import TrackedDict, \
+    TrackedList
 from webwidgets.compilation.html.html_tags import Div
 from webwidgets.utility.enums import Direction
 from webwidgets.utility.sizes.sizes import AbsoluteSize
@@ -35,6 +37,34 @@ class Box(Container):
         self.direction = direction
         self._properties: Dict[int, BoxItemProperties] = {}
 
+    def __getstate__(self) -> Dict[str, Any]:
+        """Returns the state of the box for copying or pickling it.
+
+        Widget IDs do not survive pickling or deep copies, so the properties
+        of the widgets are saved as a list in the order of the widgets
+        instead.
+
+        :return: The state of the box.
+        :rtype: Dict[str, Any]
+        """
+        state = self.__dict__.copy()
+        state["_properties"] = [self._properties[id(w)] for w in self.widgets]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """Restores the state of the box after copying or unpickling it.
+
+        The properties of the widgets are keyed again by the IDs of the new
+        widgets.
+
+        :param state: The state of the box, as returned by
+            :py:meth:`Box.__getstate__`.
+        :type state: Dict[str, Any]
+        """
+        self.__dict__.update(state)
+        self._properties = {id(w): p for w, p in
+                            zip(self.widgets, state["_properties"])}
+
     def add(self, widget: Widget,
             space: Union[int, float, AbsoluteSize] = 1) -> None:
         """Adds a widget to the box with an optional space coefficient.
@@ -86,23 +116,39 @@ class Box(Container):
         nodes = [w.build() for w in self.widgets]
         properties = [self._properties[id(w)] for w in self.widgets]
 
-        # Building box items that wrap around child nodes
-        items = [Div(
-            children=[node],
-            attributes={"data-role": "box-item"},
-            style={
-                "display": "flex",
-                "flex-direction": "row",
-                "align-items": "center",
-                "justify-content": "center"
-            } | props.to_style()) for node, props in zip(nodes, properties)]
+        # Building box items that wrap around child nodes. The style of items
+        # with the same properties is only computed once, and each item gets
+        # its own copy of it. Containers are tracked, so that the box can be
+        # rendered with render caches.
+        item_style = {
+            "display": "flex",
+            "flex-direction": "row",
+            "align-items": "center",
+            "justify-content": "center"
+        }
+        styles = {}
+        items = []
+        for node, props in zip(nodes, properties):
+            key = (type(props.space), props.space) \
+                if isinstance(props.space, (int, float)) \
+                else props.space.to_css()
+            style = styles.get(key)
+            if style is None:
+                style = item_style | props.to_style()
+                styles[key] = style
+            items.append(Div(
+                children=TrackedList([node]),
+                attributes=TrackedDict({"data-role": "box-item"}),
+                style=TrackedDict(style)))
 
         # Assembling the box
         flex_dir = "row" if self.direction == Direction.HORIZONTAL else "column"
-        box = Div(children=items, attributes={"data-role": "box"}, style={
-            "display": "flex",
-            "flex-direction": flex_dir
-        })
+        box = Div(children=TrackedList(items),
+                  attributes=TrackedDict({"data-role": "box"}),
+                  style=TrackedDict({
+                      "display": "flex",
+                      "flex-direction": flex_dir
+                  }))
         return box
 
 
@@ -11,9 +11,12 @@
 # =======================================================================
 
 from .container import Container
-from webwidgets.compilation.html.html_node import RootNode
+from typing import Dict, List
+from webwidgets.compilation.html.html_containers import TrackedDict, \
+    TrackedList
+from webwidgets.compilation.html.html_node import HTMLNode, RootNode
 from webwidgets.compilation.html.html_tags import Body, Doctype, Head, Html, \
-    Link
+    Link, Style
 
 
 class Page(Container):
@@ -21,7 +24,9 @@ class Page(Container):
     responsible for laying them out within the page.
     """
 
-    def build(self, css_file_name: str = "styles.css") -> RootNode:
+    def build(self, css_file_name: str = "styles.css",
+              styles: Dict[int, Dict[str, str]] = None,
+              critical_css: str = None) -> RootNode:
         """Builds the HTML representation of the page.
 
         This method constructs an HTML structure that includes a doctype
@@ -32,6 +37,18 @@ class Page(Container):
         :param css_file_name: The name of the CSS file to link to the page if
             the page elements contain any styles. Defaults to "styles.css".
         :type css_file_name: str
+        :param styles: An optional dictionary in which to store the styles of
+            the nodes built from the page's widgets, as returned by
+            :py:meth:`HTMLNode.get_styles`. The other nodes of the page have
+            no style. Styles are collected anyway to know whether to link the
+            CSS file, so passing this dictionary saves another walk through
+            the page.
+        :type styles: Dict[int, Dict[str, str]]
+        :param critical_css: Optional CSS code to inline into the head of the
+            page along with the link to the CSS file, as done by
+            :py:meth:`Page.inline_css`. Ignored if the page elements do not
+            contain any styles. Defaults to None.
+        :type critical_css: str
         :return: A :py:class:`RootNode` object representing the page.
         :rtype: RootNode
         """
@@ -43,17 +60,89 @@ class Page(Container):
 
         # Checking if there is any style sheet to link to the page.
         # To do so, we just check if any child node has a non-empty style.
-        if any(style for n in nodes for style in n.get_styles().values()):
-            head.add(Link(
-                attributes={"href": css_file_name, "rel": "stylesheet"}
-            ))
+        node_styles = {}
+        for node in nodes:
+            node_styles.update(node.get_styles())
+        if any(node_styles.values()):
+            head.children = _link_css([css_file_name], critical_css)
 
-        # Building the HTML representation of the page
+        # Storing the styles of the widgets' nodes if requested
+        if styles is not None:
+            styles.update(node_styles)
+
+        # Building the HTML representation of the page. Its containers are
+        # tracked, so that it can be rendered with render caches.
         return RootNode(
-            children=[
+            children=TrackedList([
                 Doctype(),
                 Html(
-                    children=[head, Body(children=nodes)]
+                    children=TrackedList([
+                        head, Body(children=TrackedList(nodes))])
                 )
-            ]
+            ])
         )
+
+    @staticmethod
+    def inline_css(tree: RootNode, critical_css: str,
+                   css_file_name: str = "styles.css") -> None:
+        """Inlines CSS code into the head of a page built by
+        :py:meth:`Page.build`.
+
+        The code is written into a :py:class:`Style` element and the CSS file
+        is loaded without blocking the first render of the page: its link only
+        applies to print media until the file is loaded. The code should
+        therefore contain all the rules that the page needs, and the CSS file
+        is only downloaded for the next pages.
+
+        :param tree: The tree of the page, as returned by
+            :py:meth:`Page.build`. The head of the page is modified in place.
+        :type tree: RootNode
+        :param critical_css: The CSS code to inline.
+        :type critical_css: str
+        :param css_file_name: See :py:meth:`Page.build`.
+        :type css_file_name: str
+        """
+        Page.link_css(tree, [css_file_name], critical_css)
+
+    @staticmethod
+    def link_css(tree: RootNode, css_file_names: List[str],
+                 critical_css: str = None) -> None:
+        """Links a page built by :py:meth:`Page.build` to the given CSS
+        files, in order, instead of its own CSS file.
+
+        This is useful when the style sheet of a website is split into
+        several files, as each page can link to the files it needs only.
+
+        :param tree: The tree of the page, as returned by
+            :py:meth:`Page.build`. The head of the page is modified in place.
+        :type tree: RootNode
+        :param css_file_names: The names of the CSS files to link.
+        :type css_file_names: List[str]
+        :param critical_css: CSS code to inline into the head of the page, as
+            done by :py:meth:`Page.inline_css`, in which case all CSS files
+            are loaded without blocking the first render of the page.
+            Defaults to None.
+        :type critical_css: str
+        """
+        head = tree.children[1].children[0]
+        head.children = _link_css(css_file_names, critical_css)
+
+
+def _link_css(css_file_names: List[str],
+              critical_css: str = None) -> List[HTMLNode]:
+    """Returns the elements linking a page to its CSS files.
+
+    :param css_file_names: See :py:meth:`Page.link_css`.
+    :type css_file_names: List[str]
+    :param critical_css: See :py:meth:`Page.link_css`.
+    :type critical_css: str
+    :return: The elements to add to the head of the page.
+    :rtype: List[HTMLNode]
+    """
+    if critical_css is None:
+        return TrackedList(
+            Link(attributes=TrackedDict(href=name, rel="stylesheet"))
+            for name in css_file_names)
+    return TrackedList([Style(critical_css)] + [Link(attributes=TrackedDict(
+        href=name, media="print", onload="this.media='all'",
+        rel="stylesheet")) for name in css_file_names])